@@ -1,5 +1,7 @@
 import streamlit as st
 
+from startup import start_background_warm_up
+
 st.set_page_config(
     page_title="Computer Price Predictor",
     page_icon="💻",
@@ -19,8 +21,13 @@ st.markdown(
     - **KNN**: See the 5 most similar laptops to the one whose specifications you choose using a KNN model
     - **PricePredictor**: Predict computer prices based on specifications using an XGBoost model
     - **Data Explorer**: Explore the data we used to train the model
+    - **Feedback Analytics**: Follow live feedback on the price predictions and the recommendations
     
     ### Project Overview
     This project was developed for our Machine Learning Foundations course. It was done entirely in Python, with Streamlit for the UI. Done by Group 1. 
     """
 )
+
+# Load the price model and the KNN index once per server process, in the
+# background, so this page renders without waiting for xgboost or sklearn.
+start_background_warm_up()
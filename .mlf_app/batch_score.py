@@ -0,0 +1,215 @@
+"""
+Bulk price scoring for whole catalogs.
+
+Run from the repository root:
+
+    python .mlf_app/batch_score.py listings.csv prices.csv --chunk-size 50000 --jobs 4
+
+The input is read in chunks, each chunk is aligned to the booster's feature
+order once, predicted as a single block and appended to the output, so memory
+stays constant no matter how large the input is. Pass --raw for listings in
+the X_test_final.csv layout; they go through featurizer.featurize first, and
+the chunk read ahead waits as a compact_catalog.CompactCatalog rather than a
+frame of strings.
+Parquet input/output needs pyarrow installed.
+"""
+import argparse
+import functools
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from compact_catalog import CompactCatalog
+from featurizer import featurize, raw_csv_kwargs
+from model_registry import DEFAULT_MODEL_PATH, get_model, get_feature_names
+
+
+def _is_parquet(path):
+    return path.lower().endswith((".parquet", ".pq"))
+
+
+def iter_chunks(path, chunk_size, raw=False):
+    """Yield DataFrames of at most `chunk_size` rows from a CSV or Parquet file."""
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        read_kwargs = raw_csv_kwargs(path) if raw else {}
+        yield from pd.read_csv(path, chunksize=chunk_size, **read_kwargs)
+
+
+def compact_chunks(chunks, id_column=None):
+    """
+    (CompactCatalog, ids) for every raw chunk. The `id_column` values are taken
+    out first, as the catalog keeps numbers as float32.
+    """
+    for chunk in chunks:
+        yield CompactCatalog.from_frame(chunk), None if id_column is None else chunk[id_column].to_numpy()
+
+
+class ChunkWriter:
+    """Appends scored chunks to a CSV or Parquet file as they are produced."""
+
+    def __init__(self, path):
+        self.path = path
+        self._parquet_writer = None
+        self._wrote_header = False
+        if os.path.exists(path):
+            os.remove(path)
+
+    def write(self, df):
+        if _is_parquet(self.path):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+            self._parquet_writer.write_table(table)
+        else:
+            df.to_csv(self.path, mode="a", header=not self._wrote_header, index=False)
+            self._wrote_header = True
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+def align_chunk(chunk, feature_names):
+    """
+    Reorder `chunk` to the model's column order, filling absent features with 0
+    the same way PricePredictor.py does, and return a float32 matrix.
+    """
+    aligned = chunk.reindex(columns=feature_names, fill_value=0)
+    try:
+        return aligned.to_numpy(dtype=np.float32)
+    except ValueError as e:
+        non_numeric = [c for c in feature_names if not pd.api.types.is_numeric_dtype(aligned[c])]
+        raise ValueError(f"Non-numeric values in model columns {non_numeric[:5]}: {e}") from e
+
+
+def thread_split_predict(model, jobs):
+    """
+    A predict function for `jobs` worker threads sharing the cores: each call
+    runs on one private copy of the booster, limited to its share of XGBoost
+    threads. The registry's model is shared with everything else in this
+    process, so its own settings are left alone.
+    """
+    booster = model.get_booster().copy()
+    booster.set_param({"nthread": max(1, (os.cpu_count() or 1) // jobs)})
+    best_iteration = getattr(model, "best_iteration", None)
+    # Same trees as model.predict, which stops at the early-stopping round if there was one
+    iteration_range = (0, best_iteration + 1) if best_iteration is not None else (0, 0)
+    return functools.partial(booster.inplace_predict, iteration_range=iteration_range)
+
+
+def predict_block(predict, matrix, block_size, executor):
+    """Split `matrix` into row blocks and predict them in parallel."""
+    if executor is None or matrix.shape[0] <= block_size:
+        return predict(matrix)
+    blocks = [matrix[i:i + block_size] for i in range(0, matrix.shape[0], block_size)]
+    return np.concatenate(list(executor.map(predict, blocks)))
+
+
+def score_file(input_path, output_path, model_path=DEFAULT_MODEL_PATH, chunk_size=50000,
+               block_size=10000, jobs=None, id_column=None, raw=False):
+    """
+    Score every row of `input_path` and write `predicted_price` to `output_path`.
+
+    Parameters:
+    - input_path: CSV or Parquet file with model feature columns
+    - output_path: CSV or Parquet file to create (replaced if it exists; must not be the input)
+    - model_path: joblib artifact to score with
+    - chunk_size: Rows read from disk at a time
+    - block_size: Rows per predict call inside a chunk
+    - jobs: Worker threads for prediction (defaults to all cores); XGBoost's own
+      threads are split between them
+    - id_column: Optional input column copied to the output next to the price
+    - raw: Input holds raw listings that must be featurized first
+
+    Returns a dict with rows, seconds and rows_per_second.
+    """
+    if os.path.exists(output_path) and os.path.samefile(input_path, output_path):
+        # The writer truncates the output before the first chunk is read
+        raise ValueError(f"The output would overwrite the input: {output_path}")
+    jobs = jobs or os.cpu_count() or 1
+    model = get_model(model_path)
+    # Each worker thread predicts its own block, so XGBoost should not also
+    # fan out across every core inside each call
+    predict = thread_split_predict(model, jobs) if jobs > 1 else model.predict
+    feature_names = get_feature_names(model_path)
+    writer = ChunkWriter(output_path)
+    executor = ThreadPoolExecutor(max_workers=jobs) if jobs > 1 else None
+
+    start = time.perf_counter()
+    n_rows = 0
+    chunks = iter_chunks(input_path, chunk_size, raw=raw)
+    if raw:
+        chunks = compact_chunks(chunks, id_column)
+    # Read the next chunk in the background while the current one is scored.
+    reader = ThreadPoolExecutor(max_workers=1)
+    try:
+        pending = reader.submit(next, chunks, None)
+        while True:
+            chunk = pending.result()
+            if chunk is None:
+                break
+            pending = reader.submit(next, chunks, None)
+
+            if raw:
+                chunk, ids = chunk
+                matrix = featurize(chunk, feature_names).to_numpy()
+            else:
+                ids = None if id_column is None else chunk[id_column].to_numpy()
+                matrix = align_chunk(chunk, feature_names)
+            prices = np.expm1(predict_block(predict, matrix, block_size, executor))
+            out = pd.DataFrame({"row": np.arange(n_rows, n_rows + len(chunk))})
+            if raw:
+                out["id"] = chunk.index.to_numpy()
+            if id_column is not None:
+                out[id_column] = ids
+            out["predicted_price"] = prices
+            writer.write(out)
+            n_rows += len(chunk)
+    finally:
+        reader.shutdown(wait=True)
+        if executor is not None:
+            executor.shutdown(wait=True)
+        writer.close()
+
+    seconds = time.perf_counter() - start
+    return {"rows": n_rows, "seconds": seconds, "rows_per_second": n_rows / seconds if seconds else 0.0}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a CSV/Parquet catalog with the price model.")
+    parser.add_argument("input")
+    parser.add_argument("output")
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH)
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    parser.add_argument("--block-size", type=int, default=10000)
+    parser.add_argument("--jobs", type=int, default=None, help="Prediction threads (default: all cores)")
+    parser.add_argument("--id-column", default=None)
+    parser.add_argument("--raw", action="store_true", help="Input is raw listings in the X_*_final.csv layout")
+    args = parser.parse_args()
+
+    try:
+        report = score_file(args.input, args.output, model_path=args.model, chunk_size=args.chunk_size,
+                            block_size=args.block_size, jobs=args.jobs, id_column=args.id_column,
+                            raw=args.raw)
+    except (OSError, ValueError, ImportError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"Scored {report['rows']:,} rows in {report['seconds']:.2f}s "
+          f"({report['rows_per_second']:,.0f} rows/sec) -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""
+End-to-end benchmark suite: model prediction, KNN fit and query, data loading
+and headless page reruns, with p50/p95/p99 per stage.
+
+Results are written as JSON and compared with a stored baseline; a stage whose
+p50 or p95 got slower than the baseline by more than --tolerance is reported as
+a regression and the run exits with status 1, so it can gate a deploy.
+
+Run from the repository root:
+
+    python .mlf_app/benchmarks/benchmark_suite.py
+    python .mlf_app/benchmarks/benchmark_suite.py --stages predict knn --repeat 500
+    python .mlf_app/benchmarks/benchmark_suite.py --save-baseline
+
+Timings depend on the machine: record the baseline on the machine (or CI
+runner type) that the comparison runs on.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import time
+import warnings
+from importlib import metadata
+
+import numpy as np
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+BENCHMARK_FORMAT_VERSION = 1
+DEFAULT_BASELINE = os.path.join(APP_DIR, "benchmarks", "baseline.json")
+DEFAULT_OUTPUT = os.path.join("artifacts", "benchmarks", "latest.json")
+STAGES = ("predict", "knn", "data", "pages")
+PAGES = ("Home.py", "pages/PricePredictor.py", "pages/KNN.py", "pages/FeedbackAnalytics.py")
+
+
+def time_calls(fn, repeat, warmup=1):
+    """Seconds taken by each of `repeat` calls of `fn`, after `warmup` untimed calls."""
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def summarize(timings, **extra):
+    ms = np.asarray(timings) * 1e3
+    return {
+        "n": len(ms),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "mean_ms": float(ms.mean()),
+        "min_ms": float(ms.min()),
+        **extra,
+    }
+
+
+def bench_predict(repeat, batch_size=1000):
+    """Uncached model.predict latency, one row and `batch_size` rows at a time."""
+    from data_cache import load_table
+    from featurizer import featurize, load_raw
+    from model_registry import get_feature_names, get_model
+
+    model = get_model()
+    X_test = featurize(load_table("X_test_final.csv", load_raw), get_feature_names()).to_numpy()
+    rows = [X_test[i % len(X_test)][None, :] for i in range(repeat)]
+    batch = X_test[np.arange(batch_size) % len(X_test)]
+
+    single = iter(rows)
+    results = {"predict_single_row": summarize(time_calls(lambda: model.predict(next(single)), repeat - 1))}
+    batch_timings = time_calls(lambda: model.predict(batch), max(repeat // 20, 5))
+    results["predict_batch"] = summarize(
+        batch_timings, rows=batch_size, rows_per_second=batch_size / float(np.median(batch_timings))
+    )
+    return results
+
+
+def bench_knn(repeat, fit_repeat=3, k=5):
+    """Fit time of the recommender and the latency of one page query (encode + search)."""
+    from data_cache import load_table
+    from featurizer import load_raw
+    from knn_index import get_index, load_training_data
+    from knn_model import fit_recommendation_model, transform_queries
+    from spec_normalizer import CONNECTIVITY_COLUMN
+
+    X_train, y_train, _ = load_training_data()
+    results = {"knn_fit": summarize(time_calls(lambda: fit_recommendation_model(X_train, y_train), fit_repeat, 0))}
+
+    # Queries go through the persisted index, like predict_and_recommend on the page
+    model_data = get_index()
+    X_test = load_table("X_test_final.csv", load_raw)
+    # The page always sends a connectivity list; keep the listings that have one
+    X_test = X_test[X_test[CONNECTIVITY_COLUMN].notna()]
+    queries = [X_test.iloc[[i % len(X_test)]] for i in range(repeat + 1)]
+    pending = iter(queries)
+
+    def query():
+        encoded = transform_queries(model_data, next(pending))
+        return model_data['search_engine'].search(encoded, k=k)
+
+    results["knn_query"] = summarize(time_calls(query, repeat))
+    return results
+
+
+def bench_data(repeat):
+    """Parsing the CSVs versus loading them from the columnar cache."""
+    import pandas as pd
+
+    from data_cache import load_table
+    from featurizer import load_raw
+
+    results = {}
+    for path, read_csv in (("X_train_final.csv", load_raw), ("y_train.csv", pd.read_csv), ("titulos.csv", pd.read_csv)):
+        name = os.path.splitext(path)[0]
+        results[f"csv_parse:{name}"] = summarize(time_calls(lambda: read_csv(path), max(repeat // 20, 5)))
+        results[f"cached_load:{name}"] = summarize(time_calls(lambda: load_table(path, read_csv), max(repeat // 5, 5)))
+    return results
+
+
+def bench_pages(repeat):
+    """Full-script rerun time of every page in a headless AppTest session."""
+    from streamlit.testing.v1 import AppTest
+
+    # Keep the pages' folder importable for the background warm-up thread (see startup_benchmark.py)
+    sys.path.insert(0, os.path.join(APP_DIR, "pages"))
+    results = {}
+    for page in PAGES:
+        session = AppTest.from_file(os.path.join(APP_DIR, page), default_timeout=300)
+        session.run()
+        results[f"page_rerun:{page}"] = summarize(time_calls(session.run, max(repeat // 10, 5), 0))
+
+    # The two user actions that do real work: predicting a price and finding similar laptops
+    for page, button in (("pages/PricePredictor.py", "Predict 💰"), ("pages/KNN.py", "Find Similar Laptops")):
+        session = AppTest.from_file(os.path.join(APP_DIR, page), default_timeout=300).run()
+
+        def click():
+            next(b for b in session.button if b.label == button).click().run()
+
+        results[f"page_action:{page}"] = summarize(time_calls(click, max(repeat // 10, 5)))
+    return results
+
+
+BENCHMARKS = {"predict": bench_predict, "knn": bench_knn, "data": bench_data, "pages": bench_pages}
+
+
+def environment():
+    versions = {}
+    for package in ("numpy", "pandas", "scikit-learn", "xgboost", "streamlit"):
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "packages": versions,
+    }
+
+
+def compare(results, baseline, tolerance, min_delta_ms=0.5):
+    """
+    [(stage, metric, baseline ms, current ms, ratio)] for every metric slower
+    than allowed: by more than `tolerance` (relative) and `min_delta_ms`
+    (absolute, so sub-millisecond stages do not flag on timer noise).
+    """
+    regressions = []
+    for stage, current in results.items():
+        previous = baseline.get("results", {}).get(stage)
+        if previous is None:
+            continue
+        for metric in ("p50_ms", "p95_ms"):
+            ratio = current[metric] / previous[metric] if previous[metric] else float("inf")
+            if ratio > 1 + tolerance and current[metric] - previous[metric] > min_delta_ms:
+                regressions.append((stage, metric, previous[metric], current[metric], ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the benchmark suite and compare it with the baseline.")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--repeat", type=int, default=200, help="Timed calls of the fast stages (slow ones use fewer)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Where the JSON results are written")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p50/p95 slowdown (0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5, help="Ignore slowdowns smaller than this")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore")
+
+    results = {}
+    for stage in args.stages:
+        start = time.perf_counter()
+        results.update(BENCHMARKS[stage](args.repeat))
+        print(f"[{stage}] done in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+    report = {
+        "format_version": BENCHMARK_FORMAT_VERSION,
+        "created_at": datetime.datetime.now().isoformat(),
+        "environment": environment(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    baseline = None
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    print(f"{'stage':<42} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'vs base p50':>12}")
+    for stage, stats in results.items():
+        previous = (baseline or {}).get("results", {}).get(stage)
+        change = f"{stats['p50_ms'] / previous['p50_ms'] - 1:+.0%}" if previous and previous["p50_ms"] else "-"
+        print(f"{stage:<42} {stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f} {change:>12}")
+    print(f"Results written to {args.output}")
+
+    if args.save_baseline:
+        if os.path.exists(args.baseline):
+            # Keep stages that were not run this time
+            with open(args.baseline) as f:
+                previous = json.load(f)
+            report["results"] = {**previous.get("results", {}), **results}
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return
+    if baseline is None:
+        print("No baseline to compare with; store one with --save-baseline")
+        return
+    if baseline.get("environment", {}).get("cpu_count") != report["environment"]["cpu_count"]:
+        print("Note: the baseline was recorded on a machine with a different CPU count")
+
+    regressions = compare(results, baseline, args.tolerance, args.min_delta_ms)
+    for stage, metric, before, after, ratio in regressions:
+        print(f"REGRESSION {stage} {metric}: {before:.2f} ms -> {after:.2f} ms ({ratio - 1:+.0%})")
+    if regressions:
+        sys.exit(1)
+    print(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Sweeps catalog size for the approximate IVF index against the exact
+CosineSearchEngine: build time, memory, query latency and recall@k.
+
+Catalogs larger than the training set are synthesized by resampling the real
+normalized listings with small Gaussian jitter, so they keep the clustered
+structure of real data.
+
+Run from the repository root:
+
+    python .mlf_app/benchmarks/knn_ann_benchmark.py --sizes 10000 50000 200000 --n-probe 1 4 8 16
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_cache import load_table
+from featurizer import load_raw
+from knn_model import fit_recommendation_model, transform_queries
+from knn_search import CosineSearchEngine, IVFCosineIndex, l2_normalize, recall_at_k
+
+
+def synthetic_catalog(base, n_items, noise=0.02, seed=0, block_size=50000):
+    """`n_items` jittered copies of random rows of the dense unit-norm `base`."""
+    rng = np.random.default_rng(seed)
+    catalog = np.empty((n_items, base.shape[1]), dtype=np.float32)
+    for start in range(0, n_items, block_size):
+        stop = min(start + block_size, n_items)
+        rows = base[rng.integers(0, base.shape[0], stop - start)]
+        catalog[start:stop] = l2_normalize(rows + rng.normal(0, noise, rows.shape).astype(np.float32))
+    return catalog
+
+
+def per_query_ms(search, queries):
+    timings = []
+    for i in range(queries.shape[0]):
+        start = time.perf_counter()
+        search(queries[i:i + 1])
+        timings.append(time.perf_counter() - start)
+    return np.median(timings) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the IVF KNN index across catalog sizes.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000, 200000])
+    parser.add_argument("--n-probe", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--n-lists", type=int, default=None)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=5)
+    args = parser.parse_args()
+
+    X_train = load_table("X_train_final.csv", load_raw)
+    y_train = load_table("y_train.csv")
+    X_test = load_table("X_test_final.csv", load_raw)
+    model_data = fit_recommendation_model(X_train, y_train)
+    base = model_data['search_engine'].vectors.toarray()
+    queries = transform_queries(model_data, X_test[:args.queries])
+
+    print(f"{'items':>9} {'engine':>14} {'build s':>8} {'MB':>8} {'p50 ms':>8} {'recall@' + str(args.k):>9}")
+    for n_items in args.sizes:
+        catalog = synthetic_catalog(base, n_items)
+        exact = CosineSearchEngine(catalog)
+        _, exact_indices = exact.search(queries, k=args.k)
+        exact_ms = per_query_ms(lambda q: exact.search(q, k=args.k), queries)
+        print(f"{n_items:>9,} {'exact':>14} {0.0:>8.2f} {exact.nbytes() / 1e6:>8.1f} {exact_ms:>8.2f} {1.0:>9.3f}")
+
+        start = time.perf_counter()
+        ivf = IVFCosineIndex(catalog, n_lists=args.n_lists)
+        build_seconds = time.perf_counter() - start
+        for n_probe in args.n_probe:
+            _, ivf_indices = ivf.search(queries, k=args.k, n_probe=n_probe)
+            ivf_ms = per_query_ms(lambda q: ivf.search(q, k=args.k, n_probe=n_probe), queries)
+            label = f"ivf {ivf.n_lists}/{n_probe}"
+            print(f"{n_items:>9,} {label:>14} {build_seconds:>8.2f} {ivf.nbytes() / 1e6:>8.1f} {ivf_ms:>8.2f} "
+                  f"{recall_at_k(ivf_indices, exact_indices):>9.3f}")
+        del catalog, exact, ivf
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Compares the recommender's CosineSearchEngine against scikit-learn's
+NearestNeighbors(metric='cosine') on the real catalog.
+
+Run from the repository root:
+
+    python .mlf_app/benchmarks/knn_search_benchmark.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sklearn.neighbors import NearestNeighbors
+
+from data_cache import load_table
+from featurizer import load_raw
+from knn_model import fit_recommendation_model, transform_queries
+from knn_search import CosineSearchEngine
+
+
+def time_per_call(fn, calls):
+    timings = []
+    for args in calls:
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return np.array(timings)
+
+
+def main(k=5, n_single=300, batch_size=1000):
+    X_train = load_table("X_train_final.csv", load_raw)
+    y_train = load_table("y_train.csv")
+    X_test = load_table("X_test_final.csv", load_raw)
+    model_data = fit_recommendation_model(X_train, y_train)
+    catalog = model_data['X_knn_transformed']
+    queries = transform_queries(model_data, X_test)
+
+    sklearn_knn = NearestNeighbors(n_neighbors=k, metric='cosine').fit(catalog)
+    engine = model_data['search_engine']
+    print(f"Catalog {catalog.shape[0]:,} x {catalog.shape[1]:,}, normalized engine matrix {engine.nbytes() / 1e6:.1f} MB")
+
+    # Agreement with the scikit-learn path
+    sk_dist, sk_idx = sklearn_knn.kneighbors(queries, n_neighbors=k)
+    en_dist, en_idx = engine.search(queries, k=k)
+    same_distances = np.allclose(sk_dist, en_dist, atol=1e-5)
+    same_sets = np.mean([set(a) == set(b) for a, b in zip(sk_idx, en_idx)])
+    print(f"Distances match: {same_distances}; identical neighbour sets: {same_sets:.1%} "
+          f"(differences are ties between duplicate listings)")
+
+    single = [(queries[i:i + 1],) for i in range(min(n_single, queries.shape[0]))]
+    sk_single = time_per_call(lambda q: sklearn_knn.kneighbors(q, n_neighbors=k), single)
+    en_single = time_per_call(lambda q: engine.search(q, k=k), single)
+    print(f"Single query p50: sklearn {np.median(sk_single) * 1e3:.2f} ms, engine {np.median(en_single) * 1e3:.2f} ms "
+          f"({np.median(sk_single) / np.median(en_single):.1f}x)")
+
+    batch = queries[np.arange(batch_size) % queries.shape[0]]
+    sk_batch = time_per_call(lambda q: sklearn_knn.kneighbors(q, n_neighbors=k), [(batch,)] * 3).min()
+    en_batch = time_per_call(lambda q: engine.search(q, k=k), [(batch,)] * 3).min()
+    threaded = CosineSearchEngine(catalog, n_jobs=os.cpu_count(), parallel_threshold=256)
+    th_batch = time_per_call(lambda q: threaded.search(q, k=k), [(batch,)] * 3).min()
+    print(f"Batch of {batch_size}: sklearn {sk_batch * 1e3:.1f} ms, engine {en_batch * 1e3:.1f} ms, "
+          f"engine with {os.cpu_count()} threads {th_batch * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+CPU and wall time of the rerun a single widget change causes on the price and
+KNN pages.
+
+For every widget below, the benchmark flips its value back and forth and times
+the rerun Streamlit performs: the whole script, or, when the widget sits in an
+st.fragment, only that fragment (what a live server does after the change).
+CPU time is process time, so it includes Streamlit's own work on the script
+thread, not only the page code.
+
+AppTest always reruns the whole script, so fragment reruns are requested the
+way the server's ScriptRunner does it, through a fragment-scoped RerunData.
+AppTest also recompiles the script on every run; the server compiles it once,
+so the benchmark shares one ScriptCache across runs the same way.
+
+Run from the repository root:
+
+    python .mlf_app/benchmarks/rerun_benchmark.py
+    python .mlf_app/benchmarks/rerun_benchmark.py --repeat 50
+"""
+import argparse
+import functools
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+# (page, widget kind, label, two values to alternate between)
+WIDGETS = [
+    ("pages/PricePredictor.py", "selectbox", "Select type of RAM", ("DDR4", "DDR5")),
+    ("pages/PricePredictor.py", "number_input", "RAM capacity (GB)", (16, 32)),
+    ("pages/PricePredictor.py", "selectbox", "Select Brand", ("ASUS", "Lenovo")),
+    ("pages/KNN.py", "selectbox", "Select type of RAM", ("DDR4", "DDR5")),
+    ("pages/KNN.py", "selectbox", "RAM capacity (GB)", (16, 32)),
+    ("pages/KNN.py", "selectbox", "Select Brand", ("ASUS", "Lenovo")),
+]
+
+
+def find_widget(session, kind, label):
+    return next((w for w in getattr(session, kind) if w.label == label), None)
+
+
+def run_fragment(session, fragment_id):
+    """Rerun only `fragment_id` with the current widget values, like the server does."""
+    from streamlit.testing.v1 import local_script_runner
+
+    rerun_data = local_script_runner.RerunData
+    local_script_runner.RerunData = functools.partial(
+        rerun_data, fragment_id_queue=[fragment_id], is_fragment_scoped_rerun=True
+    )
+    try:
+        return session.run()
+    finally:
+        local_script_runner.RerunData = rerun_data
+
+
+def fragment_of(session, kind, label):
+    """Id of the fragment that renders the widget, or None when it is rendered by the script itself."""
+    for fragment_id in list(session._fragment_storage._fragments):
+        rerun = run_fragment(session, fragment_id)
+        found = find_widget(rerun, kind, label) is not None
+        session.run()
+        if found:
+            return fragment_id
+    return None
+
+
+def share_script_cache():
+    """Make every AppTest run reuse one compiled script, as the server's ScriptCache does."""
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.testing.v1 import local_script_runner
+
+    shared = ScriptCache()
+    local_script_runner.ScriptCache = lambda: shared
+
+
+def measure(page, kind, label, values, repeat):
+    from streamlit.testing.v1 import AppTest
+
+    import startup
+
+    session = AppTest.from_file(os.path.join(APP_DIR, page), default_timeout=300).run()
+    startup.wait_for_warm_up()
+    if find_widget(session, kind, label) is None:
+        raise ValueError(f"No {kind} labelled {label!r} on {page}")
+    fragment_id = fragment_of(session, kind, label)
+
+    cpu, wall = [], []
+    for i in range(repeat + 1):
+        find_widget(session, kind, label).set_value(values[i % 2])
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        if fragment_id is None:
+            session.run()
+        else:
+            run_fragment(session, fragment_id)
+        if i:
+            # The first change also pays for one-off work (caches, lazy imports)
+            cpu.append(time.process_time() - cpu_start)
+            wall.append(time.perf_counter() - wall_start)
+        if session.exception:
+            raise RuntimeError(f"{page}: {[e.value for e in session.exception]}")
+    return "fragment" if fragment_id else "full script", np.median(cpu) * 1e3, np.median(wall) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rerun cost of one widget change on the input pages.")
+    parser.add_argument("--repeat", type=int, default=30, help="Timed widget changes per widget")
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore")
+    # Like `streamlit run`, keep the pages' folder importable for the warm-up thread
+    sys.path.insert(0, os.path.join(APP_DIR, "pages"))
+    share_script_cache()
+
+    print(f"{'page':<26} {'widget':<22} {'rerun':<12} {'cpu ms':>8} {'wall ms':>8}")
+    for page, kind, label, values in WIDGETS:
+        scope, cpu_ms, wall_ms = measure(page, kind, label, values, args.repeat)
+        print(f"{page:<26} {label:<22} {scope:<12} {cpu_ms:>8.2f} {wall_ms:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
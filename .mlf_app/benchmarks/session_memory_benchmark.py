@@ -0,0 +1,60 @@
+"""
+Resident memory of the KNN page as concurrent sessions grow.
+
+Each session is a headless AppTest run of pages/KNN.py that also requests
+recommendations; all of them are kept alive, like open browser tabs. The index
+is loaded once per process (knn_index.get_index) and memory-mapped, so the
+per-session overhead should stay flat.
+
+Run from the repository root:
+
+    python .mlf_app/benchmarks/session_memory_benchmark.py --sessions 1 5 10 20
+"""
+import argparse
+import gc
+import os
+import sys
+import warnings
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from streamlit.testing.v1 import AppTest
+
+from knn_index import load_or_build_index, memory_report
+from model_registry import _rss_bytes
+
+
+def open_session():
+    session = AppTest.from_file(os.path.join(APP_DIR, "pages", "KNN.py"), default_timeout=120).run()
+    session.button[0].click().run()
+    return session
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure KNN page memory per concurrent session.")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 5, 10, 20])
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore")
+
+    report = memory_report(load_or_build_index())
+    print(f"Index arrays: {report['mapped_bytes'] / 1e6:.1f} MB memory-mapped (shared), "
+          f"{report['private_bytes'] / 1e6:.1f} MB private")
+
+    sessions = [open_session()]
+    gc.collect()
+    baseline = _rss_bytes()
+    print(f"{'sessions':>8} {'RSS MB':>8} {'KB/session':>11}")
+    print(f"{1:>8} {baseline / 1e6:>8.1f} {'-':>11}")
+    for target in sorted(args.sessions):
+        while len(sessions) < target:
+            sessions.append(open_session())
+        if target == 1:
+            continue
+        gc.collect()
+        rss = _rss_bytes()
+        print(f"{target:>8} {rss / 1e6:>8.1f} {(rss - baseline) / (target - 1) / 1e3:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Import and first-render time of each page, in a fresh interpreter per page.
+
+Each page runs once headless (AppTest) under `python -X importtime`. Streamlit
+itself is imported before the page starts, so the import breakdown only shows
+what the page adds: every module imported until its first run finishes is
+summed per top-level package. The first run time is what a user waits for the
+page to paint; the background warm-up started at the end of the page is timed
+separately, along with the imports it does.
+
+Run from the repository root:
+
+    python .mlf_app/benchmarks/startup_benchmark.py
+    python .mlf_app/benchmarks/startup_benchmark.py --pages Home.py pages/KNN.py --top 15
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+DEFAULT_PAGES = ["Home.py", "pages/PricePredictor.py", "pages/KNN.py", "pages/DataAnalysis.py",
+                 "pages/FeedbackAnalytics.py"]
+PAGE_START = "--- page start ---"
+PAGE_DONE = "--- page rendered ---"
+
+
+def run_child(page, wait_warm_up):
+    """Runs in the measured interpreter: render `page` once and print timings as JSON."""
+    import warnings
+
+    from streamlit.testing.v1 import AppTest
+
+    import startup
+
+    warnings.filterwarnings("ignore")
+    # Like `streamlit run`, keep the script's folder on sys.path for good; AppTest
+    # otherwise adds and removes it around the run, racing the warm-up's imports
+    sys.path.insert(0, os.path.dirname(os.path.join(APP_DIR, page)))
+    print(PAGE_START, file=sys.stderr, flush=True)
+    start = time.perf_counter()
+    session = AppTest.from_file(os.path.join(APP_DIR, page), default_timeout=300).run()
+    first_run = time.perf_counter() - start
+    print(PAGE_DONE, file=sys.stderr, flush=True)
+
+    warm_up_seconds = None
+    if wait_warm_up:
+        start = time.perf_counter()
+        if startup.wait_for_warm_up():
+            warm_up_seconds = time.perf_counter() - start
+    print(json.dumps({
+        "first_run_seconds": first_run,
+        "exceptions": [e.value for e in session.exception],
+        "warm_up_wait_seconds": warm_up_seconds,
+        "warm_up": startup.warm_up_stats(),
+    }))
+
+
+def parse_importtime(lines):
+    """Cumulative seconds per top-level package over the outermost imports in `lines`."""
+    packages = defaultdict(float)
+    for line in lines:
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if len(name) - len(name.lstrip()) > 1:
+            # Nested import, already counted in its parent's cumulative time
+            continue
+        packages[name.strip().split(".")[0]] += int(cumulative) / 1e6
+    return dict(packages)
+
+
+def measure(page, wait_warm_up):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", os.path.abspath(__file__), "--child", page]
+        + (["--wait-warm-up"] if wait_warm_up else []),
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{page} failed:\n{result.stderr[-2000:]}")
+    stderr = result.stderr.splitlines()
+    start, done = stderr.index(PAGE_START), stderr.index(PAGE_DONE)
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    report["page_imports"] = parse_importtime(stderr[start + 1:done])
+    report["warm_up_imports"] = parse_importtime(stderr[done + 1:])
+    return report
+
+
+def print_imports(title, packages, top):
+    total = sum(packages.values())
+    print(f"  {title}: {total * 1e3:.0f} ms")
+    for package, seconds in sorted(packages.items(), key=lambda kv: -kv[1])[:top]:
+        print(f"    {package:<28} {seconds * 1e3:>8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-page import and first-render timing.")
+    parser.add_argument("--pages", nargs="+", default=DEFAULT_PAGES, help="Page scripts, relative to .mlf_app")
+    parser.add_argument("--top", type=int, default=10, help="Packages listed per page")
+    parser.add_argument("--no-warm-up", action="store_true", help="Do not wait for the background warm-up")
+    parser.add_argument("--child", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--wait-warm-up", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.wait_warm_up)
+        return
+
+    for page in args.pages:
+        report = measure(page, not args.no_warm_up)
+        print(f"{page}: first run {report['first_run_seconds'] * 1e3:.0f} ms"
+              + (f", exceptions: {report['exceptions']}" if report["exceptions"] else ""))
+        print_imports("imports before first paint", report["page_imports"], args.top)
+        if report["warm_up"]:
+            tasks = ", ".join(f"{name} {stats['seconds'] * 1e3:.0f} ms ({stats['status']})"
+                              for name, stats in report["warm_up"].items())
+            print(f"  background warm-up: {tasks}")
+            print_imports("imports during warm-up", report["warm_up_imports"], args.top)
+
+
+if __name__ == "__main__":
+    main()
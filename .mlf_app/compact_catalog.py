@@ -0,0 +1,174 @@
+"""
+Compact in-memory representation of a listings table.
+
+Numeric columns are stored as one float32 matrix, 0/1 columns (the equip_* and
+connectivity flags) as bit-packed uint8 rows, and text columns as small integer
+codes into a per-column dictionary whose strings share one UTF-8 buffer. The
+catalog behaves enough like a DataFrame (`columns`, `index`, `len`,
+`catalog[name]`) for featurizer.featurize to read it directly, `view()`
+lends APIs that only take DataFrames (sklearn's ColumnTransformer) a frame
+over the catalog's own arrays, and `to_frame()` rebuilds an independent one.
+knn_index builds the recommender from a catalog of the training listings, and
+batch_score --raw holds each chunk as one while it waits to be scored.
+
+Compare its footprint with the pandas frames from the repository root:
+
+    python .mlf_app/compact_catalog.py X_train_final.csv
+"""
+import sys
+
+import numpy as np
+import pandas as pd
+
+
+class StringDictionary:
+    """Distinct strings of a column, concatenated in one UTF-8 buffer with offsets."""
+
+    def __init__(self, values):
+        encoded = [str(v).encode("utf-8") for v in values]
+        self.offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=self.offsets[1:])
+        self.buffer = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def values(self):
+        data = self.buffer.tobytes()
+        return np.array(
+            [data[start:stop].decode("utf-8") for start, stop in zip(self.offsets[:-1], self.offsets[1:])],
+            dtype=object,
+        )
+
+    @property
+    def nbytes(self):
+        return self.buffer.nbytes + self.offsets.nbytes
+
+
+def _code_dtype(n_categories):
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def _is_flag(values):
+    if not pd.api.types.is_numeric_dtype(values) or values.isna().any():
+        return False
+    return bool(np.isin(values.to_numpy(), [0, 1]).all())
+
+
+class CompactCatalog:
+    """
+    Parameters:
+    - numeric: (n_rows, n_numeric) float32 matrix, column-major so each column is contiguous
+    - numeric_names: Column names of `numeric`
+    - flags: (n_rows, ceil(n_flags / 8)) uint8 matrix from np.packbits
+    - flag_names: Column names of the packed flags, in bit order
+    - codes: {name: int array of dictionary codes, -1 for missing}
+    - dictionaries: {name: StringDictionary}
+    - columns: Column order of the source table
+    - index: Row index of the source table
+    """
+
+    def __init__(self, numeric, numeric_names, flags, flag_names, codes, dictionaries, columns, index):
+        self.numeric = numeric
+        self.flags = flags
+        self.codes = codes
+        self.dictionaries = dictionaries
+        self.numeric_names = list(numeric_names)
+        self.flag_names = list(flag_names)
+        self.columns = pd.Index(columns)
+        self.index = index
+        self._numeric_position = {name: i for i, name in enumerate(numeric_names)}
+        self._flag_position = {name: i for i, name in enumerate(flag_names)}
+
+    @classmethod
+    def from_frame(cls, df):
+        """Encode a DataFrame; numeric columns holding only 0/1 become packed flags."""
+        flag_names = [c for c in df.columns if _is_flag(df[c])]
+        numeric_names = [c for c in df.columns if c not in flag_names and pd.api.types.is_numeric_dtype(df[c])]
+        text_names = [c for c in df.columns if c not in flag_names and c not in numeric_names]
+
+        numeric = np.asfortranarray(df[numeric_names].to_numpy(dtype=np.float32)) if numeric_names \
+            else np.empty((len(df), 0), dtype=np.float32)
+        flags = np.packbits(df[flag_names].to_numpy(dtype=np.uint8), axis=1) if flag_names \
+            else np.empty((len(df), 0), dtype=np.uint8)
+
+        codes, dictionaries = {}, {}
+        for name in text_names:
+            column_codes, categories = pd.factorize(df[name], use_na_sentinel=True)
+            codes[name] = column_codes.astype(_code_dtype(len(categories)))
+            dictionaries[name] = StringDictionary(categories)
+        return cls(numeric, numeric_names, flags, flag_names, codes, dictionaries, df.columns, df.index.copy())
+
+    def __len__(self):
+        return len(self.index)
+
+    def column(self, name):
+        """Decoded values of one column: float32 view, uint8 flags, or object strings with NaN."""
+        if name in self._numeric_position:
+            return self.numeric[:, self._numeric_position[name]]
+        if name in self._flag_position:
+            bit = self._flag_position[name]
+            return (self.flags[:, bit >> 3] >> (7 - (bit & 7))) & 1
+        categorical = pd.Categorical.from_codes(self.codes[name], self.dictionaries[name].values(), validate=False)
+        return np.asarray(categorical, dtype=object)
+
+    def __getitem__(self, name):
+        if name in self.codes:
+            values = pd.Categorical.from_codes(self.codes[name], self.dictionaries[name].values(), validate=False)
+            return pd.Series(values, index=self.index, name=name)
+        return pd.Series(self.column(name), index=self.index, name=name, copy=False)
+
+    def select(self, columns):
+        """Catalog of `columns` only, in that order."""
+        columns = list(columns)
+        numeric_names = [c for c in columns if c in self._numeric_position]
+        flag_names = [c for c in columns if c in self._flag_position]
+        numeric = np.asfortranarray(self.numeric[:, [self._numeric_position[c] for c in numeric_names]])
+        flags = np.packbits(np.stack([self.column(c) for c in flag_names], axis=1), axis=1) if flag_names \
+            else np.empty((len(self), 0), dtype=np.uint8)
+        codes = {c: self.codes[c] for c in columns if c in self.codes}
+        dictionaries = {c: self.dictionaries[c] for c in codes}
+        return CompactCatalog(numeric, numeric_names, flags, flag_names, codes, dictionaries, columns, self.index)
+
+    def view(self, columns=None):
+        """
+        DataFrame of `columns` (default: all) whose numeric columns are views into
+        the float32 matrix and whose text columns stay dictionary-coded. Only the
+        flags are unpacked. Do not write to it: the writes would land in the catalog.
+        """
+        columns = self.columns if columns is None else columns
+        return pd.DataFrame({name: self[name] for name in columns}, index=self.index, copy=False)
+
+    def to_frame(self, columns=None):
+        """DataFrame of `columns` (default: all) with float32 numerics, uint8 flags and categorical text."""
+        columns = self.columns if columns is None else columns
+        return pd.DataFrame({name: self[name] for name in columns}, index=self.index)
+
+    @property
+    def nbytes(self):
+        return (
+            self.numeric.nbytes + self.flags.nbytes + self.index.nbytes
+            + sum(c.nbytes for c in self.codes.values())
+            + sum(d.nbytes for d in self.dictionaries.values())
+        )
+
+
+def main():
+    from featurizer import load_raw
+    from spec_normalizer import normalize_specs
+
+    path = sys.argv[1] if len(sys.argv) > 1 else "X_train_final.csv"
+    raw = load_raw(path)
+    for label, df in (("raw", raw), ("normalized", normalize_specs(raw))):
+        catalog = CompactCatalog.from_frame(df)
+        frame_bytes = df.memory_usage(deep=True).sum()
+        print(f"{path} ({label}): pandas {frame_bytes / 1e6:.2f} MB, compact {catalog.nbytes / 1e6:.2f} MB "
+              f"({frame_bytes / catalog.nbytes:.1f}x smaller); {catalog.numeric.shape[1]} float32, "
+              f"{len(catalog.flag_names)} bit-packed flags, {len(catalog.codes)} dictionary-coded columns")
+
+
+if __name__ == "__main__":
+    main()
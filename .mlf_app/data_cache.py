@@ -0,0 +1,277 @@
+"""
+Columnar binary cache for the training CSVs.
+
+Parsing the raw CSVs (multi-line quoted titles, "\\xa0"-separated units) is the
+slowest part of a cold start. The first load converts each CSV into one .npy
+file per column under artifacts/data_cache/<file>/, and later loads map those
+files instead of parsing. Numeric columns are memory-mapped and used
+zero-copy; text columns are dictionary-coded (int32 codes plus the distinct
+values). A CSV whose size/mtime changed is re-hashed and converted again if its
+content differs. Derived tables (e.g. the cleaned listings of spec_normalizer.py)
+are cached under their own name with the same check against their source CSV.
+Every entry also records the version of the code that parsed it (see
+reader_version), so changing that code, or an app module it imports, converts
+the table again.
+
+Convert ahead of time and report load times from the repository root:
+
+    python .mlf_app/data_cache.py X_train_final.csv y_train.csv titulos.csv
+"""
+import ast
+import datetime
+import functools
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+CACHE_FORMAT_VERSION = 1
+DEFAULT_CACHE_DIR = os.path.join("artifacts", "data_cache")
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def file_sha256(path):
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _source_sha256(path):
+    return file_sha256(path)
+
+
+@functools.lru_cache(maxsize=None)
+def _app_sources(source):
+    """
+    `source` and every app module it imports, directly or through another one
+    (imports inside functions included), as sorted paths. Only modules in
+    APP_DIR are followed; a library reader such as pd.read_csv is just its file.
+    """
+    if os.path.dirname(source) != APP_DIR:
+        return (source,)
+    seen, pending = set(), [source]
+    while pending:
+        path = pending.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        with open(path, encoding="utf-8") as f:
+            tree = ast.parse(f.read(), path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                names = [node.module]
+            else:
+                continue
+            for imported in names:
+                candidate = os.path.join(APP_DIR, imported.split(".")[0] + ".py")
+                if os.path.exists(candidate):
+                    pending.append(candidate)
+    return tuple(sorted(seen))
+
+
+def reader_sources(read_csv):
+    """Source files whose code can change what `read_csv` returns (see reader_version)."""
+    source = getattr(inspect.getmodule(read_csv), "__file__", None)
+    if source is None or not os.path.exists(source):
+        return ()
+    return _app_sources(os.path.abspath(source))
+
+
+def reader_version(read_csv):
+    """
+    Identifies the code behind `read_csv`: its qualified name plus a hash of its
+    module's source file and of every app module that one imports, e.g.
+    "spec_normalizer.load_normalized:3f2a...". Editing any of them (say, the
+    cleaning rules, or featurizer.load_raw underneath them) changes the version.
+    """
+    module = inspect.getmodule(read_csv)
+    name = f"{getattr(module, '__name__', '?')}.{getattr(read_csv, '__qualname__', type(read_csv).__name__)}"
+    sources = reader_sources(read_csv)
+    if not sources:
+        return name
+    digest = hashlib.sha256("".join(_source_sha256(path) for path in sources).encode("ascii")).hexdigest()
+    return f"{name}:{digest[:16]}"
+
+
+def _cache_path(path, cache_dir, name=None):
+    return os.path.join(cache_dir, name or os.path.basename(path))
+
+
+def _read_manifest(table_dir):
+    try:
+        with open(os.path.join(table_dir, "manifest.json")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_manifest(table_dir, manifest):
+    with open(os.path.join(table_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+
+def _is_current(path, table_dir, manifest, version=None):
+    """
+    True when `manifest` describes the current contents of `path`, parsed by the
+    code at `version` (see reader_version). A changed size/mtime only triggers
+    re-conversion if the content hash changed too.
+    """
+    if manifest is None or manifest.get("format_version") != CACHE_FORMAT_VERSION:
+        return False
+    if manifest.get("reader_version") != version:
+        return False
+    stat = os.stat(path)
+    if manifest["source_size"] == stat.st_size and manifest["source_mtime_ns"] == stat.st_mtime_ns:
+        return True
+    if manifest["source_sha256"] != file_sha256(path):
+        return False
+    # Touched but unchanged: remember the new mtime so the hash is not recomputed next time
+    manifest["source_size"] = stat.st_size
+    manifest["source_mtime_ns"] = stat.st_mtime_ns
+    _write_manifest(table_dir, manifest)
+    return True
+
+
+def _save_column(directory, name, values):
+    """Save one column; returns its manifest entry."""
+    if values.dtype.kind in "biuf":
+        np.save(os.path.join(directory, f"{name}.npy"), np.ascontiguousarray(values))
+        return {"kind": "array"}
+    codes, categories = pd.factorize(values, use_na_sentinel=True)
+    np.save(os.path.join(directory, f"{name}.codes.npy"), codes.astype(np.int32))
+    np.save(os.path.join(directory, f"{name}.values.npy"), np.asarray(categories, dtype=str))
+    return {"kind": "strings", "dtype": str(values.dtype)}
+
+
+def _load_column(directory, name, entry):
+    if entry["kind"] == "array":
+        return np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+    codes = np.load(os.path.join(directory, f"{name}.codes.npy"), mmap_mode="r")
+    categories = np.load(os.path.join(directory, f"{name}.values.npy"), mmap_mode="r")
+    values = categories.astype(object).take(codes)
+    values[codes < 0] = np.nan
+    return pd.array(values, dtype=entry["dtype"])
+
+
+def convert(path, read_csv, cache_dir=DEFAULT_CACHE_DIR, name=None):
+    """
+    Parse `path` with `read_csv(path)` and write its columnar cache.
+    Returns the parsed DataFrame.
+    """
+    start = time.perf_counter()
+    df = read_csv(path)
+    parse_seconds = time.perf_counter() - start
+
+    table_dir = _cache_path(path, cache_dir, name)
+    tmp_dir = f"{table_dir}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    columns = []
+    for i, column in enumerate(df.columns):
+        values = df[column]
+        entry = _save_column(tmp_dir, f"col{i}", values.to_numpy() if values.dtype.kind in "biuf" else values)
+        entry["name"] = column
+        columns.append(entry)
+    index = _save_column(tmp_dir, "index", df.index.to_numpy() if df.index.dtype.kind in "biuf" else df.index)
+    index["name"] = df.index.name
+
+    stat = os.stat(path)
+    _write_manifest(tmp_dir, {
+        "format_version": CACHE_FORMAT_VERSION,
+        "created_at": datetime.datetime.now().isoformat(),
+        "source": os.path.abspath(path),
+        "source_size": stat.st_size,
+        "source_mtime_ns": stat.st_mtime_ns,
+        "source_sha256": file_sha256(path),
+        "reader_version": reader_version(read_csv),
+        "n_rows": len(df),
+        "columns": columns,
+        "index": index,
+        "parse_seconds": parse_seconds,
+    })
+
+    old_dir = f"{table_dir}.old-{os.getpid()}"
+    if os.path.exists(table_dir):
+        os.replace(table_dir, old_dir)
+    os.replace(tmp_dir, table_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return df
+
+
+def load_columns(path, cache_dir=DEFAULT_CACHE_DIR, name=None):
+    """
+    Columns of a converted CSV as {name: array}, without building a DataFrame.
+    Numeric columns are read-only memory maps; text columns are decoded arrays.
+    """
+    table_dir = _cache_path(path, cache_dir, name)
+    manifest = _read_manifest(table_dir)
+    return {entry["name"]: _load_column(table_dir, f"col{i}", entry) for i, entry in enumerate(manifest["columns"])}
+
+
+def load_table(path, read_csv=pd.read_csv, cache_dir=DEFAULT_CACHE_DIR, name=None):
+    """
+    `read_csv(path)` as it would be returned by parsing the CSV, served from the
+    columnar cache when it matches the file on disk.
+
+    Parameters:
+    - path: CSV file
+    - read_csv: Function parsing the CSV into the wanted DataFrame (used on conversion)
+    - cache_dir: Root directory of the cache
+    - name: Cache entry name, to keep several tables derived from one CSV (default: the file name)
+    """
+    start = time.perf_counter()
+    table_dir = _cache_path(path, cache_dir, name)
+    manifest = _read_manifest(table_dir)
+    if _is_current(path, table_dir, manifest, reader_version(read_csv)):
+        columns = [_load_column(table_dir, f"col{i}", entry) for i, entry in enumerate(manifest["columns"])]
+        index = _load_column(table_dir, "index", manifest["index"])
+        df = pd.DataFrame(dict(enumerate(columns)), copy=False)
+        df.columns = pd.Index([entry["name"] for entry in manifest["columns"]])
+        df.index = pd.Index(index, name=manifest["index"]["name"])
+        source = "cache"
+    else:
+        df = convert(path, read_csv, cache_dir, name)
+        source = "csv"
+
+    with _stats_lock:
+        _stats[name or path] = {"source": source, "seconds": time.perf_counter() - start, "rows": len(df)}
+    return df
+
+
+def load_stats():
+    """Where and how fast each table was last loaded in this process."""
+    with _stats_lock:
+        return {path: dict(stats) for path, stats in _stats.items()}
+
+
+def main():
+    from featurizer import load_raw
+
+    paths = sys.argv[1:] or ["X_train_final.csv", "y_train.csv", "titulos.csv"]
+    for path in paths:
+        read_csv = load_raw if os.path.basename(path).startswith("X_") else pd.read_csv
+        start = time.perf_counter()
+        read_csv(path)
+        parse_seconds = time.perf_counter() - start
+        load_table(path, read_csv)
+        load_table(path, read_csv)
+        cached_seconds = load_stats()[path]["seconds"]
+        print(f"{path}: CSV parse {parse_seconds * 1e3:.1f} ms, cached load {cached_seconds * 1e3:.1f} ms "
+              f"({parse_seconds / cached_seconds:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import functools
+
+import numpy as np
+
+from feature_schema import get_feature_schema
+from model_registry import DEFAULT_MODEL_PATH
+
+
+class FeatureLayout:
+    """
+    Fixed feature name -> column index map for one model, compiled once.
+
+    Rows are plain float32 NumPy buffers in the model's column order, so they can
+    go straight to `model.predict` without building a DataFrame.
+    """
+
+    def __init__(self, feature_names):
+        self.feature_names = list(feature_names)
+        self.index = {name: i for i, name in enumerate(self.feature_names)}
+        self.n_features = len(self.feature_names)
+        self._group_cache = {}
+
+    def new_buffer(self, n_rows=1):
+        """Zero-filled (n_rows, n_features) float32 matrix, matching the page's all-zero defaults."""
+        return np.zeros((n_rows, self.n_features), dtype=np.float32)
+
+    def group_indices(self, names):
+        """Column indices of a one-hot group, computed once per distinct group."""
+        key = tuple(names)
+        indices = self._group_cache.get(key)
+        if indices is None:
+            indices = np.array([self.index[name] for name in key], dtype=np.intp)
+            self._group_cache[key] = indices
+        return indices
+
+    def vector(self, buffer=None, row=0):
+        """A FeatureVector writing into `buffer[row]` (a fresh single-row buffer by default)."""
+        if buffer is None:
+            buffer = self.new_buffer()
+        return FeatureVector(self, buffer, row)
+
+
+class FeatureVector:
+    """
+    Dict-like view of one row of a layout buffer.
+
+    `vector[name] = value` writes the value in place; `set_one_hot` clears a
+    whole group and sets the selected column in two index operations.
+    """
+
+    def __init__(self, layout, buffer, row=0):
+        self.layout = layout
+        self.buffer = buffer
+        self.row = row
+        self._values = buffer[row]
+
+    def __setitem__(self, name, value):
+        self._values[self.layout.index[name]] = value
+
+    def __getitem__(self, name):
+        return self._values[self.layout.index[name]]
+
+    def __contains__(self, name):
+        return name in self.layout.index
+
+    def set_one_hot(self, names, selected):
+        """
+        Parameters:
+        - names: Every feature name of the one-hot group
+        - selected: The feature name to set to 1
+        """
+        self._values[self.layout.group_indices(names)] = 0.0
+        self._values[self.layout.index[selected]] = 1.0
+
+    def items(self):
+        return zip(self.layout.feature_names, self._values.tolist())
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def matrix(self):
+        """The row as a (1, n_features) array, ready for `model.predict`."""
+        return self.buffer[self.row:self.row + 1]
+
+
+@functools.lru_cache(maxsize=None)
+def get_feature_layout(path=DEFAULT_MODEL_PATH):
+    """
+    Layout for the model at `path`, built once per process. The feature order
+    comes from the model's feature schema, so building it does not unpickle
+    the model (or import xgboost).
+    """
+    return FeatureLayout(get_feature_schema(path).feature_names)
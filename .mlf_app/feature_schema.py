@@ -0,0 +1,313 @@
+"""
+Feature schema of the price model: one artifact describing every input the
+pages collect, generated from the booster and the training listings.
+
+It holds the booster's feature order, the one-hot groups with their
+categories, the label encodings, the binary flags, and the range and default
+(training median or most frequent value) of every numeric feature. Pages load it
+once per process through get_feature_schema() and build their widgets and model
+rows from it instead of keeping their own option lists. It is rebuilt when the
+model artifact or the training CSV changes. Number inputs keep the ranges and
+starting values the price page has always offered (INPUT_OVERRIDES) rather
+than the training ones; see FeatureSchema.input_range.
+
+Build it ahead of time and print a summary from the repository root:
+
+    python .mlf_app/feature_schema.py
+"""
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import threading
+
+from model_registry import DEFAULT_MODEL_PATH
+
+SCHEMA_FORMAT_VERSION = 1
+DEFAULT_SCHEMA_DIR = os.path.join("artifacts", "feature_schema")
+TRAINING_DATA = "X_train_final.csv"
+
+# The price page's hand-picked number input ranges and starting values, kept
+# over the training range and median so the landing configuration and the
+# configurations users can enter stay the same.
+INPUT_OVERRIDES = {
+    "ram_memoria_ram_GB": {"min": 0, "max": 256, "default": 16},
+    "ram_frecuencia_memoria_MHz": {"min": 1600, "max": 8533, "default": 3200},
+    "pantalla_tamaño_pantalla_pulgadas": {"min": 5.0, "max": 40.0, "default": 15.6},
+    "pantalla_diagonal_pantalla_cm": {"min": 12.0, "max": 100.0, "default": 39.6},
+    "pantalla_luminosidad_cd_m2": {"min": 100, "max": 1500, "default": 300},
+    "disco_duro_capacidad_memoria_ssd_GB": {"min": 8, "max": 8000, "default": 1000},
+    "disco_duro_número_discos_duros_instalados": {"min": 0, "max": 3, "default": 1},
+    "procesador_frecuencia_turbo_máx__GHz": {"min": 1.9, "max": 6.0, "default": 5.0},
+    "procesador_número_hilos_ejecución": {"min": 2, "max": 32, "default": 12},
+    "procesador_tdp_W": {"min": 2, "max": 280, "default": 65},
+    "procesador_número_núcleos_procesador_cores": {"min": 1, "max": 32, "default": 8},
+    "procesador_frecuencia_reloj": {"min": 0.5, "max": 4.3, "default": 1.0},
+    "procesador_caché_MB": {"min": 1, "max": 128, "default": 12},
+    "procesador_frecuencia": {"min": 0.0011, "max": 4.7, "default": 2.5},
+    "alimentación_vatios_hora_Wh": {"min": 10.0, "max": 150.0, "default": 50.0},
+    "alimentación_autonomía_batería_h": {"min": 1.0, "max": 24.0, "default": 8.0},
+    "altura_mm": {"min": 0, "max": 560, "default": 101},
+    "medidas_profundidad_cm": {"min": 3.0, "max": 55.0, "default": 24.7},
+    "medidas_peso_kg": {"min": 0.2, "max": 24.0, "default": 2.45},
+    "medidas_ancho_cm": {"min": 3.0, "max": 92.0, "default": 27.3},
+    "otras_características_fecha_lanzamiento": {"min": 2013, "max": 2025, "default": 2023},
+}
+
+
+def schema_path(model_path=DEFAULT_MODEL_PATH, schema_dir=DEFAULT_SCHEMA_DIR):
+    """Where the schema of the model at `model_path` is stored."""
+    return os.path.join(schema_dir, os.path.splitext(os.path.basename(model_path))[0] + ".json")
+
+
+def source_hash(model_path=DEFAULT_MODEL_PATH, data_path=TRAINING_DATA):
+    """SHA-256 over the model artifact and the training CSV."""
+    digest = hashlib.sha256()
+    for path in (model_path, data_path):
+        with open(path, "rb") as f:
+            digest.update(hashlib.file_digest(f, "sha256").digest())
+    return digest.hexdigest()
+
+
+def _number(value):
+    return int(value) if float(value).is_integer() else round(float(value), 4)
+
+
+def build_schema(feature_names, raw):
+    """
+    Describe the model inputs.
+
+    Parameters:
+    - feature_names: The booster's feature names, in model order
+    - raw: Training listings in the X_*_final.csv layout (see featurizer.load_raw)
+
+    Returns the schema as a JSON-serializable dict.
+    """
+    from featurizer import (CONNECTIVITY_FLAGS, LABEL_COLUMNS, MISSING_LABEL, ONE_HOT_COLUMNS, OS_COLUMN, OS_GROUPS,
+                            featurize, one_hot_categories)
+
+    features = featurize(raw, feature_names)
+    grouped = set()
+
+    one_hot_groups = {}
+    group_columns = dict(ONE_HOT_COLUMNS, **{OS_COLUMN: "os_"})
+    for raw_column, prefix in group_columns.items():
+        categories = OS_GROUPS if raw_column == OS_COLUMN else one_hot_categories(prefix, feature_names)
+        columns = [prefix + c for c in categories]
+        grouped.update(columns)
+        counts = features[columns].sum().rename(dict(zip(columns, categories)))
+        one_hot_groups[raw_column] = {
+            "prefix": prefix,
+            "categories": list(categories),
+            "counts": [int(c) for c in counts],
+            "default": counts.drop("nan", errors="ignore").idxmax(),
+        }
+
+    label_encodings = {}
+    for raw_column, (feature, label_map) in LABEL_COLUMNS.items():
+        grouped.add(feature)
+        counts = features[feature].map(label_map).value_counts()
+        label_encodings[feature] = {
+            "raw_column": raw_column,
+            "labels": {str(code): name for code, name in sorted(label_map.items())},
+            "missing_label": MISSING_LABEL,
+            "default": counts.drop(MISSING_LABEL, errors="ignore").idxmax(),
+        }
+
+    flags = {"connectivity": [], "equipment": [], "other": []}
+    numeric = {}
+    for name in feature_names:
+        if name in grouped:
+            continue
+        values = features[name].dropna()
+        if name in CONNECTIVITY_FLAGS:
+            flags["connectivity"].append(name)
+            continue
+        if values.isin([0.0, 1.0]).all():
+            flags["equipment" if name.startswith("equip_") else "other"].append(name)
+            continue
+        numeric[name] = {
+            "min": _number(values.min()),
+            "max": _number(values.max()),
+            "default": _number(values.median()),
+            "integer": bool((values == values.round()).all()),
+            "missing": int(features[name].isna().sum()),
+        }
+
+    schema = {
+        "features": list(feature_names),
+        "one_hot_groups": one_hot_groups,
+        "label_encodings": label_encodings,
+        "flags": flags,
+        "numeric": numeric,
+        "rows": len(raw),
+    }
+    # Content version: changes only when something the pages use changes
+    schema["version"] = hashlib.sha256(json.dumps(schema, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+    return schema
+
+
+def write_schema(path=None, model_path=DEFAULT_MODEL_PATH, data_path=TRAINING_DATA):
+    """Build the schema of `model_path` from `data_path` and write it atomically to `path`."""
+    import joblib
+
+    from data_cache import load_table
+    from featurizer import load_raw
+
+    path = path or schema_path(model_path)
+    current_hash = source_hash(model_path, data_path)
+    feature_names = list(joblib.load(model_path).get_booster().feature_names)
+    schema = build_schema(feature_names, load_table(data_path, load_raw))
+    schema.update(
+        format_version=SCHEMA_FORMAT_VERSION,
+        created_at=datetime.datetime.now().isoformat(),
+        model_path=model_path,
+        data_path=data_path,
+        source_hash=current_hash,
+    )
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(schema, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return schema
+
+
+def _read_schema(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def load_or_build_schema(model_path=DEFAULT_MODEL_PATH, path=None, data_path=TRAINING_DATA):
+    """The stored schema of `model_path`, rebuilt first if it is missing or stale."""
+    path = path or schema_path(model_path)
+    schema = _read_schema(path)
+    if (schema is None or schema.get("format_version") != SCHEMA_FORMAT_VERSION
+            or schema.get("source_hash") != source_hash(model_path, data_path)):
+        schema = write_schema(path, model_path, data_path)
+    return schema
+
+
+class OneHotGroup:
+    """The one-hot features of one raw column, e.g. tipo -> tipo_Desktop, tipo_Laptop, tipo_nan."""
+
+    def __init__(self, raw_column, spec):
+        self.raw_column = raw_column
+        self.prefix = spec["prefix"]
+        self.categories = spec["categories"]
+        self.default = spec["default"]
+        self.features = [self.prefix + c for c in self.categories]
+        self._positions = {c: i for i, c in enumerate(self.categories)}
+
+    def feature(self, category):
+        return self.prefix + category
+
+    def index(self, category):
+        """Position of `category` in `categories`, e.g. for a selectbox index."""
+        return self._positions[category]
+
+    def values(self):
+        """Categories that are real raw values (without the missing-value "nan")."""
+        return [c for c in self.categories if c != "nan"]
+
+
+class LabelEncoding:
+    """Code <-> name of one label-encoded feature, both directions precomputed."""
+
+    def __init__(self, feature, spec):
+        self.feature = feature
+        self.raw_column = spec["raw_column"]
+        self.names_by_code = {int(code): name for code, name in spec["labels"].items()}
+        self.codes_by_name = {name: code for code, name in self.names_by_code.items()}
+        self.names = sorted(self.codes_by_name)
+        self.missing_label = spec["missing_label"]
+        self.default = spec["default"]
+        self._positions = {name: i for i, name in enumerate(self.names)}
+
+    def code(self, name):
+        return self.codes_by_name[name]
+
+    def name(self, code):
+        return self.names_by_code[int(code)]
+
+    def index(self, name):
+        """Position of `name` in the sorted `names`, e.g. for a selectbox index."""
+        return self._positions[name]
+
+    def values(self):
+        """Names that are real raw values (without the missing-value label)."""
+        return [n for n in self.names if n != self.missing_label]
+
+
+class FeatureSchema:
+    """
+    Read-only view of a schema dict with the lookups the pages need.
+
+    Attributes:
+    - feature_names: Model column order
+    - groups: {raw column: OneHotGroup}
+    - labels: {model feature: LabelEncoding}, also reachable by raw column through `label_for`
+    - flags: {"connectivity", "equipment", "other": binary features}
+    - numeric: {model feature: {"min", "max", "default", "integer", "missing"}}
+    """
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.version = schema["version"]
+        self.feature_names = schema["features"]
+        self.index = {name: i for i, name in enumerate(self.feature_names)}
+        self.groups = {raw: OneHotGroup(raw, spec) for raw, spec in schema["one_hot_groups"].items()}
+        self.labels = {feature: LabelEncoding(feature, spec) for feature, spec in schema["label_encodings"].items()}
+        self._labels_by_raw = {encoding.raw_column: encoding for encoding in self.labels.values()}
+        self.flags = schema["flags"]
+        self.numeric = schema["numeric"]
+
+    def label_for(self, raw_column):
+        return self._labels_by_raw[raw_column]
+
+    def input_range(self, feature):
+        """
+        (min, max, default) of the number input for `feature`: the page's own
+        INPUT_OVERRIDES entry if it has one, else the training range and median.
+        """
+        spec = {**self.numeric[feature], **INPUT_OVERRIDES.get(feature, {})}
+        return spec["min"], spec["max"], spec["default"]
+
+
+_schemas = {}
+_schemas_lock = threading.Lock()
+
+
+def get_feature_schema(model_path=DEFAULT_MODEL_PATH):
+    """Process-wide FeatureSchema of the model at `model_path`, loaded (or built) on first use."""
+    key = os.path.abspath(model_path)
+    schema = _schemas.get(key)
+    if schema is None:
+        with _schemas_lock:
+            schema = _schemas.get(key)
+            if schema is None:
+                schema = FeatureSchema(load_or_build_schema(model_path))
+                _schemas[key] = schema
+    return schema
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the feature schema of the price model.")
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH)
+    parser.add_argument("--data", default=TRAINING_DATA)
+    parser.add_argument("--output", default=None, help="Schema file (default: artifacts/feature_schema/<model>.json)")
+    args = parser.parse_args()
+
+    schema = write_schema(args.output, args.model, args.data)
+    print(f"Schema {schema['version']} of {args.model}: {len(schema['features'])} features, "
+          f"{len(schema['one_hot_groups'])} one-hot groups, {len(schema['label_encodings'])} label encodings, "
+          f"{sum(map(len, schema['flags'].values()))} flags, {len(schema['numeric'])} numeric features")
+    print(f"Written to {args.output or schema_path(args.model)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Turns raw listing rows (the layout of X_train_final.csv / X_test_final.csv)
+into the engineered feature matrix the price model was trained on.
+
+Run from the repository root to featurize a file and time it:
+
+    python .mlf_app/featurizer.py X_test_final.csv
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from label_maps import company_name_map, resolution_map, procesador_name_map, graphics_brand_name
+
+# Raw column -> (model feature, label map) for the label-encoded features.
+LABEL_COLUMNS = {
+    "company_name": ("company_name_label", company_name_map),
+    "gráfica_tarjeta_gráfica": ("gráfica_tarjeta_gráfica_label", graphics_brand_name),
+    "pantalla_tecnología_pantalla": ("pantalla_tecnología_pantalla_label", resolution_map),
+    "procesador_name": ("procesador_name_label", procesador_name_map),
+}
+MISSING_LABEL = "Missing_value"
+
+# Raw column -> prefix of its one-hot features. Missing values go to "<prefix>nan".
+ONE_HOT_COLUMNS = {
+    "tipo": "tipo_",
+    "tipo_producto": "tipo_producto_",
+    "disco_duro_tipo_disco_duro": "disco_duro_tipo_disco_duro_",
+    "gráfica_salida_vídeo": "gráfica_salida_vídeo_",
+    "ram_tipo_ram": "ram_tipo_ram_",
+    "almacenamiento_lector_óptico": "almacenamiento_lector_óptico_",
+    "procesador_nivel_caché": "procesador_nivel_caché_",
+    "color": "color_",
+}
+
+CONNECTIVITY_COLUMN = "comunicaciones_conectividad"
+CONNECTIVITY_FLAGS = ["Bluetooth", "Ethernet", "LAN", "NFC", "infrarrojos", "wifi", "wifi Direct"]
+
+OS_COLUMN = "sistema_operativo_sistema_operativo"
+OS_GROUPS = ["DOS", "No OS", "Other OS", "Windows", "macOS"]
+
+# The raw files carry the processor clock twice: once as a mix of "1.300 MHz"
+# and "1,3 GHz" strings and once (pandas renames it ".1") always in GHz.
+FREQUENCY_MIXED_COLUMN = "procesador_frecuencia_reloj"
+FREQUENCY_GHZ_COLUMN = "procesador_frecuencia_reloj.1"
+
+
+def raw_csv_kwargs(path):
+    """
+    Keyword arguments for pd.read_csv that index `path` by listing id.
+
+    X_test_final.csv has an empty header cell for the index column, but the
+    header of X_train_final.csv is missing it and ends in a trailing comma
+    instead, so every name sits one column to the left of its data.
+    """
+    header = list(pd.read_csv(path, nrows=0).columns)
+    if header[0] == "" or header[0].startswith("Unnamed"):
+        return {"index_col": 0}
+    return {"header": 0, "names": ["id"] + header[:-1], "index_col": 0}
+
+
+def load_raw(path):
+    """Read a raw listings CSV with its columns aligned to the right values."""
+    return pd.read_csv(path, **raw_csv_kwargs(path))
+
+
+def parse_frequency_ghz(values):
+    """
+    Vectorized "<number> MHz|GHz" -> GHz conversion, replicating the parsing the
+    model was trained with: the thousands dot of "1.300 MHz" was read as a
+    decimal point, so that listing reached training as 0.0013 GHz. Fixing this
+    here without retraining would move those rows across learned splits.
+    """
+    parts = values.astype("string").str.extract(r"([\d.,]+)\s*(MHz|GHz)")
+    number = pd.to_numeric(parts[0].str.replace(",", ".", regex=False), errors="coerce").to_numpy(dtype=np.float64)
+    is_mhz = (parts[1] == "MHz").fillna(False).to_numpy(dtype=bool)
+    return np.where(is_mhz, number / 1000.0, number)
+
+
+def os_group(values):
+    """Collapse free-text operating system names into the model's os_* groups (None when unknown)."""
+    values = values.astype("string")
+    group = np.select(
+        [
+            values.str.contains("Windows", na=False).to_numpy(dtype=bool),
+            values.str.contains("mac", case=False, na=False).to_numpy(dtype=bool),
+            values.str.contains("DOS", na=False).to_numpy(dtype=bool),
+            values.isin(["ninguno", "sin sistema operativo"]).fillna(False).to_numpy(dtype=bool),
+            values.isna().to_numpy(dtype=bool),
+        ],
+        ["Windows", "macOS", "DOS", "No OS", ""],
+        default="Other OS",
+    )
+    return np.where(group == "", None, group)
+
+
+def one_hot_categories(prefix, feature_names):
+    # "tipo_" must not swallow the "tipo_producto_" features.
+    longer = [p for p in ONE_HOT_COLUMNS.values() if p != prefix and p.startswith(prefix)]
+    return [
+        name[len(prefix):] for name in feature_names
+        if name.startswith(prefix) and not any(name.startswith(p) for p in longer)
+    ]
+
+
+def _set_one_hot(matrix, index, prefix, categories, values):
+    # -1 for values outside `categories`, which leave the row's group all zero
+    codes = pd.Index(categories).get_indexer(values)
+    rows = np.flatnonzero(codes >= 0)
+    columns = np.array([index[prefix + c] for c in categories])
+    matrix[rows, columns[codes[rows]]] = 1.0
+
+
+def featurize(raw, feature_names=None):
+    """
+    Build the model matrix for every row of `raw` in one column-wise pass.
+
+    Parameters:
+    - raw: DataFrame in the X_*_final.csv layout (see load_raw), or a
+      compact_catalog.CompactCatalog of one, which is read column by column
+    - feature_names: Column order to produce, defaults to the booster's
+
+    Returns a float32 DataFrame indexed like `raw`. Numeric features that are
+    missing stay NaN, which XGBoost treats as missing, like during training.
+    """
+    if feature_names is None:
+        from model_registry import get_feature_names
+
+        feature_names = get_feature_names()
+    feature_names = list(feature_names)
+    index = {name: i for i, name in enumerate(feature_names)}
+    n = len(raw)
+    matrix = np.full((n, len(feature_names)), np.nan, dtype=np.float32)
+
+    handled = {FREQUENCY_MIXED_COLUMN, "procesador_frecuencia", "altura_mm"}
+    for name in feature_names:
+        if name in raw.columns and name not in handled:
+            matrix[:, index[name]] = pd.to_numeric(raw[name], errors="coerce").to_numpy(dtype=np.float32)
+
+    matrix[:, index["procesador_frecuencia_reloj"]] = parse_frequency_ghz(raw[FREQUENCY_MIXED_COLUMN])
+    matrix[:, index["procesador_frecuencia"]] = parse_frequency_ghz(raw[FREQUENCY_GHZ_COLUMN])
+    height_mm = pd.to_numeric(raw["medidas_alto_cm"], errors="coerce") * 10
+    matrix[:, index["altura_mm"]] = height_mm.fillna(pd.to_numeric(raw["medidas_altura_mm"], errors="coerce"))
+
+    for raw_column, (feature, label_map) in LABEL_COLUMNS.items():
+        to_label = {v: k for k, v in label_map.items()}
+        labels = raw[raw_column].astype("object").fillna(MISSING_LABEL).map(to_label)
+        matrix[:, index[feature]] = labels.to_numpy(dtype=np.float32, na_value=np.nan)
+
+    for raw_column, prefix in ONE_HOT_COLUMNS.items():
+        categories = one_hot_categories(prefix, feature_names)
+        matrix[:, [index[prefix + c] for c in categories]] = 0.0
+        _set_one_hot(matrix, index, prefix, categories, raw[raw_column].astype("object").fillna("nan"))
+
+    flags = raw[CONNECTIVITY_COLUMN].astype("string").str.get_dummies(sep=", ")
+    for flag in CONNECTIVITY_FLAGS:
+        matrix[:, index[flag]] = flags[flag].to_numpy(dtype=np.float32) if flag in flags.columns else 0.0
+
+    os_columns = ["os_" + g for g in OS_GROUPS]
+    matrix[:, [index[c] for c in os_columns]] = 0.0
+    _set_one_hot(matrix, index, "os_", OS_GROUPS, os_group(raw[OS_COLUMN]))
+
+    return pd.DataFrame(matrix, index=raw.index, columns=feature_names)
+
+
+def main():
+    if len(sys.argv) != 2:
+        print("Usage: python .mlf_app/featurizer.py <raw_listings.csv>", file=sys.stderr)
+        sys.exit(1)
+    raw = load_raw(sys.argv[1])
+    from model_registry import get_feature_names
+
+    feature_names = get_feature_names()
+    start = time.perf_counter()
+    features = featurize(raw, feature_names)
+    elapsed = time.perf_counter() - start
+    print(f"Featurized {features.shape[0]:,} rows x {features.shape[1]} features in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
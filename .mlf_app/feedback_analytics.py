@@ -0,0 +1,184 @@
+import hashlib
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+
+from feedback_store import record_brand
+
+PRICE_BUCKET_EDGES = [0, 250, 500, 750, 1000, 1500, 2000, 3000]
+
+# Inputs both pages collect, used to describe a configuration
+CONFIGURATION_FIELDS = [
+    ("ram_memoria_ram_GB", "{:g} GB RAM"),
+    ("procesador_número_núcleos_procesador_cores", "{:g} cores"),
+    ("disco_duro_capacidad_memoria_ssd_GB", "{:g} GB SSD"),
+    ("pantalla_tamaño_pantalla_pulgadas", '{:g}"'),
+]
+
+
+def _hash64(value):
+    return int.from_bytes(hashlib.blake2b(str(value).encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class HyperLogLog:
+    """
+    Approximate distinct count in 2**precision bytes; the relative error is
+    about 1.04 / sqrt(2**precision) (1.6% with the default 4096 registers).
+    """
+
+    def __init__(self, precision=12):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add(self, value):
+        h = _hash64(value)
+        index = h >> (64 - self.precision)
+        rest = h & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self):
+        m = len(self.registers)
+        estimate = 0.7213 / (1 + 1.079 / m) * m * m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Small-range correction (linear counting)
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+
+class SpaceSaving:
+    """
+    Top-k heavy hitters with at most `capacity` counters (Metwally et al.).
+    Any item more frequent than total / capacity is guaranteed to be tracked;
+    counts can be overestimated by at most the returned error.
+    """
+
+    def __init__(self, capacity=200):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+
+    def add(self, item):
+        if item in self.counts:
+            self.counts[item] += 1
+        elif len(self.counts) < self.capacity:
+            self.counts[item] = 1
+            self.errors[item] = 0
+        else:
+            evicted = min(self.counts, key=self.counts.get)
+            floor = self.counts.pop(evicted)
+            del self.errors[evicted]
+            self.counts[item] = floor + 1
+            self.errors[item] = floor
+
+    def top(self, n=10):
+        """[(item, count, max overestimate)], most frequent first."""
+        items = sorted(self.counts.items(), key=lambda kv: -kv[1])[:n]
+        return [(item, count, self.errors[item]) for item, count in items]
+
+
+def configuration_label(record):
+    """Short description of the configuration a feedback record was given for."""
+    input_data = record.get("input_data") or {}
+    parts = [record_brand(record) or "Unknown brand"]
+    for field, template in CONFIGURATION_FIELDS:
+        value = input_data.get(field)
+        if isinstance(value, (int, float)):
+            parts.append(template.format(value))
+    return " · ".join(parts)
+
+
+def record_price(record):
+    """The predicted price, or the mean price of the recommendations shown."""
+    if record.get("predicted_price") is not None:
+        return float(record["predicted_price"])
+    prices = [r["price"] for r in record.get("recommendations") or [] if r.get("price") is not None]
+    return float(np.mean(prices)) if prices else None
+
+
+class PageAggregates:
+    """Running feedback aggregates of one page; memory does not grow with the feedback count."""
+
+    def __init__(self, top_capacity=200, hll_precision=12):
+        self.records = 0
+        self.ratings = Counter()
+        self.price_buckets = np.zeros(len(PRICE_BUCKET_EDGES), dtype=np.int64)
+        self.sessions = HyperLogLog(hll_precision)
+        self.configurations = SpaceSaving(top_capacity)
+
+    def add(self, record):
+        self.records += 1
+        self.ratings[record.get("accuracy_rating") or "Unrated"] += 1
+        price = record_price(record)
+        if price is not None:
+            self.price_buckets[np.searchsorted(PRICE_BUCKET_EDGES, price, side="right") - 1] += 1
+        self.sessions.add(record.get("session_id"))
+        self.configurations.add(configuration_label(record))
+
+    def price_bucket_counts(self):
+        """{"€0-250": n, ..., "€3000+": n} in ascending price order."""
+        labels = [f"€{low}-{high}" for low, high in zip(PRICE_BUCKET_EDGES[:-1], PRICE_BUCKET_EDGES[1:])]
+        labels.append(f"€{PRICE_BUCKET_EDGES[-1]}+")
+        return dict(zip(labels, self.price_buckets.tolist()))
+
+    def snapshot(self, top_n=10):
+        """Plain copies of the aggregates: records, ratings, sessions (estimate), price_buckets, top_configurations."""
+        return {
+            "records": self.records,
+            "ratings": dict(self.ratings),
+            "sessions": self.sessions.count(),
+            "price_buckets": self.price_bucket_counts(),
+            "top_configurations": self.configurations.top(top_n),
+        }
+
+
+class FeedbackAggregator:
+    """
+    Feedback aggregates per page, kept current by tailing the feedback store.
+
+    Each `refresh` reads only the rows added since the previous one, so a
+    dashboard rerun costs O(new records) no matter how much feedback exists.
+    """
+
+    def __init__(self, store, batch_size=10000):
+        self.store = store
+        self.batch_size = batch_size
+        self.pages = {}
+        self.last_id = 0
+        self.last_refresh = {"records": 0, "seconds": 0.0}
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Fold new feedback into the aggregates; returns how many records were added."""
+        with self._lock:
+            start = time.perf_counter()
+            added = 0
+            while True:
+                rows = self.store.since(self.last_id, self.batch_size)
+                for row_id, page, record in rows:
+                    if page not in self.pages:
+                        self.pages[page] = PageAggregates()
+                    self.pages[page].add(record)
+                    self.last_id = row_id
+                added += len(rows)
+                if len(rows) < self.batch_size:
+                    break
+            self.last_refresh = {"records": added, "seconds": time.perf_counter() - start}
+            return added
+
+    def snapshot(self, top_n=10):
+        """
+        Consistent copy of every page's aggregates, taken under the lock so a
+        concurrent `refresh` from another session cannot change it mid-render.
+
+        Returns {"pages": {page: PageAggregates.snapshot()}, "last_refresh": {...}}.
+        """
+        with self._lock:
+            return {
+                "pages": {page: aggregates.snapshot(top_n) for page, aggregates in self.pages.items()},
+                "last_refresh": dict(self.last_refresh),
+            }
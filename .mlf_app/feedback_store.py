@@ -0,0 +1,261 @@
+"""
+Indexed SQLite store for the feedback both pages collect.
+
+The database runs in WAL mode so the page writers and dashboard readers do not
+block each other. Every record is kept in full (as JSON) next to indexed
+timestamp, session_id, page, accuracy_rating and brand columns, and a trigger
+maintains per-day/page/brand/rating counts so rating distributions are read
+from a small summary table instead of scanning all feedback.
+
+Import existing .jsonl files (safe to repeat; duplicates are ignored) and
+query from the repository root:
+
+    python .mlf_app/feedback_store.py import feedback/*.jsonl
+    python .mlf_app/feedback_store.py ratings --by day
+    python .mlf_app/feedback_store.py ratings --by brand --page price_predictor
+"""
+import argparse
+import glob
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from label_maps import company_name_map
+
+DEFAULT_DB_PATH = os.path.join("feedback", "feedback.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS feedback (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    day TEXT NOT NULL,
+    page TEXT NOT NULL,
+    session_id TEXT,
+    accuracy_rating TEXT,
+    brand TEXT,
+    predicted_price REAL,
+    comments TEXT,
+    record TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS feedback_identity ON feedback (page, timestamp, session_id);
+CREATE INDEX IF NOT EXISTS feedback_timestamp ON feedback (timestamp);
+CREATE INDEX IF NOT EXISTS feedback_session ON feedback (session_id, timestamp);
+CREATE INDEX IF NOT EXISTS feedback_page_rating ON feedback (page, accuracy_rating);
+-- Rows from before records without a session were stored as '' (duplicates of them stay NULL)
+UPDATE OR IGNORE feedback SET session_id = '' WHERE session_id IS NULL;
+
+CREATE TABLE IF NOT EXISTS feedback_daily (
+    day TEXT NOT NULL,
+    page TEXT NOT NULL,
+    brand TEXT NOT NULL,
+    accuracy_rating TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (day, page, brand, accuracy_rating)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS feedback_daily_count AFTER INSERT ON feedback
+BEGIN
+    INSERT INTO feedback_daily (day, page, brand, accuracy_rating, count)
+    VALUES (NEW.day, NEW.page, COALESCE(NEW.brand, ''), COALESCE(NEW.accuracy_rating, ''), 1)
+    ON CONFLICT (day, page, brand, accuracy_rating) DO UPDATE SET count = count + 1;
+END;
+"""
+
+
+def page_from_path(path):
+    """'feedback/knn_recommendation_feedback[.<rotation>].jsonl' -> 'knn_recommendation'."""
+    return os.path.basename(path).split("_feedback")[0]
+
+
+def record_brand(record):
+    """Brand the user selected: a name on the KNN page, a label code on the price page."""
+    input_data = record.get("input_data") or {}
+    if input_data.get("company_name"):
+        return str(input_data["company_name"])
+    label = input_data.get("company_name_label")
+    if label is None:
+        return None
+    return company_name_map.get(int(label))
+
+
+def _row(page, record):
+    timestamp = record.get("timestamp") or ""
+    predicted_price = record.get("predicted_price")
+    return (
+        timestamp,
+        timestamp[:10],
+        page,
+        # A UNIQUE index treats NULLs as distinct, so a missing session would never match its duplicate
+        record.get("session_id") or "",
+        record.get("accuracy_rating"),
+        record_brand(record),
+        float(predicted_price) if predicted_price is not None else None,
+        record.get("comments"),
+        json.dumps(record),
+    )
+
+
+class FeedbackStore:
+    """
+    Parameters:
+    - path: SQLite database file, created with its schema on first use
+    - busy_timeout: Seconds a writer waits for another writer's lock
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH, busy_timeout=5.0):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self):
+        """One connection per thread; sqlite3 connections must not be shared across threads."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.busy_timeout)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def insert_many(self, page, records):
+        """Insert feedback records of one page; returns how many were new."""
+        connection = self._connection()
+        with connection:
+            cursor = connection.executemany(
+                "INSERT OR IGNORE INTO feedback (timestamp, day, page, session_id, accuracy_rating, brand, "
+                "predicted_price, comments, record) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (_row(page, record) for record in records),
+            )
+            return cursor.rowcount
+
+    def import_jsonl(self, paths, batch_size=10000):
+        """
+        Load existing .jsonl feedback files; the page comes from each file name.
+        Records already in the store are skipped, so importing twice is harmless.
+        Returns {path: new records}.
+        """
+        imported = {}
+        for path in paths:
+            page = page_from_path(path)
+            imported[path] = 0
+            batch = []
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        batch.append(json.loads(line))
+                    if len(batch) >= batch_size:
+                        imported[path] += self.insert_many(page, batch)
+                        batch = []
+            if batch:
+                imported[path] += self.insert_many(page, batch)
+        return imported
+
+    def rating_distribution(self, by="day", page=None, start_day=None, end_day=None):
+        """
+        Feedback counts per accuracy rating, grouped by "day", "brand" or "page".
+        Answered from the summary table, so the cost does not grow with the
+        number of feedback records.
+
+        Returns {group: {rating: count}}, groups in ascending order.
+        """
+        if by not in ("day", "brand", "page"):
+            raise ValueError(f"Cannot group feedback by: {by}")
+        where, params = [], []
+        if page is not None:
+            where.append("page = ?")
+            params.append(page)
+        if start_day is not None:
+            where.append("day >= ?")
+            params.append(start_day)
+        if end_day is not None:
+            where.append("day <= ?")
+            params.append(end_day)
+        query = (
+            f"SELECT {by}, accuracy_rating, SUM(count) FROM feedback_daily "
+            f"{'WHERE ' + ' AND '.join(where) if where else ''} "
+            f"GROUP BY {by}, accuracy_rating ORDER BY {by}"
+        )
+        distribution = {}
+        for group, rating, count in self._connection().execute(query, params):
+            distribution.setdefault(group, {})[rating] = count
+        return distribution
+
+    def recent(self, limit=50, page=None, session_id=None, accuracy_rating=None):
+        """Newest feedback records (decoded), optionally filtered by page, session or rating."""
+        where, params = [], []
+        for column, value in (("page", page), ("session_id", session_id), ("accuracy_rating", accuracy_rating)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                params.append(value)
+        query = (
+            f"SELECT page, record FROM feedback {'WHERE ' + ' AND '.join(where) if where else ''} "
+            f"ORDER BY timestamp DESC LIMIT ?"
+        )
+        return [dict(json.loads(record), page=page) for page, record in self._connection().execute(query, [*params, limit])]
+
+    def since(self, last_id=0, limit=10000):
+        """
+        Records inserted after row `last_id`, oldest first, as (id, page, record)
+        tuples. Feeding the last id back in tails the store without re-reading it.
+        """
+        rows = self._connection().execute(
+            "SELECT id, page, record FROM feedback WHERE id > ? ORDER BY id LIMIT ?", (last_id, limit)
+        )
+        return [(row_id, page, json.loads(record)) for row_id, page, record in rows]
+
+    def count(self):
+        return self._connection().execute("SELECT COALESCE(SUM(count), 0) FROM feedback_daily").fetchone()[0]
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_feedback_store(path=DEFAULT_DB_PATH):
+    """Process-wide store for `path`, shared by the feedback writers and dashboards."""
+    key = os.path.abspath(path)
+    store = _stores.get(key)
+    if store is None:
+        with _stores_lock:
+            store = _stores.get(key)
+            if store is None:
+                store = FeedbackStore(path)
+                _stores[key] = store
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import and query the feedback store.")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+    import_parser = commands.add_parser("import", help="Import .jsonl feedback files")
+    import_parser.add_argument("paths", nargs="*")
+    ratings_parser = commands.add_parser("ratings", help="Rating distribution")
+    ratings_parser.add_argument("--by", choices=["day", "brand", "page"], default="day")
+    ratings_parser.add_argument("--page", default=None)
+    args = parser.parse_args()
+
+    store = FeedbackStore(args.db)
+    if args.command == "import":
+        paths = args.paths or sorted(glob.glob(os.path.join("feedback", "*.jsonl")))
+        start = time.perf_counter()
+        for path, new in store.import_jsonl(paths).items():
+            print(f"{path}: {new:,} new records")
+        print(f"Imported in {time.perf_counter() - start:.2f}s; {store.count():,} records in {args.db}")
+    else:
+        start = time.perf_counter()
+        distribution = store.rating_distribution(by=args.by, page=args.page)
+        elapsed_ms = (time.perf_counter() - start) * 1e3
+        for group, ratings in distribution.items():
+            print(f"{group or '(none)'}: " + ", ".join(f"{rating}={count}" for rating, count in sorted(ratings.items())))
+        print(f"({elapsed_ms:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
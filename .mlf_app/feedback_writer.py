@@ -0,0 +1,254 @@
+import atexit
+import datetime
+import json
+import os
+import queue
+import threading
+import time
+
+from feedback_store import get_feedback_store, page_from_path
+
+FSYNC_POLICIES = ("batch", "interval", "none")
+
+
+class FeedbackWriter:
+    """
+    Appends JSON records to a .jsonl file from one background thread.
+
+    `write` only serializes the record and puts the line on a bounded queue, so a
+    submit never waits on disk I/O unless the queue is full. The writer thread
+    drains the queue in batches, each written with one `write` call, so lines
+    from concurrent sessions never interleave.
+
+    Parameters:
+    - path: The .jsonl file; rotated files are renamed next to it with a timestamp suffix
+    - max_queue: Records that can wait for the writer before `write` blocks
+    - put_timeout: Seconds `write` blocks on a full queue before dropping the record
+    - batch_size: Most records written per batch
+    - flush_interval: Seconds the writer waits for more records before writing a partial batch
+    - fsync: "batch" (fsync after every batch), "interval" (at most every
+      `fsync_interval` seconds) or "none" (leave it to the OS)
+    - fsync_interval: Seconds between fsyncs with the "interval" policy
+    - max_bytes: Rotate once the file reaches this size (None disables)
+    - rotate_seconds: Rotate once the file has been open this long (None disables)
+    - store: FeedbackStore that also receives every batch (the .jsonl stays the record of truth)
+    - page: Page name the records are stored under (default: derived from `path`)
+    """
+
+    def __init__(self, path, max_queue=10000, put_timeout=1.0, batch_size=256, flush_interval=0.2,
+                 fsync="interval", fsync_interval=1.0, max_bytes=64 * 1024 * 1024, rotate_seconds=None,
+                 store=None, page=None):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+        self.path = path
+        self.put_timeout = put_timeout
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.max_bytes = max_bytes
+        self.rotate_seconds = rotate_seconds
+        self.store = store
+        self.page = page or page_from_path(path)
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._file = None
+        self._opened_at = None
+        self._last_fsync = time.monotonic()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "enqueued": 0, "written": 0, "batches": 0, "dropped": 0, "blocked_puts": 0,
+            "max_queue_depth": 0, "fsyncs": 0, "rotations": 0, "errors": 0, "store_errors": 0,
+            "last_batch_seconds": 0.0,
+        }
+        self._closed = False
+        self._put_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=f"feedback-writer:{os.path.basename(path)}", daemon=True)
+        self._thread.start()
+
+    def _count(self, **increments):
+        with self._stats_lock:
+            for key, value in increments.items():
+                self._stats[key] += value
+
+    def write(self, record):
+        """
+        Queue one record. Returns False when it had to be dropped because the
+        queue stayed full for `put_timeout` seconds (or the writer is closed).
+        """
+        line = json.dumps(record) + "\n"
+        deadline = time.monotonic() + self.put_timeout
+        # Checking _closed and queueing under one lock keeps records from landing behind close()'s sentinel
+        if not self._put_lock.acquire(timeout=self.put_timeout):
+            self._count(blocked_puts=1, dropped=1)
+            return False
+        try:
+            if self._closed:
+                self._count(dropped=1)
+                return False
+            try:
+                self._queue.put_nowait(line)
+            except queue.Full:
+                self._count(blocked_puts=1)
+                try:
+                    self._queue.put(line, timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Full:
+                    self._count(dropped=1)
+                    return False
+        finally:
+            self._put_lock.release()
+        depth = self._queue.qsize()
+        with self._stats_lock:
+            self._stats["enqueued"] += 1
+            self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], depth)
+        return True
+
+    def _open(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._opened_at = time.monotonic()
+
+    def _rotate_if_needed(self):
+        too_big = self.max_bytes is not None and self._file.tell() >= self.max_bytes
+        too_old = self.rotate_seconds is not None and time.monotonic() - self._opened_at >= self.rotate_seconds
+        if not (too_big or too_old) or self._file.tell() == 0:
+            return
+        self._file.close()
+        root, ext = os.path.splitext(self.path)
+        suffix = datetime.datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        os.replace(self.path, f"{root}.{suffix}{ext}")
+        self._count(rotations=1)
+        self._open()
+
+    def _write_batch(self, lines):
+        start = time.perf_counter()
+        if self._file is None:
+            self._open()
+        self._rotate_if_needed()
+        self._file.write("".join(lines))
+        self._file.flush()
+        now = time.monotonic()
+        if self.fsync == "batch" or (self.fsync == "interval" and now - self._last_fsync >= self.fsync_interval):
+            os.fsync(self._file.fileno())
+            self._last_fsync = now
+            self._count(fsyncs=1)
+        if self.store is not None:
+            try:
+                self.store.insert_many(self.page, [json.loads(line) for line in lines])
+            except Exception:
+                # The lines are on disk; `feedback_store.py import` can backfill them
+                self._count(store_errors=1)
+        with self._stats_lock:
+            self._stats["written"] += len(lines)
+            self._stats["batches"] += 1
+            self._stats["last_batch_seconds"] = time.perf_counter() - start
+
+    def _run(self):
+        while True:
+            line = self._queue.get()
+            if line is None:
+                self._queue.task_done()
+                break
+            lines = [line]
+            deadline = time.monotonic() + self.flush_interval
+            stop = False
+            while len(lines) < self.batch_size:
+                try:
+                    line = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if line is None:
+                    stop = True
+                    break
+                lines.append(line)
+            try:
+                self._write_batch(lines)
+            except Exception:
+                # Any failure loses only this batch: the thread must keep draining
+                # the queue, or every later write() would fill it and flush() hang
+                self._count(errors=1, dropped=len(lines))
+                self._discard_file()
+            for _ in range(len(lines) + stop):
+                self._queue.task_done()
+            if stop:
+                break
+        if self._file is not None:
+            try:
+                self._file.flush()
+                if self.fsync != "none":
+                    os.fsync(self._file.fileno())
+            except (OSError, ValueError):
+                self._count(errors=1)
+            self._discard_file()
+
+    def _discard_file(self):
+        """Close the current file, if any, so the next batch reopens it (e.g. after a failed rotation)."""
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+    def flush(self):
+        """Block until every record queued so far has been written."""
+        self._queue.join()
+
+    def close(self, timeout=5.0):
+        """
+        Write out what is queued, fsync and stop the writer thread, waiting at
+        most about `timeout` seconds. A writer still backed up after that keeps
+        draining in its daemon thread.
+        """
+        deadline = time.monotonic() + timeout
+        if not self._put_lock.acquire(timeout=timeout):
+            return
+        try:
+            if self._closed:
+                return
+            self._closed = True
+            try:
+                self._queue.put(None, timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Full:
+                return
+        finally:
+            self._put_lock.release()
+        self._thread.join(max(0.0, deadline - time.monotonic()))
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["queue_depth"] = self._queue.qsize()
+        stats["queue_capacity"] = self._queue.maxsize
+        stats["fsync_policy"] = self.fsync
+        return stats
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def get_feedback_writer(path):
+    """Process-wide writer for `path`, shared by every session and page."""
+    key = os.path.abspath(path)
+    writer = _writers.get(key)
+    if writer is None:
+        with _writers_lock:
+            writer = _writers.get(key)
+            if writer is None:
+                writer = FeedbackWriter(path, store=get_feedback_store())
+                _writers[key] = writer
+    return writer
+
+
+def feedback_stats():
+    """Statistics of every writer in this process, keyed by file path."""
+    return {writer.path: writer.stats() for writer in list(_writers.values())}
+
+
+@atexit.register
+def close_all():
+    """Flush and close every shared writer; runs at interpreter shutdown."""
+    for writer in list(_writers.values()):
+        writer.close()
@@ -0,0 +1,299 @@
+"""
+Persisted index for the KNN recommender.
+
+Build it offline from the repository root:
+
+    python .mlf_app/knn_index.py
+
+The artifact directory holds the fitted preprocessor, the L2-normalized catalog
+matrix as .npy blocks that are memory-mapped at load time, the price column,
+the listing titles and a manifest with a content hash of the source CSVs.
+KNN.py loads it at start and rebuilds it when the CSVs or the spec_normalizer
+cleaning code have changed.
+
+Catalogs from --ann-threshold rows on (or with --method ivf) also get an
+inverted-file index for approximate search; the catalog rows are then stored
+grouped by cluster, and ivf_ids.npy maps them back to listing positions:
+
+    python .mlf_app/knn_index.py --method ivf --n-lists 1024 --n-probe 8
+"""
+import argparse
+import datetime
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import threading
+import time
+from importlib import metadata
+
+import joblib
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from compact_catalog import CompactCatalog
+from data_cache import load_stats, load_table, reader_version
+from spec_normalizer import load_normalized
+from knn_model import fit_recommendation_model
+from knn_search import CosineSearchEngine, IVFCosineIndex
+
+INDEX_FORMAT_VERSION = 4
+DEFAULT_INDEX_DIR = os.path.join("artifacts", "knn_index")
+SOURCE_FILES = ("X_train_final.csv", "y_train.csv", "titulos.csv")
+NORMALIZED_TRAIN_TABLE = "X_train_final.normalized"
+
+
+def load_training_data():
+    """
+    Read the training listings, prices and titles the recommender is built from,
+    through the columnar cache (see data_cache.py). The listings are cached
+    after the spec_normalizer cleaning stage, so it runs once per CSV version,
+    and returned as a compact_catalog.CompactCatalog.
+    """
+    X_train = CompactCatalog.from_frame(load_table("X_train_final.csv", load_normalized, name=NORMALIZED_TRAIN_TABLE))
+    y_train = load_table("y_train.csv")
+
+    if len(y_train.columns) > 0 and (y_train.columns[0] == '' or y_train.columns[0] == 'Unnamed: 0'):
+        y_train = y_train.drop(y_train.columns[0], axis=1)
+
+    titulos = load_table("titulos.csv")
+
+    return X_train, y_train, titulos
+
+
+def source_hash(paths=SOURCE_FILES):
+    """SHA-256 over the contents of the source CSVs, in order."""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            digest.update(hashlib.file_digest(f, "sha256").digest())
+    return digest.hexdigest()
+
+
+def _read_manifest(index_dir):
+    try:
+        with open(os.path.join(index_dir, "manifest.json")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_stale(index_dir=DEFAULT_INDEX_DIR, current_hash=None):
+    """
+    True when the artifact is missing, from another format/library version, built
+    from other CSVs, or built with other spec_normalizer cleaning code.
+    """
+    manifest = _read_manifest(index_dir)
+    if manifest is None:
+        return True
+    return (
+        manifest.get("format_version") != INDEX_FORMAT_VERSION
+        or manifest.get("sklearn_version") != metadata.version("scikit-learn")
+        or manifest.get("source_hash") != (current_hash or source_hash())
+        or manifest.get("normalizer_version") != reader_version(load_normalized)
+    )
+
+
+def build_index(index_dir=DEFAULT_INDEX_DIR, method="auto", ann_threshold=50000, n_lists=None, n_probe=8,
+                dense=False):
+    """
+    Fit the recommender on the training CSVs and write it to `index_dir`.
+
+    The files are written to a temporary sibling directory first and swapped in,
+    so a concurrently starting app never maps a half-written index.
+
+    Parameters:
+    - index_dir: Output directory
+    - method: "exact", "ivf", or "auto", which picks "ivf" from `ann_threshold` listings on
+    - n_lists, n_probe: IVF settings, see knn_search.IVFCosineIndex
+    - dense: Store the catalog as a dense vectors.npy instead of CSR blocks (recorded in the manifest)
+    """
+    start = time.perf_counter()
+    current_hash = source_hash()
+    X_train, y_train, titulos = load_training_data()
+    model_data = fit_recommendation_model(X_train, y_train, dense=dense)
+    engine = model_data['search_engine']
+    if method == "auto":
+        method = "ivf" if engine.n_items >= ann_threshold else "exact"
+    if method == "ivf":
+        engine = IVFCosineIndex(engine.vectors, n_lists=n_lists, n_probe=n_probe, dense=dense)
+    vectors = engine.vectors
+
+    tmp_dir = f"{index_dir}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    joblib.dump({
+        'preprocessor': model_data['preprocessor'],
+        'X_knn_columns': list(model_data['X_knn_columns']),
+        'numeric_features': model_data['numeric_features'],
+        'categorical_features': model_data['categorical_features'],
+        'identifier_features': model_data['identifier_features'],
+    }, os.path.join(tmp_dir, "preprocessor.joblib"))
+
+    if sp.issparse(vectors):
+        np.save(os.path.join(tmp_dir, "vectors_data.npy"), vectors.data)
+        np.save(os.path.join(tmp_dir, "vectors_indices.npy"), vectors.indices)
+        np.save(os.path.join(tmp_dir, "vectors_indptr.npy"), vectors.indptr)
+    else:
+        np.save(os.path.join(tmp_dir, "vectors.npy"), vectors)
+    if isinstance(engine, IVFCosineIndex):
+        np.save(os.path.join(tmp_dir, "ivf_ids.npy"), engine.ids)
+        np.save(os.path.join(tmp_dir, "ivf_centroids.npy"), engine.centroids)
+        np.save(os.path.join(tmp_dir, "ivf_offsets.npy"), engine.offsets)
+        search = {"method": "ivf", "n_lists": engine.n_lists, "n_probe": engine.n_probe}
+    else:
+        search = {"method": "exact"}
+    np.save(os.path.join(tmp_dir, "prices.npy"), np.asarray(model_data['precio_column'], dtype=np.float64))
+    titles = titulos['título'] if 'título' in titulos.columns else pd.Series([f"Laptop {i}" for i in range(len(titulos))])
+    np.save(os.path.join(tmp_dir, "titles.npy"), titles.astype(str).to_numpy(dtype=str))
+
+    manifest = {
+        "format_version": INDEX_FORMAT_VERSION,
+        "created_at": datetime.datetime.now().isoformat(),
+        "source_files": list(SOURCE_FILES),
+        "source_hash": current_hash,
+        "normalizer_version": reader_version(load_normalized),
+        "sklearn_version": metadata.version("scikit-learn"),
+        "n_items": int(vectors.shape[0]),
+        "n_features": int(vectors.shape[1]),
+        "sparse": bool(sp.issparse(vectors)),
+        "dense": bool(dense),
+        "search": search,
+        "data_load": {name: load_stats()[name] for name in (NORMALIZED_TRAIN_TABLE, *SOURCE_FILES[1:])},
+        "build_seconds": time.perf_counter() - start,
+    }
+    with open(os.path.join(tmp_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    old_dir = f"{index_dir}.old-{os.getpid()}"
+    if os.path.exists(index_dir):
+        os.replace(index_dir, old_dir)
+    os.replace(tmp_dir, index_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return manifest
+
+
+def load_index(index_dir=DEFAULT_INDEX_DIR):
+    """
+    Map a built index into memory. Returns the same dict shape as
+    knn_model.fit_recommendation_model, plus `titles` and `manifest`.
+    """
+    manifest = _read_manifest(index_dir)
+    fitted = joblib.load(os.path.join(index_dir, "preprocessor.joblib"))
+
+    def mapped(name):
+        return np.load(os.path.join(index_dir, name), mmap_mode="r")
+
+    if manifest["sparse"]:
+        vectors = sp.csr_matrix(
+            (mapped("vectors_data.npy"), mapped("vectors_indices.npy"), mapped("vectors_indptr.npy")),
+            shape=(manifest["n_items"], manifest["n_features"]),
+        )
+    else:
+        vectors = mapped("vectors.npy")
+
+    if manifest["search"]["method"] == "ivf":
+        search_engine = IVFCosineIndex.from_arrays(
+            vectors, mapped("ivf_ids.npy"), mapped("ivf_centroids.npy"), mapped("ivf_offsets.npy"),
+            n_probe=manifest["search"]["n_probe"],
+        )
+    else:
+        search_engine = CosineSearchEngine.from_normalized(vectors)
+
+    return {
+        'search_engine': search_engine,
+        'preprocessor': fitted['preprocessor'],
+        'precio_column': mapped("prices.npy"),
+        'titles': mapped("titles.npy"),
+        'X_knn_columns': pd.Index(fitted['X_knn_columns']),
+        'numeric_features': fitted['numeric_features'],
+        'categorical_features': fitted['categorical_features'],
+        'identifier_features': fitted['identifier_features'],
+        'manifest': manifest,
+    }
+
+
+def _is_mapped(array):
+    base = array
+    while base is not None:
+        if isinstance(base, (np.memmap, mmap.mmap)):
+            return True
+        base = getattr(base, "base", None)
+    return False
+
+
+def memory_report(model_data):
+    """
+    Bytes held by the arrays of a loaded index and whether each is memory-mapped.
+
+    Mapped arrays live in the OS page cache: every session of the process reads
+    the same pages, and so do other processes mapping the same index, so they
+    add no per-session or per-worker heap memory. `private_bytes` is what each
+    process holds on its own heap.
+    """
+    engine = model_data['search_engine']
+    arrays = {'prices': model_data['precio_column'], 'titles': model_data['titles']}
+    if sp.issparse(engine.vectors):
+        arrays.update(vectors_data=engine.vectors.data, vectors_indices=engine.vectors.indices,
+                      vectors_indptr=engine.vectors.indptr)
+    else:
+        arrays['vectors'] = engine.vectors
+    if isinstance(engine, IVFCosineIndex):
+        arrays.update(ivf_ids=engine.ids, ivf_centroids=engine.centroids, ivf_offsets=engine.offsets)
+
+    report = {name: {'bytes': int(array.nbytes), 'mapped': _is_mapped(array)} for name, array in arrays.items()}
+    return {
+        'arrays': report,
+        'mapped_bytes': sum(a['bytes'] for a in report.values() if a['mapped']),
+        'private_bytes': sum(a['bytes'] for a in report.values() if not a['mapped']),
+    }
+
+
+def load_or_build_index(index_dir=DEFAULT_INDEX_DIR):
+    """Load the index at `index_dir`, rebuilding it first if it is missing or stale."""
+    if is_stale(index_dir):
+        build_index(index_dir)
+    return load_index(index_dir)
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(index_dir=DEFAULT_INDEX_DIR):
+    """
+    Process-wide index for `index_dir`, loaded (or rebuilt) on first use and
+    shared by every session; the background warm-up in startup.py loads it early.
+    """
+    key = os.path.abspath(index_dir)
+    model_data = _indexes.get(key)
+    if model_data is None:
+        with _indexes_lock:
+            model_data = _indexes.get(key)
+            if model_data is None:
+                model_data = load_or_build_index(index_dir)
+                _indexes[key] = model_data
+    return model_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the KNN recommender index from the training CSVs.")
+    parser.add_argument("--index-dir", default=DEFAULT_INDEX_DIR)
+    parser.add_argument("--method", choices=["auto", "exact", "ivf"], default="auto")
+    parser.add_argument("--ann-threshold", type=int, default=50000, help="Catalog size from which 'auto' uses IVF")
+    parser.add_argument("--n-lists", type=int, default=None, help="IVF clusters (default: about 4 * sqrt(rows))")
+    parser.add_argument("--n-probe", type=int, default=8, help="IVF clusters scanned per query")
+    parser.add_argument("--dense", action="store_true",
+                        help="Store the catalog densely (faster products, memory grows with rows x features)")
+    args = parser.parse_args()
+
+    manifest = build_index(args.index_dir, args.method, args.ann_threshold, args.n_lists, args.n_probe, args.dense)
+    print(f"Built {manifest['search']['method']} KNN index for {manifest['n_items']:,} listings x "
+          f"{manifest['n_features']:,} features in {manifest['build_seconds']:.2f}s -> {args.index_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import pandas as pd
+
+from compact_catalog import CompactCatalog
+from knn_search import CosineSearchEngine
+from spec_normalizer import is_normalized, normalize_specs
+
+COLUMNS_TO_DROP = [
+    'medidas_profundidad_cm', 'medidas_peso_kg', 'procesador_tdp_W',
+    'medidas_ancho_cm', 'ofertas_count', 'pantalla_diagonal_pantalla_cm',
+    'altura_mm'
+]
+
+
+def prepare_catalog(X_train, y_train):
+    """
+    Split the training data into the frame the recommender encodes and the price column.
+
+    Parameters:
+    - X_train: Raw or already normalized listings (see spec_normalizer.normalize_specs)
+      as a DataFrame, or normalized listings as a CompactCatalog, which is
+      narrowed to the kept columns without leaving its compact form
+    - y_train: Prices, as a DataFrame with `price_avg` or a Series/array
+    """
+    if isinstance(y_train, pd.DataFrame):
+        y_train = y_train['price_avg'].values if 'price_avg' in y_train.columns else y_train.iloc[:, 0].values
+
+    if isinstance(X_train, CompactCatalog):
+        if not is_normalized(X_train):
+            raise ValueError("A CompactCatalog must hold listings already passed through normalize_specs")
+        X_knn = X_train.select([col for col in X_train.columns if col not in COLUMNS_TO_DROP])
+        return X_knn, pd.Series(y_train, index=X_knn.index, name='precio')
+
+    X_knn = normalize_specs(X_train)
+
+    # Add price column
+    X_knn['precio'] = y_train
+
+    X_knn = X_knn.drop(columns=[col for col in COLUMNS_TO_DROP if col in X_knn.columns], errors='ignore')
+
+    precio_column = X_knn['precio'].copy()
+    return X_knn.drop('precio', axis=1), precio_column
+
+
+def build_preprocessor(X_knn):
+    """
+    Imputer/scaler for numeric columns and a sparse one-hot encoder for categoricals.
+
+    Returns (preprocessor, numeric_features, categorical_features, identifier_features).
+    """
+    # Only needed to fit; a saved preprocessor imports what it uses when unpickled
+    from sklearn.impute import SimpleImputer
+    from sklearn.preprocessing import StandardScaler, OneHotEncoder
+    from sklearn.compose import ColumnTransformer
+    from sklearn.pipeline import Pipeline
+
+    numeric_features = []
+    categorical_features = []
+    # Free-text identifiers such as the listing title are (almost) unique per row,
+    # so one-hot encoding them adds a column per listing and no similarity signal
+    identifier_features = []
+
+    for col in X_knn.columns:
+        if pd.api.types.is_numeric_dtype(X_knn[col]):
+            numeric_features.append(col)
+        elif col == 'título' or X_knn[col].nunique() > 0.5 * len(X_knn):
+            identifier_features.append(col)
+        else:
+            categorical_features.append(col)
+
+    preprocessor = ColumnTransformer(
+        transformers=[
+            ('num', Pipeline([
+                ('imputer', SimpleImputer(strategy='median')),
+                ('scaler', StandardScaler())
+            ]), numeric_features),
+            ('cat', Pipeline([
+                ('imputer', SimpleImputer(strategy='most_frequent')),
+                ('onehot', OneHotEncoder(handle_unknown='ignore', sparse_output=True))
+            ]), categorical_features)
+        ],
+        remainder='drop',
+        # Keep the output as a CSR matrix no matter how dense the numeric block is
+        sparse_threshold=1.0
+    )
+    return preprocessor, numeric_features, categorical_features, identifier_features
+
+
+def fit_recommendation_model(X_train, y_train, dense=False):
+    """
+    Fit the preprocessing on the training listings and index the transformed
+    catalog for cosine search. The catalog stays CSR unless `dense` is set
+    (see knn_search.CosineSearchEngine).
+    """
+    X_knn, precio_column = prepare_catalog(X_train, y_train)
+    preprocessor, numeric_features, categorical_features, identifier_features = build_preprocessor(X_knn)
+    # ColumnTransformer selects columns by name on DataFrames only; a catalog
+    # lends it a frame over its own arrays
+    X_knn_transformed = preprocessor.fit_transform(X_knn.view() if isinstance(X_knn, CompactCatalog) else X_knn)
+
+    return {
+        'search_engine': CosineSearchEngine(X_knn_transformed, dense=dense),
+        'preprocessor': preprocessor,
+        'X_knn_transformed': X_knn_transformed,
+        'precio_column': precio_column.to_numpy(),
+        'X_knn_columns': X_knn.columns,
+        'numeric_features': numeric_features,
+        'categorical_features': categorical_features,
+        'identifier_features': identifier_features
+    }
+
+
+def transform_queries(model_data, user_inputs):
+    """
+    Encode user input dicts (or a DataFrame of raw listings) into the catalog's
+    feature space. Columns the user did not set are left missing and imputed
+    like in training.
+    """
+    user_df = normalize_specs(pd.DataFrame(user_inputs)).reindex(columns=model_data['X_knn_columns'])
+    return model_data['preprocessor'].transform(user_df)
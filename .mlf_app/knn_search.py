@@ -0,0 +1,257 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import scipy.sparse as sp
+
+
+def l2_normalize(matrix):
+    """Row-wise L2 normalization to float32; all-zero rows stay zero."""
+    if sp.issparse(matrix):
+        matrix = sp.csr_matrix(matrix, dtype=np.float32)
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sp.csr_matrix(sp.diags(1.0 / norms).dot(matrix), dtype=np.float32)
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return np.ascontiguousarray(matrix / norms)
+
+
+class CosineSearchEngine:
+    """
+    Exact cosine k-nearest-neighbour search over a fixed catalog.
+
+    The catalog is L2-normalized once at construction, so each query batch costs
+    a single matrix product plus an `argpartition` top-k, with no per-query norm
+    computation. Results match `NearestNeighbors(metric='cosine')`.
+
+    Parameters:
+    - catalog: (n_items, n_features) dense array or sparse matrix
+    - dense: Densify a sparse catalog instead of keeping it as CSR, trading memory that
+      grows with n_items * n_features (not the non-zeros) for faster products; off by default
+    - n_jobs: Threads used for batches of at least `parallel_threshold` queries
+    - parallel_threshold: Smallest batch size that is split across threads
+    """
+
+    def __init__(self, catalog, dense=False, n_jobs=None, parallel_threshold=256):
+        n_items = catalog.shape[0]
+        normalized = l2_normalize(catalog)
+        if dense and sp.issparse(normalized):
+            normalized = normalized.toarray()
+        self.vectors = normalized
+        self.n_items = n_items
+        self.n_jobs = n_jobs or os.cpu_count() or 1
+        self.parallel_threshold = parallel_threshold
+
+    @classmethod
+    def from_normalized(cls, vectors, n_jobs=None, parallel_threshold=256):
+        """
+        Engine over a catalog that is already L2-normalized float32 (e.g. a
+        memory-mapped index from knn_index.py), used as-is without copying.
+        """
+        engine = cls.__new__(cls)
+        engine.vectors = vectors
+        engine.n_items = vectors.shape[0]
+        engine.n_jobs = n_jobs or os.cpu_count() or 1
+        engine.parallel_threshold = parallel_threshold
+        return engine
+
+    def _search_block(self, queries, k):
+        similarities = self.vectors.dot(queries.T).T
+        if sp.issparse(similarities):
+            similarities = similarities.toarray()
+        similarities = np.asarray(similarities)
+        if k < self.n_items:
+            top = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+        else:
+            top = np.tile(np.arange(self.n_items), (similarities.shape[0], 1))
+        top_similarities = np.take_along_axis(similarities, top, axis=1)
+        # Order by similarity, then by catalog position for ties.
+        order = np.lexsort((top, -top_similarities), axis=1)
+        indices = np.take_along_axis(top, order, axis=1)
+        # float64 like scikit-learn, so callers can serialize the values as-is
+        distances = 1.0 - np.take_along_axis(top_similarities, order, axis=1).astype(np.float64)
+        return distances, indices
+
+    def search(self, queries, k=5):
+        """
+        Parameters:
+        - queries: (n_queries, n_features) array or sparse matrix in catalog feature space
+        - k: Number of neighbours per query
+
+        Returns (distances, indices), each (n_queries, k), nearest first, with
+        cosine distance = 1 - cosine similarity as in scikit-learn.
+        """
+        k = min(k, self.n_items)
+        queries = l2_normalize(queries)
+        if sp.issparse(queries) and not sp.issparse(self.vectors):
+            queries = queries.toarray()
+        n_queries = queries.shape[0]
+        if self.n_jobs == 1 or n_queries < self.parallel_threshold:
+            return self._search_block(queries, k)
+
+        block = -(-n_queries // self.n_jobs)
+        blocks = [queries[i:i + block] for i in range(0, n_queries, block)]
+        with ThreadPoolExecutor(max_workers=self.n_jobs) as executor:
+            results = list(executor.map(lambda q: self._search_block(q, k), blocks))
+        return np.vstack([d for d, _ in results]), np.vstack([i for _, i in results])
+
+    def nbytes(self):
+        """Memory held by the normalized catalog."""
+        if sp.issparse(self.vectors):
+            return self.vectors.data.nbytes + self.vectors.indices.nbytes + self.vectors.indptr.nbytes
+        return self.vectors.nbytes
+
+
+def _assign(vectors, centroids, block_size=65536):
+    """Index of the most similar centroid for every row, in bounded-memory blocks."""
+    labels = np.empty(vectors.shape[0], dtype=np.int32)
+    for start in range(0, vectors.shape[0], block_size):
+        similarities = np.asarray(vectors[start:start + block_size].dot(centroids.T))
+        labels[start:start + block_size] = similarities.argmax(axis=1)
+    return labels
+
+
+def spherical_kmeans(vectors, n_clusters, n_iter=10, sample_size=None, seed=0):
+    """
+    k-means on the unit sphere (cosine similarity), trained on a row sample.
+
+    Parameters:
+    - vectors: L2-normalized (n_items, n_features) dense array or CSR matrix
+    - n_clusters: Number of centroids
+    - n_iter: Lloyd iterations
+    - sample_size: Rows used for training (default: 64 per cluster)
+    - seed: Random seed for the sample and the initial centroids
+
+    Returns the (n_clusters, n_features) float32 unit-norm centroids.
+    """
+    rng = np.random.default_rng(seed)
+    n_items = vectors.shape[0]
+    sample_size = min(n_items, sample_size or 64 * n_clusters)
+    train = vectors[np.sort(rng.choice(n_items, sample_size, replace=False))]
+    initial = train[rng.choice(sample_size, n_clusters, replace=False)]
+    centroids = initial.toarray() if sp.issparse(initial) else np.array(initial, dtype=np.float32)
+
+    for _ in range(n_iter):
+        labels = _assign(train, centroids)
+        membership = sp.csr_matrix(
+            (np.ones(sample_size, dtype=np.float32), (labels, np.arange(sample_size))),
+            shape=(n_clusters, sample_size),
+        )
+        sums = membership.dot(train)
+        sums = sums.toarray() if sp.issparse(sums) else np.asarray(sums)
+        # Re-seed empty clusters from random training rows
+        empty = np.flatnonzero(np.bincount(labels, minlength=n_clusters) == 0)
+        if len(empty):
+            reseed = train[rng.choice(sample_size, len(empty), replace=False)]
+            sums[empty] = reseed.toarray() if sp.issparse(reseed) else reseed
+        centroids = l2_normalize(sums)
+    return centroids
+
+
+class IVFCosineIndex:
+    """
+    Approximate cosine k-nearest-neighbour search with an inverted-file index.
+
+    The catalog is clustered with spherical k-means and stored grouped by cluster,
+    so each cluster ("list") is a contiguous row range. A query is compared with
+    the centroids and then only with the rows of its `n_probe` closest lists.
+    More lists make each probe cheaper; more probes raise recall@k toward 1.0
+    at the cost of latency. `search(..., exact=True)` scans the whole catalog and
+    is the recall reference.
+
+    Parameters:
+    - catalog: (n_items, n_features) dense array or sparse matrix
+    - n_lists: Number of clusters (default: about 4 * sqrt(n_items))
+    - n_probe: Lists scanned per query unless overridden in `search`
+    - n_iter: k-means iterations at build time
+    - sample_size: Rows used to train the centroids (default: 64 per list)
+    - dense: Densify a sparse catalog instead of keeping it as CSR, trading memory that
+      grows with n_items * n_features (not the non-zeros) for faster products; off by default
+    - seed: Random seed for the k-means training
+    """
+
+    def __init__(self, catalog, n_lists=None, n_probe=8, n_iter=10, sample_size=None, dense=False, seed=0):
+        n_items = catalog.shape[0]
+        normalized = l2_normalize(catalog)
+        if dense and sp.issparse(normalized):
+            normalized = normalized.toarray()
+        n_lists = min(n_items, n_lists or max(1, int(4 * np.sqrt(n_items))))
+
+        centroids = spherical_kmeans(normalized, n_lists, n_iter=n_iter, sample_size=sample_size, seed=seed)
+        labels = _assign(normalized, centroids)
+        ids = np.argsort(labels, kind='stable')
+        offsets = np.concatenate(([0], np.cumsum(np.bincount(labels, minlength=n_lists)))).astype(np.int64)
+        self._init(normalized[ids], ids, centroids, offsets, n_probe)
+
+    @classmethod
+    def from_arrays(cls, vectors, ids, centroids, offsets, n_probe=8):
+        """Index over arrays saved by a previous build (vectors already grouped by list)."""
+        index = cls.__new__(cls)
+        index._init(vectors, ids, centroids, offsets, n_probe)
+        return index
+
+    def _init(self, vectors, ids, centroids, offsets, n_probe):
+        self.vectors = vectors
+        self.ids = ids
+        self.centroids = centroids
+        self.offsets = offsets
+        self.n_items = vectors.shape[0]
+        self.n_lists = centroids.shape[0]
+        self.n_probe = n_probe
+        self._list_sizes = np.diff(offsets)
+        self._exact = CosineSearchEngine.from_normalized(vectors)
+
+    def _probe(self, query, lists, k):
+        similarities = np.concatenate([
+            np.asarray(self.vectors[self.offsets[l]:self.offsets[l + 1]].dot(query)).ravel() for l in lists
+        ])
+        positions = np.concatenate([np.arange(self.offsets[l], self.offsets[l + 1]) for l in lists])
+        if k < len(similarities):
+            top = np.argpartition(-similarities, k - 1)[:k]
+            similarities, positions = similarities[top], positions[top]
+        ids = self.ids[positions]
+        order = np.lexsort((ids, -similarities))
+        return 1.0 - similarities[order].astype(np.float64), ids[order]
+
+    def search(self, queries, k=5, n_probe=None, exact=False):
+        """
+        Parameters:
+        - queries: (n_queries, n_features) array or sparse matrix in catalog feature space
+        - k: Number of neighbours per query
+        - n_probe: Lists scanned per query (default: the index's `n_probe`)
+        - exact: Scan the whole catalog instead (same results as CosineSearchEngine)
+
+        Returns (distances, indices) like CosineSearchEngine.search, with indices
+        into the original catalog order.
+        """
+        k = min(k, self.n_items)
+        if exact:
+            distances, positions = self._exact.search(queries, k=k)
+            return distances, self.ids[positions]
+
+        n_probe = min(n_probe or self.n_probe, self.n_lists)
+        queries = l2_normalize(queries)
+        if sp.issparse(queries):
+            queries = queries.toarray()
+        ranked_lists = np.argsort(-queries.dot(self.centroids.T), axis=1)
+
+        distances = np.empty((queries.shape[0], k), dtype=np.float64)
+        indices = np.empty((queries.shape[0], k), dtype=np.int64)
+        for i, query in enumerate(queries):
+            lists = ranked_lists[i]
+            # Keep probing past n_probe if the closest lists hold fewer than k rows
+            n_lists = max(n_probe, int(np.searchsorted(np.cumsum(self._list_sizes[lists]), k)) + 1)
+            distances[i], indices[i] = self._probe(query, lists[:n_lists], k)
+        return distances, indices
+
+    def nbytes(self):
+        """Memory held by the normalized catalog and the index structures."""
+        return self._exact.nbytes() + self.ids.nbytes + self.centroids.nbytes + self.offsets.nbytes
+
+
+def recall_at_k(approximate_indices, exact_indices):
+    """Mean fraction of each query's exact top-k found by the approximate search."""
+    hits = [len(set(a) & set(e)) / len(e) for a, e in zip(approximate_indices, exact_indices)]
+    return float(np.mean(hits)) if hits else 1.0
@@ -0,0 +1,277 @@
+"""
+Label encodings used when the price model was trained.
+
+Each map goes from the integer the model sees in the matching `*_label` feature
+to the original string value in the raw data.
+"""
+
+# company_name_label
+company_name_map = {
+    0: "ASRock", 1: "ASUS", 2: "AWow", 3: "Abra", 4: "Acemagic", 5: "Acemagician", 6: "Acer", 7: "Actina",
+    8: "Adonia", 9: "Advance", 10: "Alienware", 11: "Alurin", 12: "Ankermann", 13: "Apple", 14: "Arc",
+    15: "BEASTCOM", 16: "BMAX", 17: "Basic", 18: "Basilisk", 19: "Beelink", 20: "Blackview", 21: "Captiva",
+    22: "Chuwi", 23: "Concept", 24: "Corsair", 25: "Deep", 26: "DeepGaming", 27: "Dell", 28: "Denver",
+    29: "DeskMini", 30: "Edge", 31: "Elitegroup", 32: "Ernitec", 33: "F", 34: "Force", 35: "Fujitsu",
+    36: "FutureNUC", 37: "GPD", 38: "GREED", 39: "Gaming", 40: "Geekom", 41: "GemiBook", 42: "GigaByte",
+    43: "Gold", 44: "HP", 45: "Huawei", 46: "Hyrican", 47: "IT", 48: "Innjoo", 49: "Intel", 50: "Iox",
+    51: "Ioxbook", 52: "Joule", 53: "Kiebel", 54: "LG", 55: "Lenovo", 56: "Leotec", 57: "Lite", 58: "MSI",
+    59: "Mars", 60: "MeLE", 61: "Medion", 62: "Memory", 63: "Microsoft", 64: "Minisforum", 65: "Minix",
+    66: "Neo", 67: "Nexus", 68: "NiPoGi", 69: "Nilox", 70: "Ninkear", 71: "Nitropc", 72: "NucBox", 73: "Nuke",
+    74: "Office", 75: "Orbsmart", 76: "Ouvis", 77: "PC", 78: "PcCom", 79: "Plus", 80: "Prime", 81: "Primux",
+    82: "Prixton", 83: "Pro", 84: "Quieter", 85: "Racing", 86: "Razer", 87: "Samsung", 88: "Schenker",
+    89: "ScreenOn", 90: "Sedatech", 91: "Shuttle", 92: "Silver", 93: "Striker", 94: "SuperMicro", 95: "TB",
+    96: "Techbite", 97: "Technologies", 98: "Tecra", 99: "Thomson", 100: "Toughline", 101: "Tulpar",
+    102: "U", 103: "VIST", 104: "Venom", 105: "Vibox", 106: "Viewsonic", 107: "Vision", 108: "X",
+    109: "Xiaomi", 110: "Yashi", 111: "Zenith", 112: "Zone", 113: "Zotac", 114: "iggual", 115: "iiyama"
+}
+
+# pantalla_tecnología_pantalla_label
+resolution_map = {
+    0: "2,2K",
+    1: "2.5K",
+    2: "2.8K",
+    3: "2K",
+    4: "3,2K",
+    5: "3K",
+    6: "4K",
+    7: "FHD+",
+    8: "Full HD",
+    9: "HD Ready",
+    10: "HD+",
+    11: "Missing_value",
+    12: "QHD",
+    13: "QHD+",
+    14: "Retina",
+    15: "UHD+",
+    16: "Ultra HD",
+    17: "WQHD",
+    18: "WQUXGA",
+    19: "WQXGA",
+    20: "WQXGA+",
+    21: "WUXGA",
+    22: "WUXGA+",
+    23: "WXGA+"
+}
+
+# procesador_name_label
+procesador_name_map = {
+    0: "AMD 3000", 1: "AMD A-Series", 2: "AMD A10", 3: "AMD Athlon", 4: "AMD Athlon 3150U",
+    5: "AMD GX", 6: "AMD Ryzen", 7: "AMD Ryzen 3", 8: "AMD Ryzen 3 4300GE", 9: "AMD Ryzen 5",
+    10: "AMD Ryzen 5 4600G", 11: "AMD Ryzen 5 7535U", 12: "AMD Ryzen 7", 13: "AMD Ryzen 7 3700U",
+    14: "AMD Ryzen 7 5700U", 15: "AMD Ryzen 7 7435HS", 16: "AMD Ryzen 9", 17: "AMD Ryzen 9 5900X",
+    18: "AMD Ryzen AI 7", 19: "AMD Ryzen AI 9", 20: "AMD Ryzen Embedded",
+    21: "AMD Ryzen Threadripper PRO", 22: "AMD Ryzen Threadripper PRO 5955WX",
+    23: "ARM Cortex", 24: "Apple M1", 25: "Apple M1 Pro", 26: "Apple M1 Ultra", 27: "Apple M2",
+    28: "Apple M2 Max", 29: "Apple M2 Pro", 30: "Apple M2 Ultra", 31: "Apple M3",
+    32: "Apple M3 Max", 33: "Apple M3 Pro", 34: "Apple M4", 35: "Apple M4 Max",
+    36: "Apple M4 Pro", 37: "Intel Atom", 38: "Intel Atom D525", 39: "Intel Atom E3815",
+    40: "Intel Celeron", 41: "Intel Celeron G1620", 42: "Intel Celeron N4000",
+    43: "Intel Celeron N4120", 44: "Intel Core Ultra 5", 45: "Intel Core Ultra 7",
+    46: "Intel Core Ultra 9", 47: "Intel Core i3", 48: "Intel Core i5", 49: "Intel Core i7",
+    50: "Intel Core i9", 51: "Intel N", 52: "Intel Pentium", 53: "Intel Pentium 6405U",
+    54: "Intel Pentium Gold", 55: "Intel Pentium N3700", 56: "Intel Pentium Silver",
+    57: "Intel Xeon", 58: "Intel Xeon E5", 59: "Intel Xeon Silver 4210R",
+    60: "MediaTek Kompanio", 61: "MediaTek MT8183", 62: "Missing_value", 63: "Qualcomm Kryo",
+    64: "Qualcomm Snapdragon", 65: "Qualcomm Snapdragon 7180c",
+    66: "Qualcomm Snapdragon 8cx Gen3", 67: "Qualcomm Snapdragon X Elite",
+    68: "Qualcomm Snapdragon X Plus", 69: "Qualcomm Snapdragon X Plus X1P",
+    70: "RockChip RK3368", 71: "VIA Eden"
+}
+
+# gráfica_tarjeta_gráfica_label
+graphics_brand_name = {
+    0: "2 x AMD FirePro D700",
+    1: "2 x nVidia GeForce GTX 980 Ti",
+    2: "AMD Radeon",
+    3: "AMD Radeon 610M",
+    4: "AMD Radeon 660M",
+    5: "AMD Radeon 680M",
+    6: "AMD Radeon 740M",
+    7: "AMD Radeon 760M",
+    8: "AMD Radeon 780M",
+    9: "AMD Radeon 860M",
+    10: "AMD Radeon 880M",
+    11: "AMD Radeon 890M",
+    12: "AMD Radeon Graphics",
+    13: "AMD Radeon R2E",
+    14: "AMD Radeon R3",
+    15: "AMD Radeon R4",
+    16: "AMD Radeon R4 Graphics",
+    17: "AMD Radeon R7",
+    18: "AMD Radeon RX 480",
+    19: "AMD Radeon RX 550",
+    20: "AMD Radeon RX 6400",
+    21: "AMD Radeon RX 6500 XT",
+    22: "AMD Radeon RX 6500M",
+    23: "AMD Radeon RX 6600",
+    24: "AMD Radeon RX 6600M",
+    25: "AMD Radeon RX 6700 XT",
+    26: "AMD Radeon RX 6700S",
+    27: "AMD Radeon RX 6750 XT",
+    28: "AMD Radeon RX 7600",
+    29: "AMD Radeon RX 7600S",
+    30: "AMD Radeon RX 7700 XT",
+    31: "AMD Radeon RX 7800 XT",
+    32: "AMD Radeon RX 7900 GRE",
+    33: "AMD Radeon RX 7900 XT",
+    34: "AMD Radeon RX 7900 XTX",
+    35: "AMD Radeon RX Vega",
+    36: "AMD Radeon RX Vega 10",
+    37: "AMD Radeon RX Vega 11",
+    38: "AMD Radeon RX Vega 3",
+    39: "AMD Radeon RX Vega 6",
+    40: "AMD Radeon RX Vega 7",
+    41: "AMD Radeon RX Vega 8",
+    42: "AMD Radeon Vega 8 Graphics",
+    43: "AMD Radeon Vega 9",
+    44: "AMD Uma",
+    45: "ARM Mali-G72 MP3",
+    46: "Apple M2 GPU",
+    47: "Apple M2 Graphics",
+    48: "Apple M2 Max GPU",
+    49: "Apple M2 Pro GPU",
+    50: "Apple M2 Pro Graphics",
+    51: "Apple M2 Ultra GPU",
+    52: "Apple M3 Graphics",
+    53: "Apple M3 Pro Graphics",
+    54: "Apple M4 10-Core GPU",
+    55: "Apple M4 Graphics",
+    56: "Apple M4 Max Graphics",
+    57: "Apple M4 Pro 16-Core GPU",
+    58: "Apple M4 Pro Graphics",
+    59: "Intel Arc A350M",
+    60: "Intel Arc A370M",
+    61: "Intel Arc A730M",
+    62: "Intel Arc A770 Graphics",
+    63: "Intel Arc Graphics",
+    64: "Intel Arc Graphics 130V",
+    65: "Intel Arc Graphics 140V",
+    66: "Intel Arc Pro A30M",
+    67: "Intel Graphics",
+    68: "Intel HD Graphics",
+    69: "Intel HD Graphics 400",
+    70: "Intel HD Graphics 4000",
+    71: "Intel HD Graphics 4400",
+    72: "Intel HD Graphics 4600",
+    73: "Intel HD Graphics 500",
+    74: "Intel HD Graphics 520",
+    75: "Intel HD Graphics 530",
+    76: "Intel HD Graphics 540",
+    77: "Intel HD Graphics 5500",
+    78: "Intel HD Graphics 600",
+    79: "Intel HD Graphics 605",
+    80: "Intel HD Graphics 620",
+    81: "Intel HD Graphics 630",
+    82: "Intel Iris Graphics",
+    83: "Intel Iris Graphics 6100",
+    84: "Intel Iris Graphics 650",
+    85: "Intel Iris Plus Graphics",
+    86: "Intel Iris Plus Graphics 655",
+    87: "Intel Iris Xe Graphics",
+    88: "Intel UHD Graphics",
+    89: "Intel UHD Graphics 1250",
+    90: "Intel UHD Graphics 600",
+    91: "Intel UHD Graphics 605",
+    92: "Intel UHD Graphics 610",
+    93: "Intel UHD Graphics 620",
+    94: "Intel UHD Graphics 630",
+    95: "Intel UHD Graphics 730",
+    96: "Intel UHD Graphics 750",
+    97: "Intel UHD Graphics 770",
+    98: "Intel Xe Graphics",
+    99: "Matrox G200",
+    100: "Missing_value",
+    101: "NVIDIA GeForce GT 1030",
+    102: "NVIDIA GeForce GT 710",
+    103: "NVIDIA GeForce GT 730",
+    104: "NVIDIA GeForce GTX 1050",
+    105: "NVIDIA GeForce GTX 1060",
+    106: "NVIDIA GeForce GTX 1080",
+    107: "NVIDIA GeForce GTX 1630",
+    108: "NVIDIA GeForce GTX 1650",
+    109: "NVIDIA GeForce GTX 1650 Super",
+    110: "NVIDIA GeForce GTX 1660 Super",
+    111: "NVIDIA GeForce GTX 1660 Ti",
+    112: "NVIDIA GeForce GTX 950M",
+    113: "NVIDIA GeForce GTX 970",
+    114: "NVIDIA GeForce GTX 980",
+    115: "NVIDIA GeForce MX250",
+    116: "NVIDIA GeForce MX330",
+    117: "NVIDIA GeForce MX350",
+    118: "NVIDIA GeForce MX450",
+    119: "NVIDIA GeForce MX550",
+    120: "NVIDIA GeForce MX570",
+    121: "NVIDIA GeForce RTX 2050",
+    122: "NVIDIA GeForce RTX 2060",
+    123: "NVIDIA GeForce RTX 2070 Super",
+    124: "NVIDIA GeForce RTX 2080 Super",
+    125: "NVIDIA GeForce RTX 3050",
+    126: "NVIDIA GeForce RTX 3050 Ti",
+    127: "NVIDIA GeForce RTX 3060",
+    128: "NVIDIA GeForce RTX 3060 Ti",
+    129: "NVIDIA GeForce RTX 3070",
+    130: "NVIDIA GeForce RTX 3070 Ti",
+    131: "NVIDIA GeForce RTX 3080",
+    132: "NVIDIA GeForce RTX 3080 Ti",
+    133: "NVIDIA GeForce RTX 3090",
+    134: "NVIDIA GeForce RTX 4050",
+    135: "NVIDIA GeForce RTX 4060",
+    136: "NVIDIA GeForce RTX 4060 Ti",
+    137: "NVIDIA GeForce RTX 4070",
+    138: "NVIDIA GeForce RTX 4070 Super",
+    139: "NVIDIA GeForce RTX 4070 Ti",
+    140: "NVIDIA GeForce RTX 4070 Ti Super",
+    141: "NVIDIA GeForce RTX 4080",
+    142: "NVIDIA GeForce RTX 4080 Super",
+    143: "NVIDIA GeForce RTX 4090",
+    144: "NVIDIA Quadro 600",
+    145: "NVIDIA Quadro M2000",
+    146: "NVIDIA Quadro P1000",
+    147: "NVIDIA Quadro P2200",
+    148: "NVIDIA Quadro P520",
+    149: "NVIDIA Quadro RTX 3000",
+    150: "NVIDIA Quadro RTX 4000",
+    151: "NVIDIA Quadro RTX 5000",
+    152: "NVIDIA Quadro RTX 6000",
+    153: "NVIDIA Quadro RTX A5000",
+    154: "NVIDIA Quadro T1000",
+    155: "NVIDIA Quadro T2000",
+    156: "NVIDIA Quadro T400",
+    157: "NVIDIA RTX 1000 Ada",
+    158: "NVIDIA RTX 2000",
+    159: "NVIDIA RTX 2000 Ada",
+    160: "NVIDIA RTX 3000 Ada",
+    161: "NVIDIA RTX 3500",
+    162: "NVIDIA RTX 3500 Ada",
+    163: "NVIDIA RTX 4000 Ada",
+    164: "NVIDIA RTX 4500 Ada",
+    165: "NVIDIA RTX 500 Ada",
+    166: "NVIDIA RTX 5000 Ada",
+    167: "NVIDIA RTX A1000",
+    168: "NVIDIA RTX A2000",
+    169: "NVIDIA RTX A3000",
+    170: "NVIDIA RTX A400",
+    171: "NVIDIA RTX A4000",
+    172: "NVIDIA RTX A4500",
+    173: "NVIDIA RTX A500",
+    174: "NVIDIA RTX A5000",
+    175: "NVIDIA RTX A5500",
+    176: "NVIDIA RTX A6000",
+    177: "NVIDIA T1000",
+    178: "NVIDIA T1200",
+    179: "NVIDIA T400",
+    180: "NVIDIA T550",
+    181: "NVIDIA T600",
+    182: "PowerVR SGX6110",
+    183: "Qualcomm Adreno",
+    184: "Qualcomm Adreno 540 GPU",
+    185: "Qualcomm Adreno 618",
+    186: "Qualcomm Adreno 680",
+    187: "Qualcomm Adreno 690",
+    188: "Qualcomm Adreno X Elite",
+    189: "Qualcomm Adreno X Plus",
+    190: "VIA Chrome9",
+    191: "nVidia NextGen Ion",
+    192: "nVidia Quadro M4000",
+    193: "sin tarjeta gráfica"
+}
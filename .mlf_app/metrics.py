@@ -0,0 +1,272 @@
+"""
+Per-stage timing of the pages, exported in the Prometheus text format.
+
+Pages wrap their stages in `span(page, stage)`; each span adds its duration to a
+histogram (`mlf_stage_seconds`), and `count(page, event)` bumps a counter
+(`mlf_events_total`). At scrape time the statistics the shared components
+already keep (models, prediction caches, feedback writers, table loads and the
+background warm-up) are added as gauges and counters.
+
+Metrics are off unless MLF_METRICS=1 is set; when off, `span` returns a shared
+no-op context manager and `count` returns immediately. When on, the first page
+run starts the exporter once per process:
+
+- MLF_METRICS_PORT (default 9464): http://127.0.0.1:<port>/metrics
+- MLF_METRICS_FILE: also rewrite this file every MLF_METRICS_INTERVAL seconds
+  (default 15), e.g. for node_exporter's textfile collector
+
+    MLF_METRICS=1 streamlit run .mlf_app/Home.py
+    curl -s localhost:9464/metrics
+"""
+import bisect
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ENABLED = os.environ.get("MLF_METRICS", "0").lower() in ("1", "true", "yes")
+DEFAULT_PORT = 9464
+# Upper bounds in seconds, from a cached predict (well under a millisecond) to a cold index build
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Cumulative-bucket histogram of durations in seconds, as Prometheus expects."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def cumulative(self):
+        """[(le, count)] including +Inf."""
+        total, rows = 0, []
+        for le, n in zip(self.buckets + (float("inf"),), self.counts):
+            total += n
+            rows.append((le, total))
+        return rows
+
+
+_histograms = {}
+_counters = {}
+_lock = threading.Lock()
+
+
+def observe(page, stage, seconds):
+    """Record one `stage` duration of `page`."""
+    with _lock:
+        histogram = _histograms.get((page, stage))
+        if histogram is None:
+            histogram = _histograms[(page, stage)] = Histogram()
+        histogram.observe(seconds)
+
+
+class _Span:
+    __slots__ = ("page", "stage", "start")
+
+    def __init__(self, page, stage):
+        self.page = page
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        observe(self.page, self.stage, time.perf_counter() - self.start)
+        if exc_type is not None:
+            count(self.page, f"{self.stage}_error")
+        return False
+
+    def stop(self):
+        self.__exit__(None, None, None)
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def stop(self):
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(page, stage):
+    """
+    Context manager timing one stage of a page run.
+
+    Parameters:
+    - page: Page the stage belongs to, e.g. "price_predictor"
+    - stage: Stage name, e.g. "predict"; an exception inside also counts "<stage>_error"
+    """
+    if not ENABLED:
+        return _NO_SPAN
+    start_exporter()
+    return _Span(page, stage)
+
+
+def start_span(page, stage):
+    """Like span(), for stages that do not fit in a with block: returns a started span; call .stop() on it."""
+    return span(page, stage).__enter__()
+
+
+def count(page, event, n=1):
+    """Add `n` to the `event` counter of `page`."""
+    if not ENABLED:
+        return
+    with _lock:
+        _counters[(page, event)] = _counters.get((page, event), 0) + n
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _le(bound):
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+def _component_metrics():
+    """(metric, type, help, [(labels, value)]) from the statistics the shared components keep."""
+    from data_cache import load_stats
+    from feedback_writer import feedback_stats
+    from model_registry import model_stats
+    from prediction_cache import cache_stats
+    from startup import warm_up_stats
+
+    models = model_stats()
+    caches = cache_stats()
+    writers = feedback_stats()
+    tables = load_stats()
+    warm_up = warm_up_stats()
+    return [
+        ("mlf_model_load_seconds", "gauge", "Time taken to unpickle each loaded model.",
+         [(dict(path=m["path"]), m["load_seconds"]) for m in models]),
+        ("mlf_model_booster_bytes", "gauge", "Serialized size of each loaded booster.",
+         [(dict(path=m["path"]), m["booster_bytes"]) for m in models]),
+        ("mlf_prediction_cache_hits_total", "counter", "Prediction cache hits.",
+         [(dict(model=path), s["hits"]) for path, s in caches.items()]),
+        ("mlf_prediction_cache_misses_total", "counter", "Prediction cache misses.",
+         [(dict(model=path), s["misses"]) for path, s in caches.items()]),
+        ("mlf_prediction_cache_entries", "gauge", "Prices currently held by the prediction cache.",
+         [(dict(model=path), s["size"]) for path, s in caches.items()]),
+        ("mlf_feedback_written_total", "counter", "Feedback records written to disk.",
+         [(dict(path=path), s["written"]) for path, s in writers.items()]),
+        ("mlf_feedback_dropped_total", "counter", "Feedback records dropped because the writer queue stayed full.",
+         [(dict(path=path), s["dropped"]) for path, s in writers.items()]),
+        ("mlf_feedback_queue_depth", "gauge", "Feedback records waiting for the writer thread.",
+         [(dict(path=path), s["queue_depth"]) for path, s in writers.items()]),
+        ("mlf_feedback_last_batch_seconds", "gauge", "Duration of the writer's last disk batch.",
+         [(dict(path=path), s["last_batch_seconds"]) for path, s in writers.items()]),
+        ("mlf_table_load_seconds", "gauge", "Last load time of each table (CSV parse or columnar cache).",
+         [(dict(table=name, source=s["source"]), s["seconds"]) for name, s in tables.items()]),
+        ("mlf_warm_up_seconds", "gauge", "Duration of each background warm-up task.",
+         [(dict(task=name, status="ok" if s["status"] == "ok" else "failed"), s["seconds"])
+          for name, s in warm_up.items()]),
+    ]
+
+
+def render():
+    """All metrics of this process in the Prometheus text exposition format."""
+    with _lock:
+        histograms = [(key, h.cumulative(), h.sum, h.count) for key, h in sorted(_histograms.items())]
+        counters = sorted(_counters.items())
+
+    lines = [
+        "# HELP mlf_stage_seconds Time spent in each stage of a page run.",
+        "# TYPE mlf_stage_seconds histogram",
+    ]
+    for (page, stage), buckets, total, n in histograms:
+        for le, cumulative in buckets:
+            lines.append(f"mlf_stage_seconds_bucket{_labels(page=page, stage=stage, le=_le(le))} {cumulative}")
+        lines.append(f"mlf_stage_seconds_sum{_labels(page=page, stage=stage)} {total!r}")
+        lines.append(f"mlf_stage_seconds_count{_labels(page=page, stage=stage)} {n}")
+
+    lines += ["# HELP mlf_events_total Page events.", "# TYPE mlf_events_total counter"]
+    lines += [f"mlf_events_total{_labels(page=page, event=event)} {n}" for (page, event), n in counters]
+
+    for metric, kind, help_text, samples in _component_metrics():
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}"]
+        lines += [f"{metric}{_labels(**labels)} {value!r}" for labels, value in samples if value is not None]
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics(path):
+    """Write render() to `path` atomically."""
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(render())
+    os.replace(tmp_path, path)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _write_periodically(path, interval):
+    while True:
+        try:
+            write_metrics(path)
+        except OSError:
+            pass
+        time.sleep(interval)
+
+
+_exporter_started = False
+_exporter_lock = threading.Lock()
+
+
+def start_exporter(port=None, path=None):
+    """
+    Serve /metrics on localhost (and rewrite the metrics file, if configured)
+    from daemon threads, once per process. A port already in use, e.g. by
+    another app process, is skipped; the file, if any, is still written.
+    """
+    global _exporter_started
+    if _exporter_started:
+        return
+    with _exporter_lock:
+        if _exporter_started:
+            return
+        _exporter_started = True
+        port = port or int(os.environ.get("MLF_METRICS_PORT", DEFAULT_PORT))
+        path = path or os.environ.get("MLF_METRICS_FILE")
+        try:
+            server = ThreadingHTTPServer(("127.0.0.1", port), _MetricsHandler)
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, name="metrics-exporter", daemon=True).start()
+        except OSError:
+            pass
+        if path:
+            interval = float(os.environ.get("MLF_METRICS_INTERVAL", 15))
+            threading.Thread(target=_write_periodically, args=(path, interval), name="metrics-file",
+                             daemon=True).start()
@@ -0,0 +1,136 @@
+import os
+import threading
+import time
+
+DEFAULT_MODEL_PATH = "xgb_best_model.joblib"
+
+# One entry per artifact path, shared by every session and page of the process.
+# Streamlit keeps imported modules in sys.modules between reruns, so this dict
+# survives widget changes and page switches.
+_models = {}
+_lock = threading.Lock()
+
+
+def _rss_bytes():
+    """Current resident set size of the process, or None when unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _load(path):
+    # joblib (and xgboost, when unpickling) are imported on first load rather
+    # than with this module, so pages that only import the registry start fast
+    import joblib
+
+    rss_before = _rss_bytes()
+    start = time.perf_counter()
+    model = joblib.load(path)
+    load_seconds = time.perf_counter() - start
+    rss_after = _rss_bytes()
+
+    booster = model.get_booster()
+    stat = os.stat(path)
+    return {
+        "model": model,
+        "feature_names": list(booster.feature_names),
+        "path": path,
+        "load_seconds": load_seconds,
+        "loaded_at": time.time(),
+        "artifact_bytes": stat.st_size,
+        "artifact_mtime": stat.st_mtime,
+        "booster_bytes": len(booster.save_raw(raw_format="ubj")),
+        "rss_delta_bytes": (rss_after - rss_before) if rss_before is not None and rss_after is not None else None,
+        "warmed_up": False,
+    }
+
+
+def _get_entry(path):
+    key = os.path.abspath(path)
+    entry = _models.get(key)
+    if entry is None:
+        with _lock:
+            # Another session may have finished loading while we waited.
+            entry = _models.get(key)
+            if entry is None:
+                entry = _load(key)
+                _models[key] = entry
+    return entry
+
+
+def reload_if_changed(path=DEFAULT_MODEL_PATH):
+    """
+    Reload the artifact at `path` if the file on disk no longer matches the
+    loaded copy (new mtime or size). Returns True when a reload happened.
+    """
+    key = os.path.abspath(path)
+    entry = _models.get(key)
+    if entry is None:
+        return False
+    stat = os.stat(key)
+    if (stat.st_mtime, stat.st_size) == (entry["artifact_mtime"], entry["artifact_bytes"]):
+        return False
+    with _lock:
+        entry = _models[key]
+        if (stat.st_mtime, stat.st_size) == (entry["artifact_mtime"], entry["artifact_bytes"]):
+            return False
+        _models[key] = _load(key)
+    return True
+
+
+def model_version(path=DEFAULT_MODEL_PATH):
+    """Identifier of the loaded artifact; changes whenever the model is reloaded from a new file."""
+    entry = _get_entry(path)
+    return (entry["path"], entry["artifact_mtime"], entry["artifact_bytes"])
+
+
+def get_model(path=DEFAULT_MODEL_PATH):
+    """
+    Return the model stored at `path`, unpickling it only the first time it is requested.
+
+    Parameters:
+    - path: Location of the joblib artifact, relative to the working directory
+    """
+    return _get_entry(path)["model"]
+
+
+def get_feature_names(path=DEFAULT_MODEL_PATH):
+    """Feature names of the booster stored at `path`, in the order the model expects them."""
+    return _get_entry(path)["feature_names"]
+
+
+def warm_up(paths=(DEFAULT_MODEL_PATH,)):
+    """
+    Load every artifact in `paths` and run one dummy prediction through it so the
+    first real user request does not pay for unpickling or XGBoost's lazy setup.
+
+    Parameters:
+    - paths: Iterable of artifact paths to preload
+    """
+    import numpy as np
+
+    for path in paths:
+        entry = _get_entry(path)
+        if entry["warmed_up"]:
+            continue
+        with _lock:
+            if not entry["warmed_up"]:
+                dummy = np.zeros((1, len(entry["feature_names"])), dtype=np.float32)
+                entry["model"].predict(dummy)
+                entry["warmed_up"] = True
+
+
+def model_stats():
+    """
+    Load time and memory footprint of every model currently held by the registry.
+
+    Returns a list of dicts, one per artifact. `booster_bytes` is the size of the
+    serialized trees; `rss_delta_bytes` is how much the process grew while loading,
+    which for the first model also includes importing xgboost itself.
+    """
+    with _lock:
+        entries = list(_models.values())
+    return [{k: v for k, v in entry.items() if k not in ("model", "feature_names")} for entry in entries]
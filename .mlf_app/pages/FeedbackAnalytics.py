@@ -0,0 +1,67 @@
+import streamlit as st
+import pandas as pd
+
+from feedback_analytics import FeedbackAggregator
+from feedback_store import get_feedback_store
+
+PAGE_TITLES = {
+    "price_predictor": "Price Predictor",
+    "knn_recommendation": "KNN Recommendations",
+}
+RATING_ORDER = ["Very Accurate", "Somewhat Accurate", "Neutral", "Somewhat Inaccurate", "Very Inaccurate"]
+
+st.header("Feedback Analytics")
+
+st.markdown(
+    "Live quality of the price model and the KNN recommendations, from the feedback users submit on those pages."
+)
+
+
+@st.cache_resource
+def get_aggregator():
+    # One aggregator per server process; every session's rerun only folds in new feedback
+    return FeedbackAggregator(get_feedback_store())
+
+
+@st.fragment(run_every="10s")
+def show_feedback():
+    aggregator = get_aggregator()
+    aggregator.refresh()
+    # The aggregator is shared by every session; render from a copy taken under its lock
+    snapshot = aggregator.snapshot(top_n=10)
+    pages = snapshot["pages"]
+
+    if not pages:
+        st.info("No feedback yet. Existing .jsonl files can be loaded with `python .mlf_app/feedback_store.py import`.")
+        return
+
+    tabs = st.tabs([PAGE_TITLES.get(page, page) for page in pages])
+    for tab, aggregates in zip(tabs, pages.values()):
+        with tab:
+            col1, col2 = st.columns(2)
+            col1.metric("Feedback received", f"{aggregates['records']:,}")
+            col2.metric("Distinct sessions (approx.)", f"{aggregates['sessions']:,}")
+
+            st.subheader("Accuracy rating mix")
+            ratings = pd.Series(aggregates["ratings"])
+            order = [r for r in RATING_ORDER if r in ratings.index] + [r for r in ratings.index if r not in RATING_ORDER]
+            st.bar_chart(ratings.reindex(order).rename("Feedback"), sort=False)
+
+            st.subheader("Predicted price")
+            buckets = pd.Series(aggregates["price_buckets"], name="Feedback")
+            st.bar_chart(buckets, sort=False)
+
+            st.subheader("Top input configurations")
+            st.dataframe(
+                pd.DataFrame(aggregates["top_configurations"], columns=["Configuration", "Feedback", "Max overcount"]),
+                hide_index=True,
+            )
+
+    last_refresh = snapshot["last_refresh"]
+    st.caption(
+        f"Last refresh read {last_refresh['records']:,} new records "
+        f"in {last_refresh['seconds'] * 1e3:.1f} ms."
+    )
+
+
+show_feedback()
@@ -1,20 +1,22 @@
 import streamlit as st
-import pandas as pd
 import numpy as np
-from sklearn.neighbors import NearestNeighbors
-from sklearn.impute import SimpleImputer
-from sklearn.preprocessing import StandardScaler, OneHotEncoder
-from sklearn.compose import ColumnTransformer
-from sklearn.pipeline import Pipeline
-import warnings
 import datetime
-import json
-import os
-warnings.filterwarnings('ignore')
+
+from knn_index import get_index
+from knn_model import transform_queries
+from feature_schema import get_feature_schema
+from feedback_writer import get_feedback_writer
+from metrics import count, span, start_span
+from profiling import finish_profiling, instrument_fragment, start_profiling
+from startup import start_background_warm_up
+
+# Stage timings of this page, exported when MLF_METRICS=1 (see metrics.py)
+PAGE = "knn"
+script_run = start_span(PAGE, "script_run")
 
 def save_feedback(recommendations, accuracy_rating, feedback_text=None):
     """
-    Save user feedback to a flat file on disk.
+    Queue user feedback for the flat file on disk.
     
     Parameters:
     - recommendations: The laptop recommendations that were shown
@@ -34,14 +36,12 @@ def save_feedback(recommendations, accuracy_rating, feedback_text=None):
                      for k, v in st.session_state.last_input_data.items()}
     }
     
-    os.makedirs("feedback", exist_ok=True)
-    
-
-    feedback_file = "feedback/knn_recommendation_feedback.jsonl"
-    with open(feedback_file, "a") as f:
-        f.write(json.dumps(feedback_data) + "\n")
-    
-    return True
+    # Written by the shared background writer, so the submit does not wait on disk.
+    # False means the record was dropped because the writer stayed backed up.
+    with span(PAGE, "save_feedback"):
+        queued = get_feedback_writer("feedback/knn_recommendation_feedback.jsonl").write(feedback_data)
+    count(PAGE, "feedback_queued" if queued else "feedback_dropped")
+    return queued
 
 if 'session_id' not in st.session_state:
     st.session_state.session_id = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
@@ -58,6 +58,9 @@ st.set_page_config(
     layout="wide"
 )
 
+# Admin-only: profile this rerun when switched on (see profiling.py)
+profiler = start_profiling(PAGE)
+
 
 st.markdown("""
 <style>
@@ -124,296 +127,261 @@ The price prediction is based on these similar laptops, weighted by their simila
 """)
 
 
-@st.cache_data
-def load_data():
+def load_recommendation_model():
     try:
-        X_train = pd.read_csv("X_train_final.csv")
-        y_train = pd.read_csv("y_train.csv")
-        
-        if len(y_train.columns) > 0 and (y_train.columns[0] == '' or y_train.columns[0] == 'Unnamed: 0'):
-            y_train = y_train.drop(y_train.columns[0], axis=1)
-            
-        titulos = pd.read_csv("titulos.csv")
-        
-        return X_train, y_train, titulos
+        # Maps the prebuilt index from disk once per process (usually already done by
+        # the background warm-up); it is only refit when the CSVs changed
+        return get_index()
     except Exception as e:
         st.error(f"Error loading data: {e}")
-        return None, None, None
-
-X_train, y_train, titulos = load_data()
+        return None
 
-if X_train is not None and y_train is not None and titulos is not None:
+with st.spinner("Loading recommendation model..."), span(PAGE, "index_load"):
+    model_data = load_recommendation_model()
 
-    @st.cache_resource
-    def build_recommendation_model():
-        k = 5
-        
-        X_knn = X_train.copy()
-        
-        # Add price column
-        if isinstance(y_train, pd.DataFrame):
-            if 'price_avg' in y_train.columns:
-                X_knn['precio'] = y_train['price_avg'].values
-            else:
-                X_knn['precio'] = y_train.iloc[:, 0].values
-        else:
-            X_knn['precio'] = y_train
-        
-        columns_to_drop = [
-            'medidas_profundidad_cm', 'medidas_peso_kg', 'procesador_tdp_W',
-            'medidas_ancho_cm', 'ofertas_count', 'pantalla_diagonal_pantalla_cm',
-            'altura_mm'
-        ]
-        X_knn = X_knn.drop(columns=[col for col in columns_to_drop if col in X_knn.columns], errors='ignore')
-        
-        numeric_features = []
-        categorical_features = []
-        
-        for col in X_knn.columns:
-            if col == 'precio':
-                continue
-            if pd.api.types.is_numeric_dtype(X_knn[col]):
-                numeric_features.append(col)
-            else:
-                categorical_features.append(col)
-
-        preprocessor = ColumnTransformer(
-            transformers=[
-                ('num', Pipeline([
-                    ('imputer', SimpleImputer(strategy='median')),
-                    ('scaler', StandardScaler())
-                ]), numeric_features),
-                ('cat', Pipeline([
-                    ('imputer', SimpleImputer(strategy='most_frequent')), 
-                    ('onehot', OneHotEncoder(handle_unknown='ignore', sparse_output=False))
-                ]), categorical_features)
-            ],
-            remainder='passthrough'
-        )
-        
-        precio_column = X_knn['precio'].copy()
-        X_knn_without_precio = X_knn.drop('precio', axis=1)
-        
-        X_knn_transformed = preprocessor.fit_transform(X_knn_without_precio)
-        
-        knn_model = NearestNeighbors(n_neighbors=k, metric='cosine')
-        knn_model.fit(X_knn_transformed)
-        
-        return {
-            'knn_model': knn_model,
-            'preprocessor': preprocessor,
-            'precio_column': precio_column,
-            'X_knn_columns': X_knn_without_precio.columns,
-            'numeric_features': numeric_features,
-            'categorical_features': categorical_features
-        }
+if model_data is not None:
     
-    with st.spinner("Building recommendation model..."):
-        model_data = build_recommendation_model()
+    # Same options and defaults as the price page; the recommender takes the raw
+    # column values, e.g. input_data['tipo'] = 'Laptop'
+    schema = get_feature_schema()
+    # Rendering the inputs below and collecting them into the query
+    input_assembly = start_span(PAGE, "input_assembly")
     
-    input_data = {}
+    def schema_selectbox(label, options, default, key):
+        return st.selectbox(label, options=options, index=options.index(default), key=key, label_visibility="collapsed")
     
-    col1, col2 = st.columns([3, 2])
+    # The query lives in the session and every input section below is a
+    # fragment: changing a widget reruns only its section, which rewrites only
+    # its own keys, instead of rerunning the whole two-column form
+    if 'knn_input' not in st.session_state:
+        st.session_state.knn_input = {}
+    input_data = st.session_state.knn_input
     
-    with col1:
+    @st.fragment
+    @instrument_fragment(PAGE)
+    def device_section():
         st.markdown("<div class='section-header'>Device Type</div>", unsafe_allow_html=True)
         
         st.write("Select type of device")
-        form_factors = ["Desktop", "Laptop"]
-        selected_form = st.selectbox("", options=form_factors, key="form_factor")
-        
-        for form in form_factors:
-            col_name = f"tipo_{form}"
-            input_data[col_name] = 1 if form == selected_form else 0
+        tipo = schema.groups["tipo"]
+        input_data['tipo'] = schema_selectbox("Select type of device", tipo.values(), tipo.default, "form_factor")
         
 
         st.write("Select product type")
-        product_types = ["Barebone", "Chromebook", "Kit ampliación PC", "Mini PC", "Netbook", 
-                        "PC completo", "PC de oficina", "PC gaming", "PC multimedia", 
-                        "Portátil 3D", "Portátil convertible", "Portátil gaming", 
-                        "Portátil multimedia", "Portátil profesional", "Thin Client", 
-                        "Ultrabook", "Workstation"]
-        
-        selected_product = st.selectbox("", options=product_types, key="product_type")
-        
-        for product_type in product_types:
-            col_name = f"tipo_producto_{product_type}"
-            input_data[col_name] = 1 if product_type == selected_product else 0
+        tipo_producto = schema.groups["tipo_producto"]
+        input_data['tipo_producto'] = schema_selectbox(
+            "Select product type", tipo_producto.values(), tipo_producto.default, "product_type"
+        )
         
 
+    @st.fragment
+    @instrument_fragment(PAGE)
+    def brand_section():
         st.markdown("<div class='section-header'>Brand</div>", unsafe_allow_html=True)
         st.write("Select Brand")
-        brands = ["Acer", "Apple", "ASUS", "Dell", "HP", "Lenovo", "MSI", "Samsung", "Toshiba", "Other"]
-        selected_brand = st.selectbox("", options=brands, key="brand")
-        input_data['company_name'] = selected_brand
+        brands = schema.label_for("company_name")
+        input_data['company_name'] = schema_selectbox("Select Brand", brands.values(), brands.default, "brand")
         
+    @st.fragment
+    @instrument_fragment(PAGE)
+    def ram_section():
         # ----- RAM -----
         st.markdown("<div class='section-header'>RAM</div>", unsafe_allow_html=True)
         
         # RAM Type
         st.write("Select type of RAM")
-        ram_types = ["DDR3", "DDR3L", "DDR4", "DDR4L", "DDR5", "LPDDR3", "LPDDR4", "LPDDR4X", "LPDDR5", "LPDDR5X"]
-        selected_ram_type = st.selectbox("", options=ram_types, key="ram_type")
-        
-        for ram_type in ram_types:
-            col_name = f"ram_tipo_ram_{ram_type}"
-            input_data[col_name] = 1 if ram_type == selected_ram_type else 0
+        ram_types = schema.groups["ram_tipo_ram"]
+        input_data['ram_tipo_ram'] = schema_selectbox("Select type of RAM", ram_types.values(), ram_types.default, "ram_type")
         
         # RAM Capacity
         st.write("RAM capacity (GB)")
         ram_options = [2, 4, 8, 16, 32, 64, 128]
-        ram_memory = st.selectbox("", options=ram_options, index=3, key="ram_capacity")
+        ram_memory = st.selectbox("RAM capacity (GB)", options=ram_options, index=3, key="ram_capacity", label_visibility="collapsed")
         input_data['ram_memoria_ram_GB'] = ram_memory
         
         # RAM Frequency
         st.write("RAM Frequency (MHz)")
         ram_freq_options = [1600, 2133, 2400, 2666, 3000, 3200, 3600, 4000, 4800, 5200]
-        ram_frequency = st.selectbox("", options=ram_freq_options, index=5, key="ram_frequency")
+        ram_frequency = st.selectbox("RAM Frequency (MHz)", options=ram_freq_options, index=5, key="ram_frequency", label_visibility="collapsed")
         input_data['ram_frecuencia_memoria_MHz'] = ram_frequency
         
+    @st.fragment
+    @instrument_fragment(PAGE)
+    def processor_section():
         # ----- PROCESSOR -----
         st.markdown("<div class='section-header'>Processor</div>", unsafe_allow_html=True)
         
         # Processor Brand
         st.write("Select Processor Brand")
         processor_brands = ["Intel", "AMD", "Apple", "Qualcomm", "MediaTek", "Other"]
-        selected_processor_brand = st.selectbox("", options=processor_brands, key="processor_brand")
+        selected_processor_brand = st.selectbox("Select Processor Brand", options=processor_brands, key="processor_brand", label_visibility="collapsed")
         
         # Processor cores
         st.write("Processor Cores")
         processor_cores_options = [2, 4, 6, 8, 10, 12, 16, 24, 32]
-        processor_cores = st.selectbox("", options=processor_cores_options, index=2, key="processor_cores")
+        processor_cores = st.selectbox("Processor Cores", options=processor_cores_options, index=2, key="processor_cores", label_visibility="collapsed")
         input_data['procesador_número_núcleos_procesador_cores'] = processor_cores
         
         # Processor threads
         st.write("Processor Threads")
         processor_threads_options = [2, 4, 8, 12, 16, 24, 32, 64]
-        processor_threads = st.selectbox("", options=processor_threads_options, index=2, key="processor_threads")
+        processor_threads = st.selectbox("Processor Threads", options=processor_threads_options, index=2, key="processor_threads", label_visibility="collapsed")
         input_data['procesador_número_hilos_ejecución'] = processor_threads
         
         # Processor frequency
         st.write("Base Frequency (GHz)")
         processor_frequency_options = [1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0, 4.5, 5.0]
-        processor_frequency = st.selectbox("", options=processor_frequency_options, index=3, key="processor_frequency")
+        processor_frequency = st.selectbox("Base Frequency (GHz)", options=processor_frequency_options, index=3, key="processor_frequency", label_visibility="collapsed")
         input_data['procesador_frecuencia_reloj'] = processor_frequency
         
         # Processor turbo frequency
         st.write("Turbo Frequency (GHz)")
         processor_turbo_options = [2.0, 2.5, 3.0, 3.5, 4.0, 4.5, 5.0, 5.5, 6.0]
-        processor_turbo = st.selectbox("", options=processor_turbo_options, index=3, key="processor_turbo")
+        processor_turbo = st.selectbox("Turbo Frequency (GHz)", options=processor_turbo_options, index=3, key="processor_turbo", label_visibility="collapsed")
         input_data['procesador_frecuencia_turbo_máx__GHz'] = processor_turbo
         
+    @st.fragment
+    @instrument_fragment(PAGE)
+    def storage_section():
         # ----- STORAGE -----
         st.markdown("<div class='section-header'>Storage</div>", unsafe_allow_html=True)
         
         # Storage type
         st.write("Select Storage Type")
-        storage_types = ["PCIe SSD", "SATA", "SSD", "disco duro HDD", "disco duro M.2 SSD", 
-                        "disco duro SSD", "disco híbrido (HHD)", "memoria flash", "sin disco duro"]
-        selected_storage = st.selectbox("", options=storage_types, key="storage_type")
-        
-        # Set the one-hot encoded storage type
-        for storage_type in storage_types:
-            col_name = f"disco_duro_tipo_disco_duro_{storage_type}"
-            input_data[col_name] = 1 if storage_type == selected_storage else 0
+        storage_types = schema.groups["disco_duro_tipo_disco_duro"]
+        input_data['disco_duro_tipo_disco_duro'] = schema_selectbox(
+            "Select Storage Type", storage_types.values(), storage_types.default, "storage_type"
+        )
         
         # Storage capacity
         st.write("Storage Capacity (GB)")
         storage_capacity_options = [128, 256, 512, 1024, 2048, 4096]
-        storage_capacity = st.selectbox("", options=storage_capacity_options, index=2, key="storage_capacity")
+        storage_capacity = st.selectbox("Storage Capacity (GB)", options=storage_capacity_options, index=2, key="storage_capacity", label_visibility="collapsed")
         input_data['disco_duro_capacidad_memoria_ssd_GB'] = storage_capacity
         
         # Number of disks
         st.write("Number of Disks")
-        num_disks = st.selectbox("", options=[1, 2, 3, 4], key="num_disks")
+        num_disks = st.selectbox("Number of Disks", options=[1, 2, 3, 4], key="num_disks", label_visibility="collapsed")
         input_data['disco_duro_número_discos_duros_instalados'] = num_disks
     
-    with col2:
+    @st.fragment
+    @instrument_fragment(PAGE)
+    def display_section():
         # ----- DISPLAY -----
         st.markdown("<div class='section-header'>Display</div>", unsafe_allow_html=True)
         
         # Screen size
         st.write("Screen Size (inches)")
         screen_size_options = [10.1, 11.6, 12.5, 13.3, 14.0, 15.6, 16.0, 17.3, 18.4]
-        screen_size = st.selectbox("", options=screen_size_options, index=5, key="screen_size")
+        screen_size = st.selectbox("Screen Size (inches)", options=screen_size_options, index=5, key="screen_size", label_visibility="collapsed")
         input_data['pantalla_tamaño_pantalla_pulgadas'] = screen_size
         
         # Screen brightness
         st.write("Screen Brightness (cd/m²)")
         screen_brightness_options = [200, 250, 300, 350, 400, 450, 500, 600, 800]
-        screen_brightness = st.selectbox("", options=screen_brightness_options, index=2, key="screen_brightness")
+        screen_brightness = st.selectbox("Screen Brightness (cd/m²)", options=screen_brightness_options, index=2, key="screen_brightness", label_visibility="collapsed")
         input_data['pantalla_luminosidad_cd_m2'] = screen_brightness
         
+    @st.fragment
+    @instrument_fragment(PAGE)
+    def graphics_section():
         # ----- GRAPHICS -----
         st.markdown("<div class='section-header'>Graphics</div>", unsafe_allow_html=True)
         
         # Graphics Brand
-        st.write("Select Graphics Brand")
-        graphics_brands = ["NVIDIA", "AMD", "Intel", "Apple", "Integrated", "Other"]
-        selected_graphics_brand = st.selectbox("", options=graphics_brands, key="graphics_brand")
+        st.write("Select Graphics Card")
+        graphics_cards = schema.label_for("gráfica_tarjeta_gráfica")
+        input_data['gráfica_tarjeta_gráfica'] = schema_selectbox(
+            "Select Graphics Card", graphics_cards.values(), graphics_cards.default, "graphics_brand"
+        )
         
         # Graphics memory
         st.write("Graphics Memory (GB)")
         graphics_memory_options = [0, 1, 2, 4, 6, 8, 12, 16, 24]
-        graphics_memory = st.selectbox("", options=graphics_memory_options, index=3, key="graphics_memory")
+        graphics_memory = st.selectbox("Graphics Memory (GB)", options=graphics_memory_options, index=3, key="graphics_memory", label_visibility="collapsed")
         input_data['gráfica_memoria_gráfica'] = graphics_memory
         
+    @st.fragment
+    @instrument_fragment(PAGE)
+    def os_section():
         # ----- OPERATING SYSTEM -----
         st.markdown("<div class='section-header'>Operating System</div>", unsafe_allow_html=True)
         
         # OS selection
         st.write("Select Operating System")
-        os_types = ["DOS", "No OS", "Other OS", "Windows", "macOS"]
-        selected_os = st.selectbox("", options=os_types, index=3, key="os_type")
+        os_types = schema.groups["sistema_operativo_sistema_operativo"]
+        selected_os = schema_selectbox("Select Operating System", os_types.values(), os_types.default, "os_type")
         
-        # Set the one-hot encoded OS type
-        for os_type in os_types:
-            col_name = f"os_{os_type}"
-            input_data[col_name] = 1 if os_type == selected_os else 0
+        # The catalog keeps free-text OS names rather than these groups, so the
+        # choice is recorded with the feedback but not used by the search
+        for os_type in os_types.values():
+            input_data[os_types.feature(os_type)] = 1 if os_type == selected_os else 0
         
+    @st.fragment
+    @instrument_fragment(PAGE)
+    def color_section():
         # ----- COLOR -----
         st.markdown("<div class='section-header'>Color</div>", unsafe_allow_html=True)
         st.write("Select Color")
-        colors = ["azul", "blanco", "bronce", "dorado", "gris", "negro", "plateado", "rojo", "rosa", "verde"]
-        selected_color = st.selectbox("", options=colors, index=5, key="color")
-        
-        # Set the one-hot encoded color
-        for color in colors:
-            col_name = f"color_{color}"
-            input_data[col_name] = 1 if color == selected_color else 0
+        colors = schema.groups["color"]
+        input_data['color'] = schema_selectbox("Select Color", colors.values(), colors.default, "color")
         
+    @st.fragment
+    @instrument_fragment(PAGE)
+    def battery_section():
         # ----- BATTERY -----
         st.markdown("<div class='section-header'>Battery</div>", unsafe_allow_html=True)
         
         # Battery life
         st.write("Battery Life (hours)")
         battery_life_options = [2, 4, 6, 8, 10, 12, 15, 18, 24]
-        battery_life = st.selectbox("", options=battery_life_options, index=3, key="battery_life")
+        battery_life = st.selectbox("Battery Life (hours)", options=battery_life_options, index=3, key="battery_life", label_visibility="collapsed")
         input_data['alimentación_autonomía_batería_h'] = battery_life
         
         # Battery capacity
         st.write("Battery Capacity (Wh)")
         battery_capacity_options = [30, 40, 50, 60, 70, 80, 90, 100]
-        battery_capacity = st.selectbox("", options=battery_capacity_options, index=2, key="battery_capacity")
+        battery_capacity = st.selectbox("Battery Capacity (Wh)", options=battery_capacity_options, index=2, key="battery_capacity", label_visibility="collapsed")
         input_data['alimentación_vatios_hora_Wh'] = battery_capacity
         
+    @st.fragment
+    @instrument_fragment(PAGE)
+    def connectivity_section():
         # ----- CONNECTIVITY -----
         st.markdown("<div class='section-header'>Connectivity</div>", unsafe_allow_html=True)
         
         # Connectivity options
         st.write("Select Connectivity Options")
-        connectivity_options = ["Bluetooth", "Ethernet", "LAN", "NFC", "infrarrojos", "wifi", "wifi Direct"]
+        connectivity_options = schema.flags["connectivity"]
         selected_connectivity = st.multiselect(
-            "",
+            "Select Connectivity Options",
             options=connectivity_options,
             default=["Bluetooth", "wifi"],
-            key="connectivity"
+            key="connectivity",
+            label_visibility="collapsed"
         )
         
         # Set the connectivity options
         for option in connectivity_options:
             input_data[option] = 1 if option in selected_connectivity else 0
     
+    col1, col2 = st.columns([3, 2])
+    
+    with col1:
+        device_section()
+        brand_section()
+        ram_section()
+        processor_section()
+        storage_section()
+    
+    with col2:
+        display_section()
+        graphics_section()
+        os_section()
+        color_section()
+        battery_section()
+        connectivity_section()
+    
     # Set defaults for other required fields if not already set
     
     # Add processor cache
@@ -421,49 +389,29 @@ if X_train is not None and y_train is not None and titulos is not None:
         input_data['procesador_caché_MB'] = 8
     
     # Add missing equipment features
-    equipment_features = [
-        "Force Touch Trackpad", "ScreenPad", "Touch Bar", "Touch ID", 
-        "Touchpad multitáctil", "TrackPoint / TouchStick / Pointing Stick", 
-        "USB-C", "altavoces estéreo", "altavoces estéreo JBL", 
-        "altavoz integrado", "con iluminación", "conector de seguridad Kensington", 
-        "disco duro SSD", "lector de tarjetas", "lector de tarjetas inteligentes", 
-        "micrófono integrado", "refrigeración líquida", "webcam"
-    ]
-    
     # Set default equipment features
-    for feature in equipment_features:
-        col_name = f"equip_{feature}"
+    default_equipment = ["equip_USB-C", "equip_webcam", "equip_altavoces estéreo", "equip_micrófono integrado"]
+    for col_name in schema.flags["equipment"]:
         if col_name not in input_data:
-            input_data[col_name] = 1 if feature in ["USB-C", "webcam", "altavoces estéreo", "micrófono integrado"] else 0
+            input_data[col_name] = 1 if col_name in default_equipment else 0
     
-    # Add graphics outputs
-    graphics_outputs = ["DVI", "DisplayPort", "HDMI", "HDMI 1.4", "HDMI 2.0", "HDMI 2.1", 
-                        "Micro HDMI", "Mini DisplayPort", "Mini HDMI", "Thunderbolt 3",
-                        "Thunderbolt 4", "USB-C", "VGA"]
-    
-    for output in graphics_outputs:
-        col_name = f"gráfica_salida_vídeo_{output}"
-        if col_name not in input_data:
-            input_data[col_name] = 1 if output == "HDMI" else 0
+    # Add graphics output
+    if 'gráfica_salida_vídeo' not in input_data:
+        input_data['gráfica_salida_vídeo'] = "HDMI"
+
+    input_assembly.stop()
     
 def predict_and_recommend(user_input):
         try:
-            # Create DataFrame from user input
-            user_df = pd.DataFrame([user_input])
+            # Apply preprocessing, leaving columns the user did not set missing
+            # (builds the one-row DataFrame and runs the fitted preprocessor)
+            with span(PAGE, "encode"):
+                user_transformed = transform_queries(model_data, [user_input])
             
-            # Make sure all columns match the training data
-            for col in model_data['X_knn_columns']:
-                if col not in user_df.columns:
-                    user_df[col] = np.nan
-            
-            # Keep only the columns used in training
-            user_df = user_df[model_data['X_knn_columns']]
-            
-            # Apply preprocessing
-            user_transformed = model_data['preprocessor'].transform(user_df)
-            
-            # Use KNN to find similar laptops
-            distances, indices = model_data['knn_model'].kneighbors(user_transformed, n_neighbors=5)
+            # One matrix product against the pre-normalized catalog finds the similar laptops
+            with span(PAGE, "search"):
+                distances, indices = model_data['search_engine'].search(user_transformed, k=5)
+            count(PAGE, "recommendation")
             
             # Calculate mean distance for scaling
             mean_dist = np.mean(distances)
@@ -471,8 +419,8 @@ def predict_and_recommend(user_input):
             # Prepare results
             results = []
             for i, (distance, idx) in enumerate(zip(distances[0], indices[0])):
-                title = titulos.iloc[idx]['título'] if 'título' in titulos.columns else f"Laptop {idx}"
-                price = model_data['precio_column'].iloc[idx]
+                title = str(model_data['titles'][idx])
+                price = model_data['precio_column'][idx]
                 
                 # Better similarity calculation that won't approach zero too quickly
                 similarity = np.exp(-distance/max(mean_dist, 1.0))
@@ -505,11 +453,14 @@ def handle_submit():
             st.session_state.feedback_error = False
             st.session_state.feedback_submitted = True
         
-    # Button to predict
-predict_button = st.button("Find Similar Laptops", type="primary", use_container_width=True)
+@st.fragment
+@instrument_fragment(PAGE)
+def recommendation_panel():
+    # Finding laptops reruns only this panel: the inputs are already in the session query
+    predict_button = st.button("Find Similar Laptops", type="primary", use_container_width=True)
     
     # When button is clicked
-if predict_button:
+    if predict_button:
         # Store the current input data
         st.session_state.last_input_data = input_data.copy()
         
@@ -536,8 +487,13 @@ if predict_button:
                         st.write(f"Similarity: {rec['similarity']:.2f}")
                         st.divider()
     
-    # Always show feedback if we have recommendations
-if st.session_state.recommendations:
+    feedback_panel()
+
+@st.fragment
+@instrument_fragment(PAGE)
+def feedback_panel():
+    # Its own fragment: rating, commenting and submitting rerun only this panel
+    if st.session_state.recommendations:
         # Add feedback section
         st.markdown("<div class='section-header'>Feedback</div>", unsafe_allow_html=True)
         
@@ -583,3 +539,11 @@ if st.session_state.recommendations:
                 
                 # Submit button using the callback
                 st.button("Submit Feedback", on_click=handle_submit)
+
+recommendation_panel()
+
+# Load the other models in the background once this page is on screen, in case
+# the session started here rather than on Home
+start_background_warm_up()
+script_run.stop()
+finish_profiling(profiler)
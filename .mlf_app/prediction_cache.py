@@ -0,0 +1,141 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from model_registry import DEFAULT_MODEL_PATH, get_model, model_version, reload_if_changed
+
+
+class PredictionCache:
+    """
+    Bounded LRU cache of predicted prices keyed on the exact feature vector.
+
+    Most page inputs are selectboxes and steppers, so many sessions submit the
+    same configuration; those rows are answered without calling XGBoost.
+
+    Parameters:
+    - max_entries: Least recently used entries are evicted beyond this size
+    - ttl_seconds: Entries older than this are treated as misses (None disables)
+    """
+
+    def __init__(self, max_entries=10000, ttl_seconds=3600.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    @staticmethod
+    def key(row):
+        """Stable digest of one float32 feature row in model column order."""
+        return hashlib.blake2b(np.ascontiguousarray(row, dtype=np.float32).tobytes(), digest_size=16).digest()
+
+    def _check_version(self, version):
+        if version != self._version:
+            if self._entries:
+                self._stats["invalidations"] += 1
+            self._entries.clear()
+            self._version = version
+
+    def _lookup(self, key, now):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        price, stored_at = entry
+        if self.ttl_seconds is not None and now - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            self._stats["expirations"] += 1
+            return None
+        self._entries.move_to_end(key)
+        return price
+
+    def _store(self, key, price, now):
+        self._entries[key] = (price, now)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def predict(self, model, matrix, version=None):
+        """
+        Prices (np.expm1 of the model output) for every row of `matrix`.
+        Only the rows that miss the cache are sent to `model.predict`, in one call.
+
+        Parameters:
+        - model: Fitted regressor trained on log1p(price)
+        - matrix: (n_rows, n_features) array in model column order
+        - version: Identifier of the model; a new value clears the cache
+        """
+        matrix = np.asarray(matrix, dtype=np.float32)
+        keys = [self.key(row) for row in matrix]
+        prices = np.empty(len(keys), dtype=np.float64)
+        # Rows that miss, grouped by key so duplicates in one batch are predicted once.
+        missing = OrderedDict()
+        now = time.monotonic()
+        with self._lock:
+            self._check_version(version)
+            for i, key in enumerate(keys):
+                price = self._lookup(key, now) if key not in missing else None
+                if price is None:
+                    missing.setdefault(key, []).append(i)
+                else:
+                    prices[i] = price
+            n_missing = sum(len(rows) for rows in missing.values())
+            self._stats["hits"] += len(keys) - n_missing
+            self._stats["misses"] += n_missing
+
+        if missing:
+            first_rows = [rows[0] for rows in missing.values()]
+            predicted = np.expm1(model.predict(matrix[first_rows]))
+            for rows, price in zip(missing.values(), predicted):
+                prices[rows] = price
+            with self._lock:
+                if version == self._version:
+                    for key, price in zip(missing.keys(), predicted):
+                        self._store(key, float(price), now)
+        return prices
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._stats["invalidations"] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["max_entries"] = self.max_entries
+        stats["ttl_seconds"] = self.ttl_seconds
+        return stats
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_prediction_cache(path=DEFAULT_MODEL_PATH):
+    """Process-wide cache for the model at `path`, shared by every session and the HTTP service."""
+    cache = _caches.get(path)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.setdefault(path, PredictionCache())
+    return cache
+
+
+def predict_prices(matrix, path=DEFAULT_MODEL_PATH):
+    """
+    Predict prices for `matrix` with the model at `path`, going through the shared cache.
+    A changed artifact on disk is reloaded and invalidates the cached prices.
+    """
+    reload_if_changed(path)
+    return get_prediction_cache(path).predict(get_model(path), matrix, version=model_version(path))
+
+
+def cache_stats():
+    """Statistics of every prediction cache in this process, keyed by model path."""
+    return {path: cache.stats() for path, cache in list(_caches.items())}
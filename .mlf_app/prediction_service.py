@@ -0,0 +1,241 @@
+"""
+Headless HTTP/JSON price prediction service.
+
+Run from the repository root:
+
+    python .mlf_app/prediction_service.py --port 8000 --max-batch-size 64 --max-wait-ms 5
+
+POST /predict with either a single feature dict (same keys as `input_data` in
+PricePredictor.py) or {"instances": [dict, ...]}. Missing features default to 0,
+exactly like the page does. Concurrent requests are coalesced into one
+`model.predict` call so the per-call XGBoost overhead is paid once per batch,
+and rows already in the prediction cache skip the model entirely.
+GET /health returns model, batching and cache statistics; GET /metrics returns
+the model, cache and feedback statistics in the Prometheus text format.
+"""
+import argparse
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+import metrics
+from feature_layout import FeatureLayout
+from model_registry import DEFAULT_MODEL_PATH, get_feature_names, model_stats, warm_up
+from prediction_cache import get_prediction_cache, predict_prices
+
+
+class MicroBatcher:
+    """
+    Collects rows submitted from many threads and predicts them together.
+
+    Parameters:
+    - predict_fn: Maps a float32 matrix to an array of prices, one per row
+    - feature_names: Column order expected by the model
+    - max_batch_size: Upper bound on rows per predict call
+    - max_wait_ms: How long the first queued request waits for company
+    """
+
+    def __init__(self, predict_fn, feature_names, max_batch_size=64, max_wait_ms=5.0):
+        self.predict_fn = predict_fn
+        self.layout = FeatureLayout(feature_names)
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.stats = {"requests": 0, "rows": 0, "batches": 0, "predict_seconds": 0.0}
+        self._queue = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._worker.start()
+
+    def rows_to_matrix(self, rows):
+        """Turn a list of feature dicts into a float32 matrix in model column order."""
+        matrix = self.layout.new_buffer(len(rows))
+        for r, row in enumerate(rows):
+            vector = self.layout.vector(matrix, r)
+            for name, value in row.items():
+                if name not in vector:
+                    raise KeyError(f"Unknown feature: {name}")
+                vector[name] = value
+        return matrix
+
+    def submit(self, rows):
+        """Queue `rows` for prediction and return a Future resolving to a list of prices."""
+        future = Future()
+        self._queue.put((self.rows_to_matrix(rows), future))
+        return future
+
+    def predict(self, rows, timeout=30.0):
+        """Blocking convenience wrapper around submit()."""
+        return self.submit(rows).result(timeout=timeout)
+
+    def close(self):
+        self._queue.put(None)
+        self._worker.join()
+
+    def _collect(self, first):
+        batch = [first]
+        n_rows = first[0].shape[0]
+        deadline = time.monotonic() + self.max_wait
+        while n_rows < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                # Re-queue the sentinel so the main loop sees it after this batch.
+                self._queue.put(None)
+                break
+            batch.append(item)
+            n_rows += item[0].shape[0]
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = self._collect(first)
+            try:
+                start = time.perf_counter()
+                prices = self.predict_fn(np.vstack([matrix for matrix, _ in batch]))
+                elapsed = time.perf_counter() - start
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            offset = 0
+            for matrix, future in batch:
+                n = matrix.shape[0]
+                future.set_result([float(p) for p in prices[offset:offset + n]])
+                offset += n
+
+            with self._stats_lock:
+                self.stats["requests"] += len(batch)
+                self.stats["rows"] += offset
+                self.stats["batches"] += 1
+                self.stats["predict_seconds"] += elapsed
+
+    def snapshot(self):
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats["mean_batch_rows"] = stats["rows"] / stats["batches"] if stats["batches"] else 0.0
+        stats["max_batch_size"] = self.max_batch_size
+        stats["max_wait_ms"] = self.max_wait * 1000.0
+        return stats
+
+
+def request_rows(payload):
+    """
+    The feature dicts of a /predict body, and whether it was a single row.
+    Raises ValueError unless it is a feature dict or {"instances": [dict, ...]}
+    with at least one row.
+    """
+    if not isinstance(payload, dict):
+        raise ValueError('Expected a JSON object: a feature dict or {"instances": [dict, ...]}')
+    if "instances" not in payload:
+        return [payload], True
+    rows = payload["instances"]
+    if not isinstance(rows, list) or not rows:
+        raise ValueError('"instances" must be a non-empty list of feature dicts')
+    if not all(isinstance(row, dict) for row in rows):
+        raise ValueError('Every entry of "instances" must be a feature dict')
+    return rows, False
+
+
+class PredictionServer(ThreadingHTTPServer):
+    # The socketserver default backlog of 5 resets connections under bursts,
+    # which is exactly the traffic pattern batching is meant for.
+    request_queue_size = 256
+    daemon_threads = True
+
+
+def make_handler(batcher, model_path=DEFAULT_MODEL_PATH):
+    class PredictionHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/metrics":
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+            if self.path != "/health":
+                self._send_json(404, {"error": "Not found"})
+                return
+            self._send_json(200, {
+                "status": "ok",
+                "models": model_stats(),
+                "batching": batcher.snapshot(),
+                "cache": get_prediction_cache(model_path).stats(),
+            })
+
+        def do_POST(self):
+            if self.path != "/predict":
+                self._send_json(404, {"error": "Not found"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                rows, single = request_rows(payload)
+                prices = batcher.predict(rows)
+            except (ValueError, KeyError, TypeError) as e:
+                self._send_json(400, {"error": str(e)})
+                return
+            except Exception as e:
+                self._send_json(500, {"error": str(e)})
+                return
+            self._send_json(200, {"price": prices[0]} if single else {"prices": prices})
+
+        def log_message(self, format, *args):
+            # Per-request access logs would dominate the cost of a single prediction.
+            pass
+
+    return PredictionHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve price predictions over HTTP with request micro-batching.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    warm_up((args.model,))
+    batcher = MicroBatcher(
+        lambda matrix: predict_prices(matrix, args.model),
+        get_feature_names(args.model),
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+    )
+    server = PredictionServer((args.host, args.port), make_handler(batcher, args.model))
+    print(f"Serving predictions on http://{args.host}:{args.port}/predict")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        batcher.close()
+
+
+if __name__ == "__main__":
+    main()
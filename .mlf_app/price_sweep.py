@@ -0,0 +1,112 @@
+"""
+What-if price sweeps: the current configuration with one or two numeric specs
+varied over a range, e.g. the price at every 4 GB of RAM from 8 to 64 GB.
+
+All the variants are built as one matrix from the configuration's model row
+and predicted in a single booster call. The configuration itself is predicted
+in the same call, so every variant can be shown as a difference from it.
+
+Sweeps go to the model directly, not through the shared prediction cache: a
+grid of a few thousand one-off variants would otherwise evict the
+configurations that sessions actually submit.
+"""
+import math
+import os
+import time
+
+import numpy as np
+
+from model_registry import DEFAULT_MODEL_PATH, get_model, reload_if_changed
+
+MAX_SWEEP_POINTS = 200
+# Cells of a two-spec grid; the sweep is refused beyond this
+MAX_GRID_CELLS = int(os.environ.get("MLF_SWEEP_MAX_CELLS", 10000))
+# Decimals non-integer specs are swept and shown at
+SWEEP_DECIMALS = 2
+
+
+def sweep_values(spec, start, stop, step, current=None):
+    """
+    Values of one numeric feature from `start` to `stop` (both included) every `step`.
+
+    Parameters:
+    - spec: The feature's entry of FeatureSchema.numeric; values are rounded to whole
+      numbers for integer features and to SWEEP_DECIMALS otherwise, so no two look the same
+    - start, stop: Ends of the range
+    - step: Distance between values; at most MAX_SWEEP_POINTS values are accepted
+    - current: Also include this value, so the curve passes through the current configuration
+    """
+    if step <= 0:
+        raise ValueError("The step must be positive")
+    low, high = min(start, stop), max(start, stop)
+    n_points = int(math.floor((high - low) / step + 1e-9)) + 1
+    if n_points > MAX_SWEEP_POINTS:
+        raise ValueError(f"{n_points:,} values exceed the limit of {MAX_SWEEP_POINTS} per spec; use a larger step")
+    values = low + step * np.arange(n_points)
+    if values[-1] < high:
+        values = np.append(values, high)
+    decimals = 0 if spec["integer"] else SWEEP_DECIMALS
+    values = np.unique(np.round(values, decimals))
+    if current is not None and low <= current <= high:
+        # Kept exact, in place of a grid value that would be shown the same
+        values = np.append(values[values != np.round(current, decimals)], current)
+    return np.unique(values.astype(np.float32))
+
+
+def variant_matrix(row, columns, values):
+    """
+    One copy of `row` per combination of `values`, with `columns` set to it.
+
+    Parameters:
+    - row: (1, n_features) model row of the current configuration
+    - columns: Column indices of the swept features
+    - values: One array of values per column
+
+    Returns (matrix, grid): the (n_variants, n_features) float32 matrix and the
+    (n_variants, len(columns)) swept values of each of its rows.
+    """
+    grid = np.stack(np.meshgrid(*values, indexing="ij"), axis=-1).reshape(-1, len(columns))
+    matrix = np.repeat(np.asarray(row, dtype=np.float32), len(grid), axis=0)
+    matrix[:, columns] = grid
+    return matrix, grid
+
+
+def sweep_prices(vector, values_by_feature, max_cells=MAX_GRID_CELLS, path=DEFAULT_MODEL_PATH):
+    """
+    Prices of every variant of a configuration, predicted in one call.
+
+    Parameters:
+    - vector: FeatureVector of the current configuration
+    - values_by_feature: {feature: values}, one or two numeric features
+    - max_cells: Largest number of variants accepted
+
+    Returns (table, current_price, timings): a DataFrame with one column per
+    swept feature plus "price" and "difference" (to the current configuration),
+    the current configuration's price, and {"build_ms", "predict_ms"}.
+    """
+    import pandas as pd
+
+    features = list(values_by_feature)
+    n_cells = math.prod(len(values) for values in values_by_feature.values())
+    if n_cells > max_cells:
+        raise ValueError(f"{n_cells:,} variants exceed the limit of {max_cells:,}; narrow a range or use a larger step")
+
+    reload_if_changed(path)
+    model = get_model(path)
+
+    start = time.perf_counter()
+    columns = [vector.layout.index[feature] for feature in features]
+    variants, grid = variant_matrix(vector.matrix(), columns, list(values_by_feature.values()))
+    # The current configuration rides along as the last row of the same call
+    matrix = np.concatenate([variants, vector.matrix()])
+    built = time.perf_counter()
+
+    prices = np.expm1(model.predict(matrix))
+    predicted = time.perf_counter()
+
+    current_price = float(prices[-1])
+    table = pd.DataFrame(grid, columns=features)
+    table["price"] = prices[:-1]
+    table["difference"] = table["price"] - current_price
+    timings = {"build_ms": (built - start) * 1e3, "predict_ms": (predicted - built) * 1e3}
+    return table, current_price, timings
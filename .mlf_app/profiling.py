@@ -0,0 +1,174 @@
+"""
+On-demand cProfile capture of page reruns on a live server.
+
+Set MLF_ADMIN_TOKEN on the server and open a page with ?admin=<token>; the
+sidebar then shows a "Profile reruns" toggle (add &profile=1 to have it on
+from the first run). While it is on, every rerun of that session is profiled
+from start_profiling() to finish_profiling(), saved under artifacts/profiles/
+as <page>-<timestamp>.pstats, and its hottest functions are shown at the
+bottom of the page. Without the token nothing is rendered and nothing is
+profiled.
+
+st.fragment sections rerun on their own without the page script, so their
+bodies are decorated with instrument_fragment(): every run of a section is
+timed as its own metrics span, and a fragment-only rerun is profiled (saved
+as <page>-<section>-<timestamp>.pstats, shown inside the section) while the
+toggle is on.
+
+Inspect a saved profile from the repository root:
+
+    python -m pstats artifacts/profiles/price_predictor-20250101T120000.pstats
+    snakeviz artifacts/profiles/price_predictor-20250101T120000.pstats
+"""
+import cProfile
+import datetime
+import functools
+import hmac
+import os
+import pstats
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from metrics import span
+
+DEFAULT_PROFILE_DIR = os.path.join("artifacts", "profiles")
+_ACTIVE_KEY = "_active_profiler"
+
+
+def is_admin():
+    """True when the session's ?admin= query parameter matches MLF_ADMIN_TOKEN."""
+    token = os.environ.get("MLF_ADMIN_TOKEN")
+    supplied = st.query_params.get("admin")
+    return bool(token) and supplied is not None and hmac.compare_digest(supplied, token)
+
+
+def start_profiling(page):
+    """
+    Render the admin profiling controls and, when they are on, start profiling
+    this rerun. Call it at the top of the page script.
+
+    Parameters:
+    - page: Name used for the saved profile files, e.g. "price_predictor"
+
+    Returns the running profiler, or None when this rerun is not profiled.
+    """
+    # A rerun interrupted by a widget change never reached finish_profiling;
+    # its profiler would otherwise keep hooking this script thread
+    stale = st.session_state.pop(_ACTIVE_KEY, None)
+    if stale is not None:
+        stale[0].disable()
+
+    if not is_admin():
+        return None
+    st.sidebar.subheader("Profiling")
+    enabled = st.sidebar.toggle("Profile reruns", value=st.query_params.get("profile") == "1", key="profile_reruns")
+    st.sidebar.number_input("Functions shown", min_value=5, max_value=200, value=25, step=5, key="profile_top")
+    if not enabled:
+        return None
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as e:
+        # Another profiler (e.g. a debugger) is already active
+        st.sidebar.warning(f"Could not start the profiler: {e}")
+        return None
+    st.session_state[_ACTIVE_KEY] = (profiler, page)
+    return profiler
+
+
+def top_functions(stats, n=25, sort="cumulative"):
+    """
+    The `n` functions with the highest `sort` time ("cumulative" or "tottime").
+
+    Returns a list of dicts: function, calls, tottime_ms, cumtime_ms, percall_ms.
+    """
+    rows = []
+    for (filename, line, name), (primitive_calls, calls, tottime, cumtime, _) in stats.stats.items():
+        location = f"{os.path.basename(filename)}:{line}" if line else filename
+        rows.append({
+            "function": f"{name} ({location})",
+            "calls": calls,
+            "tottime_ms": tottime * 1e3,
+            "cumtime_ms": cumtime * 1e3,
+            "percall_ms": cumtime * 1e3 / calls if calls else 0.0,
+        })
+    key = "cumtime_ms" if sort == "cumulative" else "tottime_ms"
+    return sorted(rows, key=lambda row: -row[key])[:n]
+
+
+def finish_profiling(profiler, profile_dir=DEFAULT_PROFILE_DIR):
+    """
+    Stop `profiler` (from start_profiling), save it as a .pstats file and show
+    the hottest functions. Call it at the very end of the page script; does
+    nothing when `profiler` is None.
+    """
+    if profiler is None:
+        return None
+    profiler.disable()
+    _, page = st.session_state.pop(_ACTIVE_KEY, (None, "page"))
+
+    os.makedirs(profile_dir, exist_ok=True)
+    path = os.path.join(profile_dir, f"{page}-{datetime.datetime.now().strftime('%Y%m%dT%H%M%S%f')}.pstats")
+    stats = pstats.Stats(profiler)
+    stats.dump_stats(path)
+
+    top = st.session_state.get("profile_top", 25)
+    with st.expander(f"Profile of this rerun: {stats.total_tt * 1e3:.1f} ms", expanded=True):
+        st.caption(f"Saved to {path}")
+        by_cumulative, by_own = st.tabs(["By cumulative time", "By own time"])
+        with by_cumulative:
+            st.dataframe(top_functions(stats, top, "cumulative"), hide_index=True, use_container_width=True)
+        with by_own:
+            st.dataframe(top_functions(stats, top, "tottime"), hide_index=True, use_container_width=True)
+    return path
+
+
+def _is_fragment_rerun():
+    """True while Streamlit reruns only fragments, without the page script around them."""
+    ctx = get_script_run_ctx()
+    return bool(ctx is not None and ctx.fragment_ids_this_run)
+
+
+def instrument_fragment(page, stage=None):
+    """
+    Decorator for the body of an st.fragment (apply it below @st.fragment).
+
+    Every run of the section is timed as the `stage` span of `page` (default:
+    the function name). On a fragment-only rerun, which the page's own
+    start_profiling() never sees, the section is also profiled while the admin
+    toggle is on.
+
+    Parameters:
+    - page: Page the section belongs to, e.g. "price_predictor"
+    - stage: Span name (default: the decorated function's name)
+    """
+    def decorate(fn):
+        name = stage or fn.__name__
+
+        @functools.wraps(fn)
+        def run(*args, **kwargs):
+            profiler = None
+            if _is_fragment_rerun() and is_admin() and st.session_state.get("profile_reruns"):
+                profiler = cProfile.Profile()
+                try:
+                    profiler.enable()
+                    st.session_state[_ACTIVE_KEY] = (profiler, f"{page}-{name}")
+                except ValueError:
+                    profiler = None
+            try:
+                with span(page, name):
+                    result = fn(*args, **kwargs)
+            except BaseException:
+                # e.g. st.rerun() inside the section: keep the profile out of a run that is being replaced
+                if profiler is not None:
+                    profiler.disable()
+                    st.session_state.pop(_ACTIVE_KEY, None)
+                raise
+            finish_profiling(profiler)
+            return result
+
+        return run
+
+    return decorate
@@ -0,0 +1,224 @@
+"""
+Incremental retraining of the price model.
+
+Continues boosting the current model (xgb_best_model.joblib) on the training
+set merged with newly labelled listings, instead of retraining from scratch,
+with the `hist` tree method on all cores. The result is validated on
+X_test_final.csv / y_test.csv and written as a new versioned artifact under
+artifacts/models/ only when it beats the current model there.
+
+Labelled rows come from:
+- --listings/--prices: raw listings in the X_*_final.csv layout with a prices
+  file in the y_*.csv layout (price_avg column, same index);
+- price-page feedback that carries the actual price the user entered.
+
+Run it nightly from the repository root:
+
+    python .mlf_app/retrain.py --rounds 25 --learning-rate 0.05 --promote
+"""
+import argparse
+import datetime
+import glob
+import json
+import os
+import shutil
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+from data_cache import load_table
+from feature_layout import FeatureLayout
+from featurizer import featurize, load_raw
+from feedback_store import get_feedback_store
+from model_registry import DEFAULT_MODEL_PATH
+
+DEFAULT_OUTPUT_DIR = os.path.join("artifacts", "models")
+FEEDBACK_PAGE = "price_predictor"
+
+
+def load_labelled(listings_path, prices_path, feature_names):
+    """Model matrix and log1p(price) of a raw listings file and its prices (row-aligned)."""
+    X = featurize(load_table(listings_path, load_raw), feature_names)
+    y = np.log1p(load_table(prices_path)["price_avg"].to_numpy(dtype=np.float64))
+    return X, y
+
+
+def load_feedback_labels(store, feature_names, batch_size=10000):
+    """
+    Price-page feedback records that carry the actual price the user entered.
+
+    Returns (X, y, ids): the page inputs as model rows, log1p(actual price)
+    and the feedback row id of each.
+    """
+    layout = FeatureLayout(feature_names)
+    rows, prices, ids, last_id = [], [], [], 0
+    while True:
+        batch = store.since(last_id, batch_size)
+        for row_id, page, record in batch:
+            last_id = row_id
+            actual_price = record.get("actual_price")
+            if page != FEEDBACK_PAGE or not actual_price or actual_price <= 0:
+                continue
+            vector = layout.vector()
+            for name, value in (record.get("input_data") or {}).items():
+                if name in vector:
+                    vector[name] = value
+            rows.append(vector.buffer[0])
+            prices.append(actual_price)
+            ids.append(row_id)
+        if len(batch) < batch_size:
+            break
+    X = pd.DataFrame(np.vstack(rows) if rows else layout.new_buffer(0), columns=feature_names)
+    return X, np.log1p(np.asarray(prices, dtype=np.float64)), np.asarray(ids, dtype=np.int64)
+
+
+def log_rmse(model, X, y):
+    return float(np.sqrt(np.mean((model.predict(X) - y) ** 2)))
+
+
+def latest_manifest(output_dir):
+    manifests = sorted(glob.glob(os.path.join(output_dir, "xgb_model-*.json")))
+    if not manifests:
+        return None
+    with open(manifests[-1]) as f:
+        return json.load(f)
+
+
+def retrain(model_path=DEFAULT_MODEL_PATH, rounds=25, learning_rate=0.05, listings=None, prices=None,
+            output_dir=DEFAULT_OUTPUT_DIR, min_improvement=0.0, force=False):
+    """
+    Continue boosting the model at `model_path` and save it if it improves.
+
+    Parameters:
+    - model_path: Current model artifact, the starting point
+    - rounds: Boosting rounds added on top of the current trees
+    - learning_rate: Shrinkage of the added trees
+    - listings, prices: Optional newly labelled raw listings and their prices
+    - output_dir: Where versioned artifacts and their manifests are written
+    - min_improvement: Test log-RMSE decrease required to emit an artifact
+    - force: Train even when no new labelled rows are available
+
+    Returns a report dict (timings, row counts, test scores, artifact path or None).
+    """
+    wall_start = time.perf_counter()
+    base = joblib.load(model_path)
+    feature_names = list(base.get_booster().feature_names)
+
+    load_start = time.perf_counter()
+    X_train = featurize(load_table("X_train_final.csv", load_raw), feature_names)
+    y_train = np.log1p(load_table("y_train.csv")["price_avg"].to_numpy(dtype=np.float64))
+    X_test = featurize(load_table("X_test_final.csv", load_raw), feature_names)
+    y_test = np.log1p(load_table("y_test.csv")["price_avg"].to_numpy(dtype=np.float64))
+
+    # Every labelled feedback record is trained on; those past the last
+    # artifact's watermark are what makes a new run worthwhile
+    X_feedback, y_feedback, feedback_ids = load_feedback_labels(get_feedback_store(), feature_names)
+    previous = latest_manifest(output_dir)
+    watermark = previous.get("feedback_last_id", 0) if previous else 0
+    feedback_last_id = int(feedback_ids.max()) if len(feedback_ids) else watermark
+
+    X_parts, y_parts = [X_train, X_feedback], [y_train, y_feedback]
+    new_feedback_rows = int(np.count_nonzero(feedback_ids > watermark))
+    listing_rows = 0
+    if listings and prices:
+        X_new, y_new = load_labelled(listings, prices, feature_names)
+        X_parts.append(X_new)
+        y_parts.append(y_new)
+        listing_rows = len(X_new)
+    new_rows = new_feedback_rows + listing_rows
+    X = pd.concat(X_parts, ignore_index=True)
+    y = np.concatenate(y_parts)
+    load_seconds = time.perf_counter() - load_start
+
+    report = {
+        "base_model": model_path,
+        "base_rounds": base.get_booster().num_boosted_rounds(),
+        "training_rows": len(X),
+        "new_rows": new_rows,
+        "feedback_rows": len(X_feedback),
+        "new_feedback_rows": new_feedback_rows,
+        "listing_rows": listing_rows,
+        "load_seconds": load_seconds,
+        "artifact": None,
+    }
+    if new_rows == 0 and not force:
+        report["skipped"] = "no new labelled rows"
+        report["wall_seconds"] = time.perf_counter() - wall_start
+        return report
+
+    params = base.get_params()
+    params.update(n_estimators=rounds, learning_rate=learning_rate, tree_method="hist", n_jobs=os.cpu_count())
+    model = xgb.XGBRegressor(**params)
+    train_start = time.perf_counter()
+    model.fit(X, y, xgb_model=base.get_booster())
+    train_seconds = time.perf_counter() - train_start
+
+    base_rmse = log_rmse(base, X_test, y_test)
+    new_rmse = log_rmse(model, X_test, y_test)
+    report.update(
+        rounds=rounds,
+        learning_rate=learning_rate,
+        train_seconds=train_seconds,
+        rows_per_second=len(X) / train_seconds,
+        base_test_log_rmse=base_rmse,
+        test_log_rmse=new_rmse,
+        improved=base_rmse - new_rmse > min_improvement,
+    )
+
+    if report["improved"]:
+        version = datetime.datetime.now().strftime("%Y%m%dT%H%M%S")
+        os.makedirs(output_dir, exist_ok=True)
+        artifact = os.path.join(output_dir, f"xgb_model-{version}.joblib")
+        joblib.dump(model, artifact)
+        report.update(artifact=artifact, version=version, feedback_last_id=feedback_last_id,
+                      total_rounds=model.get_booster().num_boosted_rounds())
+    report["wall_seconds"] = time.perf_counter() - wall_start
+    if report["artifact"]:
+        with open(os.path.splitext(report["artifact"])[0] + ".json", "w") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+def promote(artifact, model_path=DEFAULT_MODEL_PATH):
+    """Atomically replace the served model; running apps pick it up via model_registry.reload_if_changed."""
+    tmp_path = f"{model_path}.tmp-{os.getpid()}"
+    shutil.copyfile(artifact, tmp_path)
+    os.replace(tmp_path, model_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Continue boosting the price model on newly labelled data.")
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH)
+    parser.add_argument("--rounds", type=int, default=25)
+    parser.add_argument("--learning-rate", type=float, default=0.05)
+    parser.add_argument("--listings", default=None, help="Newly labelled raw listings CSV")
+    parser.add_argument("--prices", default=None, help="Prices for --listings, in the y_*.csv layout")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument("--min-improvement", type=float, default=0.0, help="Required test log-RMSE decrease")
+    parser.add_argument("--force", action="store_true", help="Train even without new labelled rows")
+    parser.add_argument("--promote", action="store_true", help="Replace --model with the new artifact if it improved")
+    args = parser.parse_args()
+
+    report = retrain(args.model, args.rounds, args.learning_rate, args.listings, args.prices,
+                     args.output_dir, args.min_improvement, args.force)
+    if report.get("skipped"):
+        print(f"Skipped: {report['skipped']} ({report['wall_seconds']:.2f}s)")
+        return
+    print(f"{report['training_rows']:,} rows ({report['new_rows']:,} new: {report['new_feedback_rows']:,} from feedback, "
+          f"{report['listing_rows']:,} from --listings) x {report['rounds']} rounds in "
+          f"{report['train_seconds']:.2f}s ({report['rows_per_second']:,.0f} rows/s); wall {report['wall_seconds']:.2f}s")
+    print(f"Test log-RMSE {report['base_test_log_rmse']:.4f} -> {report['test_log_rmse']:.4f}")
+    if report["artifact"]:
+        print(f"Saved {report['artifact']}")
+        if args.promote:
+            promote(report["artifact"], args.model)
+            print(f"Promoted to {args.model}")
+    else:
+        print("No improvement; no artifact written")
+
+
+if __name__ == "__main__":
+    main()
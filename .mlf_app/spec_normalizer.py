@@ -0,0 +1,95 @@
+"""
+Cleaning stage for the raw spec strings used by the KNN recommender.
+
+The raw listings mix locales and units ("1.300\xa0MHz" next to "1,3\xa0GHz",
+"8.192 MB / 8 GB" next to "8192 MB") and store connectivity as a comma-joined
+list. One-hot encoding those strings gives a column per spelling; here they
+become numbers in one unit and one 0/1 column per connectivity option, using
+vectorized pandas string operations.
+
+Unlike featurizer.parse_frequency_ghz, which has to reproduce the parsing the
+price model was trained with, these parsers read the Spanish number format
+correctly ("." groups thousands, "," is the decimal separator).
+"""
+import numpy as np
+import pandas as pd
+
+from featurizer import CONNECTIVITY_COLUMN, CONNECTIVITY_FLAGS, FREQUENCY_GHZ_COLUMN, FREQUENCY_MIXED_COLUMN, load_raw
+
+GRAPHICS_MEMORY_COLUMN = "gráfica_memoria_gráfica"
+SHARED_GRAPHICS_MEMORY = "memoria compartida"
+
+
+def _parse_quantity(values, units):
+    """
+    First "<number> <unit>" of every string as (number, unit) arrays.
+    The number is read in the Spanish format: "1.300,5" -> 1300.5.
+    """
+    parts = values.astype("string").str.extract(rf"([\d.,]+)\s*({'|'.join(units)})")
+    number = parts[0].str.replace(".", "", regex=False).str.replace(",", ".", regex=False)
+    return pd.to_numeric(number, errors="coerce").to_numpy(dtype=np.float64), parts[1]
+
+
+def parse_clock_ghz(values):
+    """Vectorized "1.300 MHz" / "1,3 GHz" -> 1.3 (GHz); unparseable values become NaN."""
+    number, unit = _parse_quantity(values, ["MHz", "GHz"])
+    is_mhz = (unit == "MHz").fillna(False).to_numpy(dtype=bool)
+    return np.where(is_mhz, number / 1000.0, number)
+
+
+def parse_memory_gb(values):
+    """
+    Vectorized "8192 MB" / "8.192 MB / 8 GB" / "8 GB" -> 8.0 (GB). Graphics
+    that share system memory have no dedicated memory and map to 0.
+    """
+    number, unit = _parse_quantity(values, ["MB", "GB"])
+    is_mb = (unit == "MB").fillna(False).to_numpy(dtype=bool)
+    gb = np.where(is_mb, number / 1024.0, number)
+    shared = (values.astype("string") == SHARED_GRAPHICS_MEMORY).fillna(False).to_numpy(dtype=bool)
+    gb[shared] = 0.0
+    return gb
+
+
+def connectivity_flags(values):
+    """One float 0/1 column per known connectivity option from the comma-joined lists."""
+    dummies = values.astype("string").str.get_dummies(sep=", ")
+    return pd.DataFrame(
+        {flag: dummies[flag].to_numpy(dtype=np.float64) if flag in dummies.columns else 0.0 for flag in CONNECTIVITY_FLAGS},
+        index=values.index,
+    )
+
+
+def normalize_specs(df):
+    """
+    Return `df` with its unit strings parsed into numbers and the connectivity
+    list expanded into flag columns. Columns that are already numeric (such as
+    the page's query values, in GHz and GB) are left untouched, so the stage is
+    idempotent and safe to apply to both the catalog and queries.
+    """
+    df = df.copy()
+    parsers = {
+        FREQUENCY_MIXED_COLUMN: parse_clock_ghz,
+        FREQUENCY_GHZ_COLUMN: parse_clock_ghz,
+        GRAPHICS_MEMORY_COLUMN: parse_memory_gb,
+    }
+    for column, parse in parsers.items():
+        if column in df.columns and not pd.api.types.is_numeric_dtype(df[column]):
+            df[column] = parse(df[column])
+
+    if CONNECTIVITY_COLUMN in df.columns:
+        flags = connectivity_flags(df[CONNECTIVITY_COLUMN])
+        df = pd.concat([df.drop(columns=[CONNECTIVITY_COLUMN, *flags.columns], errors="ignore"), flags], axis=1)
+    return df
+
+
+def is_normalized(df):
+    """True when normalize_specs would leave `df` (a DataFrame or CompactCatalog) as it is."""
+    parsed = (FREQUENCY_MIXED_COLUMN, FREQUENCY_GHZ_COLUMN, GRAPHICS_MEMORY_COLUMN)
+    return CONNECTIVITY_COLUMN not in df.columns and all(
+        pd.api.types.is_numeric_dtype(df[column]) for column in parsed if column in df.columns
+    )
+
+
+def load_normalized(path):
+    """Raw listings CSV (see featurizer.load_raw) passed through normalize_specs."""
+    return normalize_specs(load_raw(path))
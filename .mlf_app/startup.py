@@ -0,0 +1,72 @@
+import threading
+import time
+
+# Loads whatever the pages need, in the order users usually open them. Imports
+# happen inside the tasks so importing this module stays cheap.
+
+
+def _warm_price_model():
+    from model_registry import warm_up
+    warm_up()
+
+
+def _warm_knn_index():
+    from knn_index import get_index
+    get_index()
+
+
+WARM_UP_TASKS = (
+    ("price_model", _warm_price_model),
+    ("knn_index", _warm_knn_index),
+)
+
+_thread = None
+_stats = {}
+_lock = threading.Lock()
+
+
+def _run(tasks):
+    for name, task in tasks:
+        start = time.perf_counter()
+        try:
+            task()
+            status = "ok"
+        except Exception as e:
+            # The page that needs it will load it itself and show the error
+            status = f"failed: {e}"
+        with _lock:
+            _stats[name] = {"seconds": time.perf_counter() - start, "status": status}
+
+
+def start_background_warm_up(tasks=WARM_UP_TASKS):
+    """
+    Load the models and indexes the pages use in a daemon thread, once per
+    server process. Call it at the end of a page script, after the page has
+    been rendered, so the first paint never waits for the heavy libraries.
+
+    Parameters:
+    - tasks: (name, function) pairs run one after the other
+
+    Returns the warm-up thread.
+    """
+    global _thread
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=_run, args=(tasks,), name="background-warm-up", daemon=True)
+            _thread.start()
+        return _thread
+
+
+def wait_for_warm_up(timeout=None):
+    """Block until the background warm-up (if started) has finished; returns True when it has."""
+    thread = _thread
+    if thread is None:
+        return False
+    thread.join(timeout)
+    return not thread.is_alive()
+
+
+def warm_up_stats():
+    """{task name: {"seconds", "status"}} of the warm-up tasks finished so far."""
+    with _lock:
+        return {name: dict(stats) for name, stats in _stats.items()}
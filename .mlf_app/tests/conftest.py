@@ -0,0 +1,24 @@
+"""
+The modules import each other by bare name, like the pages do, and read their
+data and artifacts relative to the repository root. Run from there:
+
+    python -m pytest -q
+"""
+import os
+import sys
+
+import pytest
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_ROOT = os.path.dirname(APP_DIR)
+
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def repo_root():
+    previous = os.getcwd()
+    os.chdir(REPO_ROOT)
+    yield REPO_ROOT
+    os.chdir(previous)
@@ -0,0 +1,33 @@
+import shutil
+
+import pandas as pd
+import pytest
+
+from batch_score import score_file
+from model_registry import get_model
+
+
+@pytest.fixture
+def listings(tmp_path):
+    path = tmp_path / "listings.csv"
+    shutil.copy("X_test_final.csv", path)
+    return str(path)
+
+
+def test_worker_threads_match_a_single_thread(listings, tmp_path):
+    single, threaded = str(tmp_path / "single.csv"), str(tmp_path / "threaded.csv")
+    n_jobs = get_model().n_jobs
+
+    report = score_file(listings, single, raw=True, jobs=1)
+    score_file(listings, threaded, raw=True, jobs=3, block_size=100, chunk_size=500)
+
+    assert report["rows"] == 1586
+    pd.testing.assert_frame_equal(pd.read_csv(single), pd.read_csv(threaded))
+    # The thread split goes on a private booster, not the shared model
+    assert get_model().n_jobs == n_jobs
+
+
+def test_refuses_to_overwrite_the_input(listings, tmp_path):
+    with pytest.raises(ValueError, match="overwrite the input"):
+        score_file(listings, str(tmp_path / "." / "listings.csv"), raw=True)
+    assert len(pd.read_csv(listings, usecols=[0])) == 1586
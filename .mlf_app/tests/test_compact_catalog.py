@@ -0,0 +1,60 @@
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from compact_catalog import CompactCatalog
+from featurizer import featurize, load_raw
+from knn_model import COLUMNS_TO_DROP, fit_recommendation_model, prepare_catalog
+from spec_normalizer import normalize_specs
+
+
+@pytest.fixture(scope="module")
+def raw():
+    return load_raw("X_train_final.csv")
+
+
+def test_featurize_reads_a_catalog_like_the_frame(raw):
+    pd.testing.assert_frame_equal(featurize(CompactCatalog.from_frame(raw)), featurize(raw))
+
+
+def test_catalog_holds_the_reported_memory_ratio(raw):
+    frame_bytes = raw.memory_usage(deep=True).sum()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        catalog = CompactCatalog.from_frame(raw)
+        held = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    # nbytes is what compact_catalog.py reports; it must account for what the catalog really holds
+    assert held <= 1.1 * catalog.nbytes
+    assert frame_bytes / catalog.nbytes >= 3.5
+
+
+def test_select_and_view_keep_the_values(raw):
+    catalog = CompactCatalog.from_frame(normalize_specs(raw))
+    columns = [c for c in catalog.columns if c not in COLUMNS_TO_DROP][::-1]
+    view = catalog.select(columns).view()
+    assert list(view.columns) == columns
+    pd.testing.assert_frame_equal(view, catalog.to_frame(columns))
+    numeric = catalog.numeric_names[0]
+    assert np.shares_memory(catalog.view([numeric])[numeric].to_numpy(), catalog.numeric)
+
+
+def test_knn_fit_from_a_catalog_matches_the_frame(raw):
+    normalized = normalize_specs(raw)
+    prices = pd.read_csv("y_train.csv", index_col=0)
+    from_frame = fit_recommendation_model(normalized, prices)
+    from_catalog = fit_recommendation_model(CompactCatalog.from_frame(normalized), prices)
+    assert list(from_catalog['X_knn_columns']) == list(from_frame['X_knn_columns'])
+    assert from_catalog['categorical_features'] == from_frame['categorical_features']
+    np.testing.assert_array_equal(from_catalog['precio_column'], from_frame['precio_column'])
+    # The catalog keeps numbers as float32
+    assert abs(from_catalog['X_knn_transformed'] - from_frame['X_knn_transformed']).max() < 1e-4
+
+
+def test_prepare_catalog_rejects_an_unnormalized_catalog(raw):
+    with pytest.raises(ValueError):
+        prepare_catalog(CompactCatalog.from_frame(raw), np.zeros(len(raw)))
@@ -0,0 +1,50 @@
+import os
+
+import pandas as pd
+import pytest
+
+import data_cache
+from data_cache import load_stats, load_table, reader_sources, reader_version
+from featurizer import load_raw
+from spec_normalizer import load_normalized
+
+
+def names(sources):
+    return {os.path.basename(path) for path in sources}
+
+
+def test_reader_version_covers_the_modules_it_imports():
+    assert {"spec_normalizer.py", "featurizer.py", "label_maps.py"} <= names(reader_sources(load_normalized))
+    assert "spec_normalizer.py" not in names(reader_sources(load_raw))
+    assert reader_version(load_normalized).startswith("spec_normalizer.load_normalized:")
+    # Library readers are versioned by their own file only
+    assert len(reader_sources(pd.read_csv)) == 1
+
+
+@pytest.fixture
+def edited(monkeypatch):
+    """Pretend a source file changed on disk by giving it a different hash."""
+    def edit(filename):
+        source_sha256 = data_cache._source_sha256
+        monkeypatch.setattr(data_cache, "_source_sha256",
+                            lambda path: "0" * 64 if os.path.basename(path) == filename else source_sha256(path))
+    return edit
+
+
+def test_cached_table_is_reconverted_when_an_imported_module_changes(tmp_path, edited):
+    cache_dir = str(tmp_path)
+    first = load_table("y_test.csv", load_raw, cache_dir=cache_dir)
+    assert load_stats()["y_test.csv"]["source"] == "csv"
+    load_table("y_test.csv", load_raw, cache_dir=cache_dir)
+    assert load_stats()["y_test.csv"]["source"] == "cache"
+
+    edited("label_maps.py")  # imported by featurizer, not by the reader's own module
+    again = load_table("y_test.csv", load_raw, cache_dir=cache_dir)
+    assert load_stats()["y_test.csv"]["source"] == "csv"
+    pd.testing.assert_frame_equal(first, again)
+
+
+def test_normalizer_version_follows_featurizer(edited):
+    before = reader_version(load_normalized)
+    edited("featurizer.py")
+    assert reader_version(load_normalized) != before
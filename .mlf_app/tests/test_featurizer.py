@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from featurizer import (CONNECTIVITY_FLAGS, ONE_HOT_COLUMNS, OS_GROUPS, featurize, load_raw, one_hot_categories,
+                        parse_frequency_ghz)
+from model_registry import get_feature_names, get_model
+
+
+@pytest.fixture(scope="module")
+def feature_names():
+    return get_feature_names()
+
+
+@pytest.fixture(scope="module")
+def train(feature_names):
+    raw = load_raw("X_train_final.csv")
+    return raw, featurize(raw, feature_names)
+
+
+def log_rmse(features, prices_path):
+    prices = pd.read_csv(prices_path, index_col=0).iloc[:, 0].loc[features.index]
+    predicted = get_model().predict(features.to_numpy())
+    return float(np.sqrt(np.mean((predicted - np.log1p(prices.to_numpy())) ** 2)))
+
+
+def test_matrix_has_the_booster_layout(train, feature_names):
+    raw, features = train
+    assert list(features.columns) == list(feature_names)
+    assert features.index.equals(raw.index)
+    assert (features.dtypes == np.float32).all()
+
+
+def test_train_header_is_realigned(train):
+    raw, _ = train
+    # X_train_final.csv lacks the index header cell; misaligned names would put text here
+    assert pd.api.types.is_numeric_dtype(raw["ram_memoria_ram_GB"])
+    assert raw["tipo"].dropna().isin(["Laptop", "Desktop"]).any()
+
+
+def test_one_hot_groups_set_exactly_one_column(train, feature_names):
+    _, features = train
+    prefixes = list(ONE_HOT_COLUMNS.values())
+    for prefix in prefixes:
+        columns = [prefix + c for c in one_hot_categories(prefix, feature_names)]
+        assert features[columns].sum(axis=1).max() <= 1, prefix
+    os_columns = ["os_" + g for g in OS_GROUPS]
+    assert set(np.unique(features[os_columns].sum(axis=1))) <= {0.0, 1.0}
+    assert set(np.unique(features[CONNECTIVITY_FLAGS].to_numpy())) <= {0.0, 1.0}
+
+
+def test_reproduces_the_training_matrix(train):
+    # The booster fits its own training rows far more closely than unseen ones;
+    # a featurizer that drifted from the training encoding loses that fit.
+    _, features = train
+    assert log_rmse(features, "y_train.csv") < 0.15
+
+
+def test_test_set_error_matches_the_trained_model(feature_names):
+    features = featurize(load_raw("X_test_final.csv"), feature_names)
+    assert log_rmse(features, "y_test.csv") < 0.30
+
+
+def test_single_rows_match_the_batch(train, feature_names):
+    raw, features = train
+    rows = [featurize(raw.iloc[[i]], feature_names) for i in (0, 17, len(raw) - 1)]
+    np.testing.assert_array_equal(pd.concat(rows).to_numpy(), features.iloc[[0, 17, len(raw) - 1]].to_numpy())
+
+
+def test_frequency_keeps_the_training_parse():
+    ghz = parse_frequency_ghz(pd.Series(["1.300 MHz", "1,3 GHz", "2.4 GHz", None]))
+    np.testing.assert_allclose(ghz[:3], [0.0013, 1.3, 2.4])
+    assert np.isnan(ghz[3])
+
+
+def test_unseen_categories_leave_the_group_empty(train, feature_names):
+    raw, _ = train
+    rows = raw.iloc[:2].copy()
+    rows["color"] = ["turquesa", "negro"]
+    rows["sistema_operativo_sistema_operativo"] = [None, "Windows 11 Home"]
+    features = featurize(rows, feature_names)
+
+    colors = ["color_" + c for c in one_hot_categories("color_", feature_names)]
+    assert features[colors].sum(axis=1).tolist() == [0.0, 1.0]
+    assert features.iloc[1]["color_negro"] == 1.0
+    os_columns = ["os_" + g for g in OS_GROUPS]
+    assert features[os_columns].sum(axis=1).tolist() == [0.0, 1.0]
+    assert features.iloc[1]["os_Windows"] == 1.0
@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from feedback_store import FeedbackStore, page_from_path, record_brand
+
+
+def record(timestamp, session_id="s1", rating="Very Accurate", **input_data):
+    return {"timestamp": timestamp, "session_id": session_id, "accuracy_rating": rating,
+            "predicted_price": 999.0, "input_data": input_data}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return FeedbackStore(str(tmp_path / "feedback.db"))
+
+
+def test_page_and_brand_from_records():
+    assert page_from_path("feedback/knn_recommendation_feedback.20260101-000000-000000.jsonl") == "knn_recommendation"
+    assert record_brand({"input_data": {"company_name": "ASUS"}}) == "ASUS"
+    assert record_brand({"input_data": {}}) is None
+
+
+def test_duplicates_are_ignored(store):
+    records = [record("2026-10-01T10:00:00"), record("2026-10-01T11:00:00")]
+    assert store.insert_many("price_predictor", records) == 2
+    assert store.insert_many("price_predictor", records) == 0
+    # The identity is (page, timestamp, session_id): the same record on another page is new
+    assert store.insert_many("knn_recommendation", records[:1]) == 1
+    assert store.count() == 3
+
+
+def test_records_without_a_session_are_deduplicated(store, tmp_path):
+    path = tmp_path / "price_predictor_feedback.jsonl"
+    records = [record("2026-10-01T10:00:00", session_id=None), record("2026-10-01T11:00:00")]
+    del records[1]["session_id"]
+    path.write_text("".join(json.dumps(r) + "\n" for r in records), encoding="utf-8")
+
+    assert store.import_jsonl([str(path)]) == {str(path): 2}
+    assert store.import_jsonl([str(path)]) == {str(path): 0}
+    assert store.count() == 2
+
+
+def test_trigger_counts_match_the_rows(store):
+    store.insert_many("price_predictor", [
+        record("2026-10-01T10:00:00", company_name="ASUS"),
+        record("2026-10-01T10:00:00", company_name="ASUS"),  # duplicate, not counted
+        record("2026-10-01T12:00:00", rating="Neutral", company_name="HP"),
+        record("2026-10-02T09:00:00", session_id="s2", company_name="ASUS"),
+    ])
+    store.insert_many("knn_recommendation", [record("2026-10-02T09:00:00", rating=None)])
+
+    assert store.rating_distribution(by="day") == {
+        "2026-10-01": {"Very Accurate": 1, "Neutral": 1},
+        "2026-10-02": {"Very Accurate": 1, "": 1},
+    }
+    assert store.rating_distribution(by="brand", page="price_predictor") == {
+        "ASUS": {"Very Accurate": 2}, "HP": {"Neutral": 1},
+    }
+    assert store.rating_distribution(by="page", start_day="2026-10-02") == {
+        "knn_recommendation": {"": 1}, "price_predictor": {"Very Accurate": 1},
+    }
+    assert store.count() == 4
+    with pytest.raises(ValueError):
+        store.rating_distribution(by="session_id")
+
+
+def test_import_jsonl_is_repeatable(store, tmp_path):
+    path = tmp_path / "price_predictor_feedback.jsonl"
+    lines = [json.dumps(record(f"2026-10-01T10:00:0{i}")) for i in range(5)]
+    path.write_text("\n".join(lines) + "\n\n", encoding="utf-8")
+
+    assert store.import_jsonl([str(path)], batch_size=2) == {str(path): 5}
+    assert store.import_jsonl([str(path)], batch_size=2) == {str(path): 0}
+    assert store.rating_distribution(by="page") == {"price_predictor": {"Very Accurate": 5}}
+
+
+def test_since_tails_in_insert_order(store):
+    store.insert_many("price_predictor", [record(f"2026-10-01T10:00:0{i}") for i in range(3)])
+    first = store.since(0, limit=2)
+    assert [r["timestamp"] for _, _, r in first] == ["2026-10-01T10:00:00", "2026-10-01T10:00:01"]
+    rest = store.since(first[-1][0])
+    assert [(page, r["timestamp"]) for _, page, r in rest] == [("price_predictor", "2026-10-01T10:00:02")]
+    assert store.since(rest[-1][0]) == []
+    assert [r["timestamp"] for r in store.recent(limit=2)] == ["2026-10-01T10:00:02", "2026-10-01T10:00:01"]
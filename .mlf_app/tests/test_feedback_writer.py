@@ -0,0 +1,111 @@
+import glob
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from feedback_store import FeedbackStore
+from feedback_writer import FeedbackWriter
+
+
+def read_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "feedback" / "price_predictor_feedback.jsonl")
+
+
+def test_records_are_written_in_batches(path):
+    writer = FeedbackWriter(path, batch_size=10, flush_interval=0.5, fsync="none")
+    for i in range(25):
+        assert writer.write({"n": i})
+    writer.flush()
+    stats = writer.stats()
+    writer.close()
+
+    assert [r["n"] for r in read_lines(path)] == list(range(25))
+    assert stats["written"] == 25
+    assert 3 <= stats["batches"] < 25
+    assert stats["dropped"] == stats["errors"] == 0
+
+
+def test_rotates_by_size(path):
+    writer = FeedbackWriter(path, batch_size=1, flush_interval=0.0, fsync="batch", max_bytes=50)
+    for i in range(6):
+        writer.write({"n": i, "padding": "x" * 20})
+        writer.flush()
+    writer.close()
+
+    root, ext = os.path.splitext(path)
+    rotated = sorted(glob.glob(f"{root}.*{ext}"))
+    assert writer.stats()["rotations"] == len(rotated) >= 2
+    records = [r["n"] for p in rotated + [path] for r in read_lines(p)]
+    assert records == list(range(6))
+
+
+def test_batches_reach_the_store(path, tmp_path):
+    store = FeedbackStore(str(tmp_path / "feedback.db"))
+    writer = FeedbackWriter(path, fsync="none", store=store)
+    for i in range(3):
+        writer.write({"timestamp": f"2026-10-01T10:00:0{i}", "session_id": "s", "accuracy_rating": "Neutral"})
+    writer.close()
+    assert writer.page == "price_predictor"
+    assert store.rating_distribution(by="page") == {"price_predictor": {"Neutral": 3}}
+
+
+def test_a_failed_batch_does_not_stop_the_writer(path):
+    writer = FeedbackWriter(path, batch_size=1, flush_interval=0.0, fsync="none")
+    write_batch = writer._write_batch
+
+    def fail_once(lines):
+        writer._write_batch = write_batch
+        raise RuntimeError("disk gone")
+
+    writer._write_batch = fail_once
+    writer.write({"n": 0})
+    writer.flush()
+    writer.write({"n": 1})
+    writer.flush()
+    writer.close()
+
+    stats = writer.stats()
+    assert (stats["errors"], stats["dropped"], stats["written"]) == (1, 1, 1)
+    assert read_lines(path) == [{"n": 1}]
+
+
+def test_writes_after_close_are_dropped(path):
+    writer = FeedbackWriter(path, fsync="none")
+    writer.close(timeout=1.0)
+    assert not writer._thread.is_alive()
+    assert writer.write({"n": 0}) is False
+    assert writer.stats()["dropped"] == 1
+    writer.close(timeout=1.0)  # closing twice is harmless
+
+
+def test_full_queue_drops_after_the_put_timeout(path):
+    writer = FeedbackWriter(path, max_queue=1, put_timeout=0.05, batch_size=1, flush_interval=0.0, fsync="none")
+    release = threading.Event()
+    write_batch = writer._write_batch
+
+    def stalled(lines):
+        release.wait(5)
+        write_batch(lines)
+
+    writer._write_batch = stalled
+    assert writer.write({"n": 0})  # taken by the writer thread, which stalls on it
+    deadline = time.monotonic() + 5
+    while writer._queue.qsize() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert writer.write({"n": 1})  # fills the queue
+    assert not writer.write({"n": 2})
+    release.set()
+    writer.close()
+
+    stats = writer.stats()
+    assert (stats["dropped"], stats["blocked_puts"], stats["written"]) == (1, 1, 2)
+    assert read_lines(path) == [{"n": 0}, {"n": 1}]
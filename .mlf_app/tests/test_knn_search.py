@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+from sklearn.neighbors import NearestNeighbors
+
+from knn_search import CosineSearchEngine, IVFCosineIndex, l2_normalize, recall_at_k
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    # Sparse non-negative rows like the one-hot/numeric KNN features, one of them all zero
+    rng = np.random.default_rng(0)
+    dense = rng.random((500, 40)) * (rng.random((500, 40)) < 0.2)
+    dense[7] = 0.0
+    return sp.csr_matrix(dense)
+
+
+@pytest.fixture(scope="module")
+def queries(catalog):
+    rng = np.random.default_rng(1)
+    return sp.csr_matrix(rng.random((30, catalog.shape[1])) * (rng.random((30, catalog.shape[1])) < 0.3))
+
+
+def sklearn_neighbours(catalog, queries, k):
+    return NearestNeighbors(n_neighbors=k, metric="cosine", algorithm="brute").fit(catalog).kneighbors(queries)
+
+
+def test_l2_normalize_keeps_zero_rows(catalog):
+    for matrix in (catalog, catalog.toarray()):
+        normalized = l2_normalize(matrix)
+        norms = np.sqrt(np.asarray(normalized.multiply(normalized).sum(axis=1)).ravel()
+                        if sp.issparse(normalized) else (normalized ** 2).sum(axis=1))
+        assert norms[7] == 0.0
+        np.testing.assert_allclose(np.delete(norms, 7), 1.0, rtol=1e-5)
+
+
+@pytest.mark.parametrize("dense", [False, True])
+@pytest.mark.parametrize("n_jobs,parallel_threshold", [(1, 256), (3, 1)])
+def test_matches_sklearn_cosine_neighbours(catalog, queries, dense, n_jobs, parallel_threshold):
+    k = 5
+    expected_distances, expected_indices = sklearn_neighbours(catalog, queries, k)
+    engine = CosineSearchEngine(catalog, dense=dense, n_jobs=n_jobs, parallel_threshold=parallel_threshold)
+    assert sp.issparse(engine.vectors) != dense
+    distances, indices = engine.search(queries, k=k)
+    assert distances.dtype == np.float64
+    np.testing.assert_allclose(distances, expected_distances, atol=1e-5)
+    # Indices may only differ between neighbours at the same distance
+    mismatched = indices != expected_indices
+    np.testing.assert_allclose(distances[mismatched], expected_distances[mismatched], atol=1e-5)
+
+
+def test_k_larger_than_the_catalog(catalog, queries):
+    engine = CosineSearchEngine(catalog[:3])
+    distances, indices = engine.search(queries[:2], k=10)
+    assert indices.shape == (2, 3)
+    assert sorted(indices[0]) == [0, 1, 2]
+    assert (np.diff(distances, axis=1) >= 0).all()
+
+
+def test_ivf_exact_search_matches_the_engine(catalog, queries):
+    index = IVFCosineIndex(catalog, n_lists=8, seed=0)
+    expected = CosineSearchEngine(catalog).search(queries, k=5)
+    distances, indices = index.search(queries, k=5, exact=True)
+    np.testing.assert_allclose(distances, expected[0], atol=1e-6)
+    np.testing.assert_array_equal(indices, expected[1])
+
+
+def test_ivf_recall_grows_with_the_probes(catalog, queries):
+    index = IVFCosineIndex(catalog, n_lists=8, n_probe=1, seed=0)
+    _, exact = index.search(queries, k=5, exact=True)
+    recalls = [recall_at_k(index.search(queries, k=5, n_probe=n)[1], exact) for n in (1, 2, 4, index.n_lists)]
+    assert recalls == sorted(recalls)
+    assert recalls[-1] == 1.0
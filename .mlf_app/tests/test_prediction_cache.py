@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+import prediction_cache
+from prediction_cache import PredictionCache
+
+
+class CountingModel:
+    """Predicts log1p(first column) and records the rows it was asked for."""
+
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, matrix):
+        self.calls.append(len(matrix))
+        return np.log1p(matrix[:, 0].astype(np.float64))
+
+
+@pytest.fixture
+def model():
+    return CountingModel()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(prediction_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def rows(*values):
+    return np.array([[v, 1.0] for v in values], dtype=np.float32)
+
+
+def test_hits_skip_the_model(model):
+    cache = PredictionCache(max_entries=10)
+    np.testing.assert_allclose(cache.predict(model, rows(1, 2)), [1, 2], rtol=1e-6)
+    np.testing.assert_allclose(cache.predict(model, rows(2, 1, 3)), [2, 1, 3], rtol=1e-6)
+    assert model.calls == [2, 1]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (2, 3, 3)
+
+
+def test_duplicates_in_one_batch_are_predicted_once(model):
+    cache = PredictionCache()
+    np.testing.assert_allclose(cache.predict(model, rows(5, 5, 5)), [5, 5, 5], rtol=1e-6)
+    assert model.calls == [1]
+
+
+def test_least_recently_used_entry_is_evicted(model):
+    cache = PredictionCache(max_entries=2)
+    cache.predict(model, rows(1))
+    cache.predict(model, rows(2))
+    cache.predict(model, rows(1))  # 2 is now the least recently used
+    cache.predict(model, rows(3))
+    assert cache.stats()["evictions"] == 1
+
+    model.calls.clear()
+    cache.predict(model, rows(1, 3))
+    assert model.calls == []
+    cache.predict(model, rows(2))
+    assert model.calls == [1]
+
+
+def test_entries_expire_after_the_ttl(model, clock):
+    cache = PredictionCache(ttl_seconds=60)
+    cache.predict(model, rows(1))
+    clock[0] += 59
+    cache.predict(model, rows(1))
+    assert model.calls == [1]
+    clock[0] += 2
+    cache.predict(model, rows(1))
+    assert model.calls == [1, 1]
+    assert cache.stats()["expirations"] == 1
+
+
+def test_new_model_version_clears_the_cache(model):
+    cache = PredictionCache()
+    cache.predict(model, rows(1, 2), version="a")
+    cache.predict(model, rows(1, 2), version="b")
+    assert model.calls == [2, 2]
+    stats = cache.stats()
+    assert (stats["invalidations"], stats["size"]) == (1, 2)
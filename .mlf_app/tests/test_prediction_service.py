@@ -0,0 +1,57 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import numpy as np
+import pytest
+
+from model_registry import get_feature_names
+from prediction_service import MicroBatcher, PredictionServer, make_handler
+
+
+@pytest.fixture
+def service():
+    # Price = RAM in GB, so responses can be checked without the model
+    feature_names = get_feature_names()
+    ram = feature_names.index("ram_memoria_ram_GB")
+    batcher = MicroBatcher(lambda matrix: matrix[:, ram].astype(np.float64), feature_names, max_wait_ms=1.0)
+    server = PredictionServer(("127.0.0.1", 0), make_handler(batcher))
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/predict", batcher
+    server.shutdown()
+    server.server_close()
+    batcher.close()
+
+
+def post(url, body):
+    request = urllib.request.Request(url, data=json.dumps(body).encode("utf-8"), method="POST")
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_single_row_and_instances(service):
+    url, _ = service
+    assert post(url, {"ram_memoria_ram_GB": 16}) == (200, {"price": 16.0})
+    assert post(url, {"instances": [{"ram_memoria_ram_GB": 8}, {}]}) == (200, {"prices": [8.0, 0.0]})
+
+
+@pytest.mark.parametrize("body", [
+    [{"ram_memoria_ram_GB": 16}],
+    "ram_memoria_ram_GB",
+    {"instances": []},
+    {"instances": {"ram_memoria_ram_GB": 16}},
+    {"instances": [{"ram_memoria_ram_GB": 16}, 16]},
+    {"ram_memoria_ram_GB": "lots"},
+    {"no_such_feature": 1},
+])
+def test_malformed_bodies_are_rejected(service, body):
+    url, batcher = service
+    status, response = post(url, body)
+    assert status == 400
+    assert response["error"]
+    assert batcher.snapshot()["batches"] == 0
@@ -0,0 +1,105 @@
+import itertools
+import math
+
+import numpy as np
+import pytest
+
+from feature_layout import get_feature_layout
+from feature_schema import get_feature_schema
+from model_registry import get_model
+from price_sweep import MAX_SWEEP_POINTS, SWEEP_DECIMALS, sweep_prices, sweep_values
+
+SCHEMA = get_feature_schema()
+
+
+def shown(spec, values):
+    """Values rounded like the page's sweep table."""
+    return np.round(np.asarray(values, dtype=np.float64), 0 if spec["integer"] else SWEEP_DECIMALS)
+
+
+def step_for(spec):
+    # The page's steps (1 or 0.1), widened where the whole range would exceed the point limit
+    base = 1 if spec["integer"] else 0.1
+    return base * math.ceil((spec["max"] - spec["min"]) / (MAX_SWEEP_POINTS - 1) / base)
+
+
+@pytest.fixture
+def vector():
+    # A configuration at the schema defaults, stored in the float32 row like the page's inputs
+    vector = get_feature_layout().vector()
+    for feature, spec in SCHEMA.numeric.items():
+        vector[feature] = spec["default"]
+    return vector
+
+
+@pytest.mark.parametrize("feature", list(SCHEMA.numeric))
+def test_whole_range_with_the_default_as_current(feature, vector):
+    spec = SCHEMA.numeric[feature]
+    current = float(vector[feature])
+    values = sweep_values(spec, spec["min"], spec["max"], step_for(spec), current=current)
+
+    assert values.dtype == np.float32
+    assert np.all(np.diff(values) > 0)
+    assert len(np.unique(shown(spec, values))) == len(values)
+    assert current in values
+    assert shown(spec, [values[0], values[-1]]).tolist() == shown(spec, [spec["min"], spec["max"]]).tolist()
+    assert len(values) <= MAX_SWEEP_POINTS + 1
+
+
+def test_values_stay_within_the_range():
+    spec = {"integer": False}
+    values = sweep_values(spec, 2.5, 1.0, 0.4, current=7.0)
+    np.testing.assert_allclose(values, [1.0, 1.4, 1.8, 2.2, 2.5], rtol=1e-6)
+    assert sweep_values({"integer": True}, 0, 10, 3, current=4).tolist() == [0, 3, 4, 6, 9, 10]
+
+
+def test_current_replaces_the_grid_value_shown_the_same():
+    values = sweep_values({"integer": False}, 0.0, 1.0, 0.1, current=np.float32(0.3))
+    assert len(values) == 11
+    assert np.float32(0.3) in values
+
+
+def test_rejects_bad_steps():
+    with pytest.raises(ValueError):
+        sweep_values({"integer": True}, 0, 10, 0)
+    with pytest.raises(ValueError):
+        sweep_values({"integer": True}, 0, 10 * MAX_SWEEP_POINTS, 1)
+
+
+@pytest.mark.parametrize("x_feature,y_feature", [
+    ("procesador_frecuencia_reloj", "disco_duro_capacidad_memoria_ssd_GB"),
+    ("ram_memoria_ram_GB", "procesador_frecuencia_turbo_máx__GHz"),
+    ("procesador_frecuencia", "pantalla_tamaño_pantalla_pulgadas"),
+])
+def test_two_spec_grid_pivots(x_feature, y_feature, vector):
+    values_by_feature = {}
+    for feature in (x_feature, y_feature):
+        spec = SCHEMA.numeric[feature]
+        values_by_feature[feature] = sweep_values(
+            spec, spec["min"], spec["max"], step_for(spec), current=float(vector[feature])
+        )
+
+    table, current_price, _ = sweep_prices(vector, values_by_feature)
+    assert len(table) == len(values_by_feature[x_feature]) * len(values_by_feature[y_feature])
+
+    grid = table.assign(
+        x=shown(SCHEMA.numeric[x_feature], table[x_feature]),
+        y=shown(SCHEMA.numeric[y_feature], table[y_feature]),
+    ).pivot(index="y", columns="x", values="price")
+    assert grid.shape == (len(values_by_feature[y_feature]), len(values_by_feature[x_feature]))
+    assert not grid.isna().any().any()
+
+    is_current = (table[x_feature] == vector[x_feature]) & (table[y_feature] == vector[y_feature])
+    assert is_current.sum() == 1
+    assert table.loc[is_current, "difference"].abs().max() < 1e-3
+    assert current_price == pytest.approx(float(np.expm1(get_model().predict(vector.matrix()))[0]))
+
+
+def test_grid_cap():
+    vector = get_feature_layout().vector()
+    values = {f: np.arange(101, dtype=np.float32) for f in ("ram_memoria_ram_GB", "procesador_tdp_W")}
+    with pytest.raises(ValueError, match="narrow a range"):
+        sweep_prices(vector, values, max_cells=10000)
+    table, _, timings = sweep_prices(vector, dict(itertools.islice(values.items(), 1)))
+    assert len(table) == 101
+    assert set(timings) == {"build_ms", "predict_ms"}